@@ -1,7 +1,22 @@
-from flask import Blueprint, request, jsonify
+import json
+from flask import Blueprint, Response, request, jsonify, make_response, stream_with_context
 from services.codon_service import CodonService
 from services.graph_service import GraphService
 from services.properties_service import PropertiesService
+from services.analysis_service import AnalysisService
+from services.batch_service import BatchService
+from services.job_service import JobService, FINISHED
+from services.sequence_service import SequenceService
+from utils.graph_utils import LONGEST_PATH_NODE_BUDGET, LONGEST_PATH_TIME_LIMIT
+from utils.properties_utils import EXTENSION_PROPERTIES
+from utils.batch_utils import parse_batch_codes
+from utils.scan_utils import SCAN_WINDOW
+from utils.sequence_utils import USAGE_MAX_LENGTH
+from utils.density_utils import DENSITY_POINTS
+
+# Limits for /graphs/cycles so one request cannot pin a CPU indefinitely
+CYCLES_MAX_COUNT = 10_000
+CYCLES_TIME_LIMIT = 10.0
 
 api_bp = Blueprint('api', __name__)
 
@@ -9,6 +24,36 @@ api_bp = Blueprint('api', __name__)
 codon_service = CodonService()
 graph_service = GraphService()
 properties_service = PropertiesService()
+analysis_service = AnalysisService(graph_service)
+batch_service = BatchService(properties_service)
+job_service = JobService(graph_service, properties_service, batch_service)
+sequence_service = SequenceService()
+
+def _etag_response(etag, compute, to_response=jsonify):
+    """
+    Answer 304 without computing anything when the client's If-None-Match
+    already names *etag*; otherwise return compute()'s result tagged with it.
+    Keys are content-addressed, so an ETag always names the same result.
+    """
+    if etag in request.if_none_match:
+        response = make_response("", 304)
+    else:
+        response = make_response(to_response(compute()), 200)
+    response.set_etag(etag)
+    return response
+
+def _request_graph(data):
+    """
+    The graph a path query runs on: the registered graph named by "graphId"
+    (KeyError if unknown), else the raw "edges" list.
+    """
+    if data.get("graphId") is not None:
+        return graph_service.get_compiled_graph(data["graphId"])
+    return data["edges"]
+
+def _has_graph(data) -> bool:
+    """The request names a graph: a non-null "graphId" or an "edges" list."""
+    return bool(data) and (data.get("graphId") is not None or "edges" in data)
 
 @api_bp.route("/graphs/original", methods=["POST"])
 def get_original_graph():
@@ -21,8 +66,10 @@ def get_original_graph():
         codons = data["codons"]
         num_of_codons = int(data["numOfCodons"])
 
-        graph = graph_service.get_original_graph(num_of_codons, codons)
-        return jsonify(graph), 200
+        etag = graph_service.result_key("original", num_of_codons, codons)
+        return _etag_response(
+            etag, lambda: graph_service.get_original_graph(num_of_codons, codons)
+        )
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -38,8 +85,10 @@ def get_alpha_one_graph():
         codons = data["codons"]
         num_of_codons = int(data["numOfCodons"])
 
-        graph = graph_service.get_alpha_one_graph(num_of_codons, codons)
-        return jsonify(graph), 200
+        etag = graph_service.result_key("alpha-one", num_of_codons, codons)
+        return _etag_response(
+            etag, lambda: graph_service.get_alpha_one_graph(num_of_codons, codons)
+        )
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -55,8 +104,10 @@ def get_alpha_two_graph():
         codons = data["codons"]
         num_of_codons = int(data["numOfCodons"])
 
-        graph = graph_service.get_alpha_two_graph(num_of_codons, codons)
-        return jsonify(graph), 200
+        etag = graph_service.result_key("alpha-two", num_of_codons, codons)
+        return _etag_response(
+            etag, lambda: graph_service.get_alpha_two_graph(num_of_codons, codons)
+        )
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -72,8 +123,53 @@ def get_alpha_three_graph():
         codons = data["codons"]
         num_of_codons = int(data["numOfCodons"])
 
-        graph = graph_service.get_alpha_three_graph(num_of_codons, codons)
-        return jsonify(graph), 200
+        etag = graph_service.result_key("alpha-three", num_of_codons, codons)
+        return _etag_response(
+            etag, lambda: graph_service.get_alpha_three_graph(num_of_codons, codons)
+        )
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route("/graphs/alpha/<int:k>", methods=["POST"])
+def get_alpha_graph(k):
+    """Get the α_k codon graph for any 1 ≤ k < codon length."""
+    try:
+        data = request.json
+        if not data or "codons" not in data or "numOfCodons" not in data:
+            return jsonify({"error": "Missing required data"}), 400
+
+        codons = data["codons"]
+        num_of_codons = int(data["numOfCodons"])
+        if not 1 <= k < num_of_codons:
+            return jsonify({"error": "k must satisfy 1 ≤ k < numOfCodons"}), 400
+
+        etag = graph_service.result_key(f"alpha-{k}", num_of_codons, codons)
+        return _etag_response(
+            etag, lambda: graph_service.get_alpha_graph(k, num_of_codons, codons)
+        )
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route("/graphs/merged", methods=["POST"])
+def get_merged_graph():
+    """
+    Get the original and every alpha-k graph merged into one graph; bit k of
+    "nodeMasks"/"edgeMasks" marks membership in variant k (bit 0: original).
+    """
+    try:
+        data = request.json
+        if not data or "codons" not in data or "numOfCodons" not in data:
+            return jsonify({"error": "Missing required data"}), 400
+
+        codons = data["codons"]
+        num_of_codons = int(data["numOfCodons"])
+
+        etag = graph_service.result_key("merged", num_of_codons, codons)
+        return _etag_response(
+            etag, lambda: graph_service.get_merged_graph(num_of_codons, codons)
+        )
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -89,8 +185,10 @@ def get_original_properties():
         codons = data["codons"]
         num_of_codons = int(data["numOfCodons"])
 
-        properties = properties_service.get_original_properties(num_of_codons, codons)
-        return jsonify(properties), 200
+        etag = properties_service.result_key("original", num_of_codons, codons)
+        return _etag_response(
+            etag, lambda: properties_service.get_original_properties(num_of_codons, codons)
+        )
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -106,8 +204,10 @@ def get_alpha_one_properties():
         codons = data["codons"]
         num_of_codons = int(data["numOfCodons"])
 
-        properties = properties_service.get_alpha_one_properties(num_of_codons, codons)
-        return jsonify(properties), 200
+        etag = properties_service.result_key("alpha-one", num_of_codons, codons)
+        return _etag_response(
+            etag, lambda: properties_service.get_alpha_one_properties(num_of_codons, codons)
+        )
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -123,8 +223,10 @@ def get_alpha_two_properties():
         codons = data["codons"]
         num_of_codons = int(data["numOfCodons"])
 
-        properties = properties_service.get_alpha_two_properties(num_of_codons, codons)
-        return jsonify(properties), 200
+        etag = properties_service.result_key("alpha-two", num_of_codons, codons)
+        return _etag_response(
+            etag, lambda: properties_service.get_alpha_two_properties(num_of_codons, codons)
+        )
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -140,8 +242,31 @@ def get_alpha_three_properties():
         codons = data["codons"]
         num_of_codons = int(data["numOfCodons"])
 
-        properties = properties_service.get_alpha_three_properties(num_of_codons, codons)
-        return jsonify(properties), 200
+        etag = properties_service.result_key("alpha-three", num_of_codons, codons)
+        return _etag_response(
+            etag, lambda: properties_service.get_alpha_three_properties(num_of_codons, codons)
+        )
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route("/properties/alpha/<int:k>", methods=["POST"])
+def get_alpha_properties(k):
+    """Get properties of the α_k codons for any 1 ≤ k < codon length."""
+    try:
+        data = request.json
+        if not data or "codons" not in data or "numOfCodons" not in data:
+            return jsonify({"error": "Missing required data"}), 400
+
+        codons = data["codons"]
+        num_of_codons = int(data["numOfCodons"])
+        if not 1 <= k < num_of_codons:
+            return jsonify({"error": "k must satisfy 1 ≤ k < numOfCodons"}), 400
+
+        etag = properties_service.result_key(f"alpha-{k}", num_of_codons, codons)
+        return _etag_response(
+            etag, lambda: properties_service.get_alpha_properties(k, num_of_codons, codons)
+        )
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -157,26 +282,306 @@ def get_c3_properties():
         codons = data["codons"]
         num_of_codons = int(data["numOfCodons"])
 
-        c3_result = properties_service.get_c3_properties(num_of_codons, codons)
-        return str(c3_result), 200
+        etag = properties_service.result_key("c3", num_of_codons, codons)
+        return _etag_response(
+            etag, lambda: properties_service.get_c3_properties(num_of_codons, codons), str
+        )
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@api_bp.route("/properties/extensions", methods=["POST"])
+def get_extensions():
+    """
+    Get every codon that can be added while the code stays circular (or C3
+    with "property": "c3"), and whether the code is already maximal.
+    """
+    try:
+        data = request.json
+        if not data or "codons" not in data or "numOfCodons" not in data:
+            return jsonify({"error": "Missing required data"}), 400
+
+        codons = data["codons"]
+        num_of_codons = int(data["numOfCodons"])
+        prop = data.get("property", "circular")
+        if prop not in EXTENSION_PROPERTIES:
+            return jsonify({"error": f"Unknown property: {prop}"}), 400
+
+        etag = properties_service.result_key(f"extensions/{prop}", num_of_codons, codons)
+        return _etag_response(
+            etag, lambda: properties_service.get_extensions(num_of_codons, codons, prop)
+        )
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route("/properties/k-circularity", methods=["POST"])
+def get_k_circularity():
+    """
+    Get the largest k for which the code is k-circular ("degree", null if it
+    is circular) and the representing-graph cycle that limits it.
+    """
+    try:
+        data = request.json
+        if not data or "codons" not in data or "numOfCodons" not in data:
+            return jsonify({"error": "Missing required data"}), 400
+
+        codons = data["codons"]
+        num_of_codons = int(data["numOfCodons"])
+
+        etag = properties_service.result_key("k-circularity", num_of_codons, codons)
+        return _etag_response(
+            etag, lambda: properties_service.get_k_circularity(num_of_codons, codons)
+        )
+
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+def _batch_request():
+    """
+    (operation, items, stream) of a batch request: a JSON body with "codes",
+    or a multipart upload whose "file" holds one code per line.
+    """
+    if "file" in request.files:
+        form = request.form
+        text = request.files["file"].read().decode("utf-8")
+        codes = [line.strip() for line in text.splitlines() if line.strip()]
+        options = {"numOfCodons": form.get("numOfCodons"), "operation": form.get("operation"),
+                   "stream": form.get("stream", "").lower() in ("1", "true")}
+    else:
+        data = request.json
+        if not data or "codes" not in data:
+            raise KeyError("codes")
+        codes = data["codes"]
+        options = data
+    stream = bool(options.get("stream")) or request.args.get("stream", "").lower() in ("1", "true")
+    items = parse_batch_codes(codes, options.get("numOfCodons"))
+    return options.get("operation") or "original", items, stream
+
+@api_bp.route("/properties/batch", methods=["POST"])
+def get_batch_properties():
+    """
+    Run one properties operation ("original", "alpha-<k>", "c3", ...) on many
+    codes at once.  Returns {"results": [...]} in input order, each entry a
+    {"result": ...} or {"error": message}; with "stream" set, streams NDJSON
+    {"index": i, ...} lines followed by {"done": true, "count": n, "errors": e}.
+    """
+    try:
+        operation, items, stream = _batch_request()
+
+        if stream:
+            entries = batch_service.iter_properties(operation, items)
+
+            def generate():
+                errors = 0
+                for entry in entries:
+                    errors += "error" in entry
+                    yield json.dumps(entry) + "\n"
+                yield json.dumps({"done": True, "count": len(items), "errors": errors}) + "\n"
+
+            return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+        results = batch_service.get_properties(operation, items)
+        return jsonify({
+            "operation": operation,
+            "count": len(results),
+            "errors": sum("error" in entry for entry in results),
+            "results": results,
+        }), 200
+
+    except KeyError:
+        return jsonify({"error": "Missing required data"}), 400
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route("/codons/canonical", methods=["POST"])
+def get_canonical_form():
+    """
+    Get the canonical form, class id and class size of a code under the
+    nucleotide permutations ("group": "nucleotide" or "complementary") and,
+    unless "reversal" is false, word reversal.
+    """
+    try:
+        data = request.json
+        if not data or "codons" not in data or "numOfCodons" not in data:
+            return jsonify({"error": "Missing required data"}), 400
+
+        result = codon_service.get_canonical_form(
+            int(data["numOfCodons"]),
+            data["codons"],
+            data.get("group", "nucleotide"),
+            bool(data.get("reversal", True)),
+        )
+        return jsonify(result), 200
+
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+def _sequence_request():
+    """
+    (source, options) of a sequence request: a multipart upload whose "file"
+    holds a FASTA or raw sequence (streamed, never read whole), or a JSON
+    body with the "sequence" text.
+    """
+    if "file" in request.files:
+        return request.files["file"].stream, request.form
+    data = request.json
+    if not data or "sequence" not in data:
+        raise KeyError("sequence")
+    return data["sequence"].encode("ascii", "replace"), data
+
+@api_bp.route("/sequences/usage", methods=["POST"])
+def get_sequence_usage():
+    """
+    Count the words of "length" letters in every record of an uploaded
+    FASTA or raw sequence.
+    """
+    try:
+        source, options = _sequence_request()
+        if options.get("length") is None:
+            return jsonify({"error": "Missing required data"}), 400
+        length = int(options["length"])
+        if not 1 <= length <= USAGE_MAX_LENGTH:
+            return jsonify({"error": f"length must be between 1 and {USAGE_MAX_LENGTH}"}), 400
+
+        return jsonify(sequence_service.get_word_usage(source, length)), 200
+
+    except KeyError:
+        return jsonify({"error": "Missing required data"}), 400
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route("/scan", methods=["POST"])
+def scan_sequence():
+    """
+    Count the hits of a code ("codons" of "numOfCodons" letters, the X code
+    by default) in each frame of consecutive windows of "window" letters of
+    an uploaded sequence, and call the reading frame of every window.
+    """
+    try:
+        source, options = _sequence_request()
+        window = options.get("window")
+
+        result = sequence_service.scan(
+            source,
+            int(options.get("numOfCodons") or 3),
+            options.get("codons") or None,
+            int(window) if window is not None else SCAN_WINDOW,
+        )
+        return jsonify(result), 200
+
+    except KeyError:
+        return jsonify({"error": "Missing required data"}), 400
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route("/density/index", methods=["POST"])
+def build_density_index():
+    """
+    Index an uploaded sequence against a code ("codons" of "numOfCodons"
+    letters, the X code by default) for density queries; the same sequence
+    and code always get the same "indexId" and are only indexed once.
+    """
+    try:
+        source, options = _sequence_request()
+
+        result = sequence_service.build_density_index(
+            source,
+            int(options.get("numOfCodons") or 3),
+            options.get("codons") or None,
+        )
+        return jsonify(result), 200
+
+    except KeyError:
+        return jsonify({"error": "Missing required data"}), 400
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route("/density", methods=["POST"])
+def get_density_profile():
+    """
+    Get the hits and density of every frame in windows of "window" letters
+    over ["start", "end") of a "record" of an indexed sequence, downsampled
+    to at most "points" windows.
+    """
+    try:
+        data = request.json
+        if not data or "indexId" not in data:
+            return jsonify({"error": "Missing required data"}), 400
+
+        window, end = data.get("window"), data.get("end")
+        result = sequence_service.get_density_profile(
+            data["indexId"],
+            data.get("record"),
+            int(window) if window is not None else None,
+            int(data.get("start", 0)),
+            int(end) if end is not None else None,
+            int(data.get("points", DENSITY_POINTS)),
+        )
+        return jsonify(result), 200
+
+    except KeyError as e:
+        return jsonify({"error": e.args[0]}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route("/analyze", methods=["POST"])
+def analyze():
+    """Get every graph variant, every property set and the C-n verdict at once."""
+    try:
+        data = request.json
+        if not data or "codons" not in data or "numOfCodons" not in data:
+            return jsonify({"error": "Missing required data"}), 400
+
+        codons = data["codons"]
+        num_of_codons = int(data["numOfCodons"])
+        include = data.get("include")
+
+        etag = analysis_service.result_key(num_of_codons, codons, include)
+        return _etag_response(
+            etag, lambda: analysis_service.analyze(num_of_codons, codons, include)
+        )
+
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @api_bp.route("/graphs/longest-path", methods=["POST"])
 def get_longest_path():
     """Get the longest path in a graph."""
     try:
         data = request.json
-        if not data or "edges" not in data or "numOfCodons" not in data:
+        if not _has_graph(data):
             return jsonify({"error": "Missing required data"}), 400
 
-        edges = data["edges"]  # This should be the direct edges array
-        num_nodes = int(data["numOfCodons"])
+        edges = _request_graph(data)
+        # Clients may lower the limits, never raise them past the server's
+        node_budget = min(int(data.get("nodeBudget", LONGEST_PATH_NODE_BUDGET)),
+                          LONGEST_PATH_NODE_BUDGET)
+        time_limit = min(float(data.get("timeLimit", LONGEST_PATH_TIME_LIMIT)),
+                         LONGEST_PATH_TIME_LIMIT)
         
-        longest_path_result = graph_service.get_longest_path(num_nodes, edges)
+        # {"path": [...], "engine": "dag" | "branch-and-bound", "optimal": bool}
+        longest_path_result = graph_service.find_longest_path(edges, node_budget, time_limit)
         return jsonify(longest_path_result), 200
 
+    except KeyError as e:
+        return jsonify({"error": e.args[0]}), 404
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -185,16 +590,158 @@ def get_shortest_path():
     """Get the shortest path between two nodes in a graph."""
     try:
         data = request.json
-        if not data or "edges" not in data or "source" not in data or "target" not in data:
+        if not _has_graph(data) or "source" not in data or "target" not in data:
             return jsonify({"error": "Missing required data"}), 400
 
-        edges = data["edges"]
+        edges = _request_graph(data)
         source = data["source"]
         target = data["target"]
-        nodes = data.get("nodes", [])
+        nodes = data.get("nodes")
         
         shortest_path_result = graph_service.get_shortest_path(edges, source, target, nodes)
         return jsonify(shortest_path_result), 200
 
+    except KeyError as e:
+        return jsonify({"error": e.args[0]}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route("/graphs/shortest-paths", methods=["POST"])
+def get_shortest_paths():
+    """
+    Get the shortest path of every [source, target] pair in "pairs", in the
+    same order ([] where there is none).
+    """
+    try:
+        data = request.json
+        if not _has_graph(data) or "pairs" not in data:
+            return jsonify({"error": "Missing required data"}), 400
+
+        pairs = data["pairs"]
+        if any(not isinstance(pair, (list, tuple)) or len(pair) != 2 for pair in pairs):
+            return jsonify({"error": "Each pair must be [source, target]"}), 400
+
+        paths = graph_service.get_shortest_paths(_request_graph(data), pairs, data.get("nodes"))
+        return jsonify({"paths": paths}), 200
+
+    except KeyError as e:
+        return jsonify({"error": e.args[0]}), 404
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+@api_bp.route("/graphs/cycles", methods=["POST"])
+def get_cycles():
+    """
+    Stream the elementary cycles of a graph as NDJSON, one {"cycle": [...]}
+    per line, followed by {"done": true, "count": n, "stopped": limit or null}.
+    """
+    try:
+        data = request.json
+        if not _has_graph(data):
+            return jsonify({"error": "Missing required data"}), 400
+
+        max_length = data.get("maxLength")
+        cycles = graph_service.iter_cycles(
+            _request_graph(data),
+            max_length=int(max_length) if max_length is not None else None,
+            max_count=min(int(data.get("maxCount", CYCLES_MAX_COUNT)), CYCLES_MAX_COUNT),
+            time_limit=min(float(data.get("timeLimit", CYCLES_TIME_LIMIT)), CYCLES_TIME_LIMIT),
+            min_length=int(data.get("minLength", 1)),
+        )
+
+        def generate():
+            for cycle in cycles:
+                yield json.dumps({"cycle": cycle}) + "\n"
+            yield json.dumps({"done": True, "count": cycles.count, "stopped": cycles.stopped}) + "\n"
+
+        return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+    except KeyError as e:
+        return jsonify({"error": e.args[0]}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route("/graphs/register", methods=["POST"])
+def register_graph():
+    """Compile a {"nodes", "edges"} graph server-side and return its graph id."""
+    try:
+        data = request.json
+        if not data or "edges" not in data:
+            return jsonify({"error": "Missing required data"}), 400
+
+        compiled = graph_service.register_graph(data["edges"], data.get("nodes"))
+        return jsonify({
+            "graphId": compiled.graph_id,
+            "nodeCount": compiled.node_count,
+            "edgeCount": compiled.edge_count,
+        }), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route("/jobs", methods=["POST"])
+def submit_job():
+    """
+    Run an operation ("graph", "properties", "batch", "longest-path",
+    "cycles" or "search") with its "params" in the background; answers 202
+    with the job status to poll.
+    """
+    try:
+        data = request.json
+        if not data or "operation" not in data:
+            return jsonify({"error": "Missing required data"}), 400
+
+        job = job_service.submit(data["operation"], data.get("params"))
+        return jsonify(job.to_dict()), 202
+
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route("/jobs", methods=["GET"])
+def list_jobs():
+    """Get the status of every job still in the table."""
+    return jsonify({"jobs": [job.to_dict() for job in job_service.all_jobs()]}), 200
+
+@api_bp.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    """Get the status and progress of a job."""
+    try:
+        return jsonify(job_service.get(job_id).to_dict()), 200
+    except KeyError as e:
+        return jsonify({"error": e.args[0]}), 404
+
+@api_bp.route("/jobs/<job_id>/result", methods=["GET"])
+def get_job_result(job_id):
+    """Get the result of a finished job; 409 with its status until it is done."""
+    try:
+        job = job_service.get(job_id)
+        if job.status != "done":
+            return jsonify(job.to_dict()), 409 if job.status in FINISHED else 202
+        return jsonify({"jobId": job.id, "result": job.result}), 200
+    except KeyError as e:
+        return jsonify({"error": e.args[0]}), 404
+
+@api_bp.route("/jobs/<job_id>/cancel", methods=["POST"])
+def cancel_job(job_id):
+    """Cancel a queued or running job."""
+    try:
+        return jsonify(job_service.cancel(job_id).to_dict()), 200
+    except KeyError as e:
+        return jsonify({"error": e.args[0]}), 404
+
+@api_bp.route("/cache/stats", methods=["GET"])
+def get_cache_stats():
+    """Get size and hit/miss counters of the result caches and store."""
+    store = graph_service.cache.store
+    return jsonify({
+        "graphs": graph_service.cache.stats(),
+        "properties": properties_service.cache.stats(),
+        "analysis": analysis_service.cache.stats(),
+        "compiledGraphs": graph_service.graphs.stats(),
+        "pathTables": graph_service.path_tables.stats(),
+        "jobs": job_service.stats(),
+        "densityIndexes": sequence_service.indexes.stats(),
+        "store": store.stats() if store is not None else None,
+    }), 200
@@ -28,7 +28,8 @@ def create_app():
                 "http://139.59.213.46:3000", "https://139.59.213.46:3000"
             ],
             "methods": ["GET", "POST", "OPTIONS"],
-            "allow_headers": ["Content-Type"]
+            "allow_headers": ["Content-Type", "If-None-Match"],
+            "expose_headers": ["ETag"]
         }
     })
     app.config['CORS_HEADERS'] = 'Content-Type'
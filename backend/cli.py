@@ -0,0 +1,153 @@
+"""
+Command line tools for long-running offline computations.
+
+Usage:
+    python cli.py search --length 3 --property c3 --self-complementary -o codes.ndjson
+    python cli.py usage genome.fa --length 3 -o usage.json
+    python cli.py scan genome.fa --window 300 -o frames.json
+    python cli.py density genome.fa --window 1000 --record chr1 -o density.json
+"""
+import argparse
+import json
+import os
+import sys
+
+from utils.search_utils import SEARCH_PROPERTIES, search_to_file
+from utils.density_utils import DENSITY_POINTS, DensityIndex, build_density_index, density_directory
+from utils.scan_utils import SCAN_WINDOW, X_CODE, scan_sequence
+from utils.sequence_utils import word_usage
+
+def search_command(args) -> int:
+    """Enumerate maximal codes into an NDJSON file (resumable)."""
+    count = search_to_file(
+        args.output,
+        args.length,
+        property=args.property,
+        size=args.size,
+        self_complementary=args.self_complementary,
+        processes=args.workers,
+        resume=not args.restart,
+        verify=args.verify,
+    )
+    print(f"{count} codes written to {args.output}")
+    return 0
+
+def usage_command(args) -> int:
+    """Count the words of every record of a FASTA or raw sequence file."""
+    usage = word_usage(args.file, args.length)
+    if args.output is None:
+        json.dump(usage, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w") as f:
+            json.dump(usage, f, indent=2)
+        words = sum(record["words"] for record in usage["records"])
+        print(f"{words} words in {len(usage['records'])} records written to {args.output}")
+    return 0
+
+def scan_command(args) -> int:
+    """Call the reading frame of every window of a sequence file."""
+    codons = args.codons if args.codons is not None else X_CODE
+    result = scan_sequence(args.file, args.length, codons, args.window,
+                           processes=args.workers or os.cpu_count() or 1)
+    if args.output is None:
+        json.dump(result, sys.stdout)
+        print()
+    else:
+        with open(args.output, "w") as f:
+            json.dump(result, f)
+        for record in result["records"]:
+            print(f"{record['name']}: {record['letters']} letters, hits per frame "
+                  f"{record['counts']}, frame {record['frame']}")
+    return 0
+
+def density_command(args) -> int:
+    """Index a sequence file once, then print density profiles from the index."""
+    codons = args.codons if args.codons is not None else X_CODE
+    directory = args.index_dir or density_directory()
+    meta = build_density_index(args.file, args.length, codons, directory)
+    index = DensityIndex(directory, meta["indexId"])
+    records = [args.record] if args.record is not None else range(len(meta["records"]))
+    profiles = [
+        index.profile(record, args.window, args.start, args.end, args.points)
+        for record in records
+    ]
+    if args.output is None:
+        json.dump(profiles, sys.stdout)
+        print()
+    else:
+        with open(args.output, "w") as f:
+            json.dump(profiles, f)
+        print(f"{len(profiles)} profiles from index {meta['indexId']} written to {args.output}")
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Codons Visualizer command line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    search = commands.add_parser(
+        "search", help="enumerate all maximal codes of a word length and size"
+    )
+    search.add_argument("-l", "--length", type=int, required=True, help="word length")
+    search.add_argument("-p", "--property", choices=SEARCH_PROPERTIES, default="circular")
+    search.add_argument("-s", "--size", type=int, default=None,
+                        help="number of words (default: the largest possible)")
+    search.add_argument("--self-complementary", action="store_true",
+                        help="only self-complementary codes")
+    search.add_argument("-o", "--output", required=True, help="NDJSON result file")
+    search.add_argument("-w", "--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    search.add_argument("--restart", action="store_true",
+                        help="overwrite the output instead of resuming it")
+    search.add_argument("--verify", action="store_true",
+                        help="re-check every code with the regular property tests")
+    search.set_defaults(handler=search_command)
+
+    usage = commands.add_parser(
+        "usage", help="count the words of a FASTA or raw sequence file (memory-mapped)"
+    )
+    usage.add_argument("file", help="FASTA or raw sequence file")
+    usage.add_argument("-l", "--length", type=int, default=3, help="word length")
+    usage.add_argument("-o", "--output", default=None, help="JSON result file (default: stdout)")
+    usage.set_defaults(handler=usage_command)
+
+    scan = commands.add_parser(
+        "scan", help="call the reading frame of every window of a sequence file with a code"
+    )
+    scan.add_argument("file", help="FASTA or raw sequence file")
+    scan.add_argument("-c", "--codons", default=None,
+                      help="code words separated by spaces (default: the X code)")
+    scan.add_argument("-l", "--length", type=int, default=3, help="word length")
+    scan.add_argument("--window", type=int, default=SCAN_WINDOW, help="letters per window")
+    scan.add_argument("-o", "--output", default=None, help="JSON result file (default: stdout)")
+    scan.add_argument("-w", "--workers", type=int, default=None,
+                      help="worker processes (default: one per CPU)")
+    scan.set_defaults(handler=scan_command)
+
+    density = commands.add_parser(
+        "density", help="code-word density profiles of a sequence file (indexed once)"
+    )
+    density.add_argument("file", help="FASTA or raw sequence file")
+    density.add_argument("-c", "--codons", default=None,
+                         help="code words separated by spaces (default: the X code)")
+    density.add_argument("-l", "--length", type=int, default=3, help="word length")
+    density.add_argument("-r", "--record", default=None,
+                         help="record name (default: every record)")
+    density.add_argument("--window", type=int, default=None,
+                         help="letters per window (default: the whole region)")
+    density.add_argument("--start", type=int, default=0, help="first letter of the region")
+    density.add_argument("--end", type=int, default=None, help="end of the region (exclusive)")
+    density.add_argument("--points", type=int, default=DENSITY_POINTS,
+                         help="windows per profile")
+    density.add_argument("--index-dir", default=None,
+                         help="index directory (default: CODONS_DENSITY_DIR or the temp dir)")
+    density.add_argument("-o", "--output", default=None, help="JSON result file (default: stdout)")
+    density.set_defaults(handler=density_command)
+    return parser
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Service for analysing a code and all of its alpha variants in one pass.
+"""
+from utils.properties_utils import CodeAnalysis
+from utils.graph_utils import get_code_graph
+from utils.cache_utils import ResultCache, cache_key, canonical_cache_key
+from utils.store_utils import default_store
+
+VARIANT_NAMES = (
+    "original", "alphaOne", "alphaTwo", "alphaThree",
+    "alphaFour", "alphaFive", "alphaSix", "alphaSeven",
+)
+ANALYSIS_SECTIONS = ("graphs", "properties", "cn")
+
+def variant_name(k: int) -> str:
+    """Response key of α_k: "original", "alphaOne", ..., then "alpha<k>"."""
+    return VARIANT_NAMES[k] if k < len(VARIANT_NAMES) else f"alpha{k}"
+
+class AnalysisService:
+    """Service class for combined graph and properties analysis."""
+
+    def __init__(self, graph_service=None, cache_size: int = 256):
+        # Optional GraphService whose registry hands out graph ids
+        self.graph_service = graph_service
+        self.cache = ResultCache(cache_size, store=default_store(), name="analysis")
+
+    @staticmethod
+    def _sections(include) -> tuple:
+        if include is None:
+            return ANALYSIS_SECTIONS
+        unknown = [section for section in include if section not in ANALYSIS_SECTIONS]
+        if unknown:
+            raise ValueError(f"Unknown analysis sections: {', '.join(map(str, unknown))}")
+        return tuple(section for section in ANALYSIS_SECTIONS if section in include)
+
+    def result_key(self, number_of_codons: int, codons, include=None) -> str:
+        """
+        Content-addressed cache key (and ETag) of an analysis.  Without graphs
+        the result only depends on the code up to complement-preserving
+        nucleotide renamings, so equivalent codes share a key.
+        """
+        sections = self._sections(include)
+        operation = f"analyze/{','.join(sections)}"
+        if "graphs" not in sections:
+            return canonical_cache_key(
+                number_of_codons, codons, operation, "complementary", False
+            )
+        return cache_key(number_of_codons, codons, operation)
+
+    def analyze(self, number_of_codons: int, codons: str, include=None) -> dict:
+        """
+        Get the graphs, properties and Cⁿ verdict of the code and its alpha
+        variants from a single parse.  *include* selects the sections
+        (default: all of ANALYSIS_SECTIONS).
+        """
+        include = self._sections(include)
+        key = self.result_key(number_of_codons, codons, include)
+        result = self.cache.get_or_compute(
+            key, lambda: self._analyze(number_of_codons, codons, include)
+        )
+        return self._attach_handles(result)
+
+    def _attach_handles(self, result: dict) -> dict:
+        if self.graph_service is None or "graphs" not in result:
+            return result
+        graphs = {
+            name: self.graph_service.attach_handle(graph)
+            for name, graph in result["graphs"].items()
+        }
+        return {**result, "graphs": graphs}
+
+    def _analyze(self, number_of_codons: int, codons: str, include: tuple) -> dict:
+        analysis = CodeAnalysis.from_input(number_of_codons, codons)
+        variants = [(variant_name(k), k) for k in range(len(analysis.variants))]
+
+        result = {}
+        if "graphs" in include:
+            result["graphs"] = self._attach_handles({"graphs": {
+                name: get_code_graph(number_of_codons, analysis.variant(k))
+                for name, k in variants
+            }})["graphs"]
+        if "properties" in include:
+            result["properties"] = {
+                name: analysis.legacy_properties(k) for name, k in variants
+            }
+        if "cn" in include:
+            result["cn"] = analysis.c_n
+        return result
@@ -0,0 +1,121 @@
+"""
+Service for running properties operations on batches of codes.
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from utils.batch_utils import BATCH_CHUNK_SIZE, batch_operation, chunked, evaluate_chunk
+
+# Chunks per worker in each window of a batch
+BATCH_WINDOW_CHUNKS = 4
+
+class BatchService:
+    """
+    Service class for batch properties operations.
+
+    Codes are handled in windows of a few chunks per worker, so the first
+    results stream out before the keys of a large batch are computed.  In
+    each window, cached results are answered from the properties cache
+    (or store); the remaining codes are evaluated in chunks on a lazily
+    started process pool (inline when they fit in one chunk).  Computed
+    results go to the persistent store only, so a large batch does not
+    push the interactive entries out of the in-memory cache.
+    """
+
+    def __init__(self, properties_service, processes: int = None,
+                 chunk_size: int = BATCH_CHUNK_SIZE):
+        self.properties = properties_service
+        self.processes = processes or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def executor(self) -> ProcessPoolExecutor:
+        """The shared worker pool, started on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.processes)
+            return self._executor
+
+    def shutdown(self) -> None:
+        """Stop the worker pool (a later batch starts a new one)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    def _keys(self, operation: str, items) -> list:
+        keys = []
+        for number_of_codons, codons in items:
+            try:
+                keys.append(self.properties.result_key(operation, number_of_codons, codons))
+            except Exception:
+                keys.append(None)           # invalid input: evaluated to get its error
+        return keys
+
+    def _cached(self, keys) -> dict:
+        """{index: result} for every code whose result is cached or stored."""
+        cache = self.properties.cache
+        missing = object()
+        found = {}
+        for i, key in enumerate(keys):
+            if key is not None:
+                value = cache.get(key, missing)
+                if value is not missing:
+                    found[i] = value
+        if cache.store is not None:
+            pending = {keys[i]: i for i in range(len(keys)) if keys[i] is not None and i not in found}
+            for key, value in cache.store.get_many(pending).items():
+                found[pending[key]] = value
+        return found
+
+    def _evaluate(self, operation: str, items):
+        """Yield the entries of evaluate_chunk for *items*, in order."""
+        chunks = chunked(items, self.chunk_size)
+        if len(chunks) <= 1 or self.processes <= 1:
+            results = (evaluate_chunk(operation, chunk) for chunk in chunks)
+        else:
+            results = self.executor().map(evaluate_chunk, repeat(operation), chunks)
+        for chunk in results:
+            yield from chunk
+
+    def iter_properties(self, operation: str, items):
+        """
+        Iterator of {"index": i, "result": ...} or {"index": i, "error": message}
+        for every (numOfCodons, codons) item, in input order, as soon as the
+        chunk holding it is done.  Raises ValueError for an unknown operation.
+        """
+        batch_operation(operation)
+        return self._iter_properties(operation, list(items))
+
+    def _iter_properties(self, operation: str, items):
+        window = self.chunk_size * self.processes * BATCH_WINDOW_CHUNKS
+        for start in range(0, len(items), window):
+            for entry in self._iter_window(operation, items[start:start + window]):
+                yield {**entry, "index": start + entry["index"]}
+
+    def _iter_window(self, operation: str, items):
+        keys = self._keys(operation, items)
+        found = self._cached(keys)
+        pending = [i for i in range(len(items)) if i not in found]
+        computed = self._evaluate(operation, [items[i] for i in pending])
+        stored = []
+        for i in range(len(items)):
+            if i in found:
+                yield {"index": i, "result": found[i]}
+                continue
+            entry = next(computed)
+            if "result" in entry and keys[i] is not None:
+                stored.append((keys[i], entry["result"]))
+            yield {"index": i, **entry}
+        if stored and self.properties.cache.store is not None:
+            self.properties.cache.store.put_many(stored, self.properties.cache.name)
+
+    def get_properties(self, operation: str, items) -> list:
+        """All entries of iter_properties (without indexes), in input order."""
+        return [
+            {key: value for key, value in entry.items() if key != "index"}
+            for entry in self.iter_properties(operation, items)
+        ]
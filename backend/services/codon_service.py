@@ -7,6 +7,7 @@ from utils.codon_utils import (
     word_length, is_comma_free, is_duplicate_free,
     alph1, alph2, alph3
 )
+from utils.symmetry_utils import canonical_form
 from utils.processing_utils import (
     get_component_graph, get_full_representing_graph, process_codons_1_rest,
     process_codons_2_2, process_codons_rest_1, merge_rows, last_parse
@@ -26,6 +27,11 @@ class CodonService:
         """Get complement of a codon sequence."""
         return complement(sequence)
     
+    def get_canonical_form(self, codon_length: int, codons: str,
+                           group: str = "nucleotide", reversal: bool = True) -> dict:
+        """Get the canonical form and class id of a code under nucleotide symmetries."""
+        return canonical_form(codon_length, parseinput(codon_length, codons), group, reversal)
+    
     def check_self_complementary(self, codons) -> bool:
         """Check if codons are self-complementary."""
         return is_self_complementary(codons)
@@ -2,44 +2,131 @@
 Service for handling graph-related operations.
 """
 from utils.graph_utils import (
-    get_graph, get_graph_alpha_one, get_graph_alpha_two, 
-    get_graph_alpha_three, longest_path, shortest_path, all_cycles, remove_isolated_nodes
+    get_graph, get_graph_alpha, get_merged_graph, get_graph_alpha_one, get_graph_alpha_two, 
+    get_graph_alpha_three, longest_path, find_longest_path, shortest_paths, all_cycles,
+    CycleEnumerator, CompiledGraph, ShortestPathTable, LONGEST_PATH_NODE_BUDGET,
+    LONGEST_PATH_TIME_LIMIT, SHORTEST_PATH_TABLES_MAX_BYTES
 )
+from utils.cache_utils import ResultCache, cache_key
+from utils.store_utils import default_store
 
 class GraphService:
     """Service class for graph operations."""
     
-    def __init__(self):
-        pass
+    def __init__(self, cache_size: int = 1024, graph_store_size: int = 512,
+                 path_table_bytes: int = SHORTEST_PATH_TABLES_MAX_BYTES):
+        self.cache = ResultCache(cache_size, store=default_store(), name="graphs")
+        # graph id -> CompiledGraph, so path queries need not re-upload edges
+        self.graphs = ResultCache(graph_store_size)
+        # graph id -> ShortestPathTable, bounded by total size rather than count
+        self.path_tables = ResultCache(
+            graph_store_size, maxbytes=path_table_bytes,
+            sizeof=lambda table: table.nbytes if table is not None else 0,
+        )
+    
+    def result_key(self, operation: str, number_of_codons: int, codons) -> str:
+        """Content-addressed cache key (and ETag) of a graph operation."""
+        return cache_key(number_of_codons, codons, f"graphs/{operation}")
+    
+    def _cached(self, operation: str, number_of_codons: int, codons, compute) -> dict:
+        key = self.result_key(operation, number_of_codons, codons)
+        graph = self.cache.get_or_compute(
+            key, lambda: self.attach_handle(compute(number_of_codons, codons))
+        )
+        return self.attach_handle(graph)
+    
+    def register_graph(self, edges: list, nodes: list = None) -> CompiledGraph:
+        """Compile a graph and keep it server-side under its graph id."""
+        compiled = CompiledGraph.from_edges(edges, nodes)
+        self.graphs.put(compiled.graph_id, compiled)
+        return compiled
+    
+    def attach_handle(self, graph: dict) -> dict:
+        """
+        Make sure *graph* ({"nodes", "edges"}) is registered and return it with
+        its "graphId"; the given dict is never mutated.
+        """
+        graph_id = graph.get("graphId")
+        if graph_id is None or graph_id not in self.graphs:
+            graph_id = self.register_graph(graph["edges"], graph["nodes"]).graph_id
+        if graph.get("graphId") != graph_id:
+            graph = {**graph, "graphId": graph_id}
+        return graph
+    
+    def get_compiled_graph(self, graph_id: str) -> CompiledGraph:
+        """Look up a registered graph; raise KeyError if it is unknown or evicted."""
+        compiled = self.graphs.get(graph_id)
+        if compiled is None:
+            raise KeyError(f"Unknown graph id: {graph_id}")
+        return compiled
+    
+    def get_path_table(self, compiled: CompiledGraph):
+        """The all-pairs ShortestPathTable of a registered graph (None if too large)."""
+        return self.path_tables.get_or_compute(
+            compiled.graph_id, lambda: ShortestPathTable.build(compiled)
+        )
     
     def get_original_graph(self, number_of_codons: int, codons: list) -> dict:
         """Get the original codon graph with isolated nodes removed."""
-        graph = get_graph(number_of_codons, codons)
-        return remove_isolated_nodes(graph)
+        return self._cached("original", number_of_codons, codons, get_graph)
     
     def get_alpha_one_graph(self, number_of_codons: int, codons: list) -> dict:
         """Get the alpha-one transformed codon graph with isolated nodes removed."""
-        graph = get_graph_alpha_one(number_of_codons, codons)
-        return remove_isolated_nodes(graph)
+        return self._cached("alpha-one", number_of_codons, codons, get_graph_alpha_one)
     
     def get_alpha_two_graph(self, number_of_codons: int, codons: list) -> dict:
         """Get the alpha-two transformed codon graph with isolated nodes removed."""
-        graph = get_graph_alpha_two(number_of_codons, codons)
-        return remove_isolated_nodes(graph)
+        return self._cached("alpha-two", number_of_codons, codons, get_graph_alpha_two)
     
     def get_alpha_three_graph(self, number_of_codons: int, codons: list) -> dict:
         """Get the alpha-three transformed codon graph with isolated nodes removed."""
-        graph = get_graph_alpha_three(number_of_codons, codons)
-        return remove_isolated_nodes(graph)
+        return self._cached("alpha-three", number_of_codons, codons, get_graph_alpha_three)
+    
+    def get_alpha_graph(self, k: int, number_of_codons: int, codons: list) -> dict:
+        """Get the α_k transformed codon graph for any 1 ≤ k < codon length."""
+        return self._cached(
+            f"alpha-{k}", number_of_codons, codons,
+            lambda number, codons: get_graph_alpha(number, codons, k),
+        )
+    
+    def get_merged_graph(self, number_of_codons: int, codons: list) -> dict:
+        """
+        Get the original and every α_k graph merged, with a membership bitmask
+        per node and edge (see graph_utils.get_merged_graph).
+        """
+        key = self.result_key("merged", number_of_codons, codons)
+        graph = self.cache.get_or_compute(
+            key, lambda: self.attach_handle(get_merged_graph(number_of_codons, codons))
+        )
+        return self.attach_handle(graph)
     
     def get_longest_path(self, num_nodes: int, edges: list) -> dict:
-        """Get the longest path in a graph."""
+        """Get the longest path in a graph (edge list or CompiledGraph)."""
         return longest_path(num_nodes, edges)
     
+    def find_longest_path(self, edges: list, node_budget: int = LONGEST_PATH_NODE_BUDGET,
+                          time_limit: float = LONGEST_PATH_TIME_LIMIT, cancelled=None) -> dict:
+        """Get the longest path with the engine used and whether it is proven optimal."""
+        return find_longest_path(edges, node_budget, time_limit, cancelled)
+    
     def get_shortest_path(self, edges: list, source: str, target: str, nodes: list) -> list:
-        """Get the shortest path between two nodes in a graph."""
-        return shortest_path(edges, source, target, nodes)
+        """Get the shortest path between two nodes in a graph (edge list or CompiledGraph)."""
+        return self.get_shortest_paths(edges, [(source, target)], nodes)[0]
+    
+    def get_shortest_paths(self, edges: list, pairs: list, nodes: list = None) -> list:
+        """
+        Get the shortest path for every (source, target) pair, in order.
+        Registered graphs answer from their cached all-pairs table.
+        """
+        table = self.get_path_table(edges) if isinstance(edges, CompiledGraph) else None
+        return shortest_paths(edges, pairs, nodes, table)
     
     def get_all_cycles(self, edge_list: list) -> list:
         """Get all cycles in a graph."""
         return all_cycles(edge_list)
+    
+    def iter_cycles(self, edge_list: list, max_length: int = None, max_count: int = None,
+                    time_limit: float = None, min_length: int = 1,
+                    cancelled=None) -> CycleEnumerator:
+        """Lazily enumerate each elementary cycle of a graph once, within limits."""
+        return CycleEnumerator(edge_list, max_length, max_count, time_limit, min_length, cancelled)
@@ -0,0 +1,335 @@
+"""
+Service for running long analyses as background jobs.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.batch_utils import parse_batch_codes
+from utils.search_utils import SEARCH_PROPERTIES, CodeSearch, run_tasks
+
+JOB_WORKERS = 2
+JOB_TTL = 3600.0            # seconds a finished job (and its result) is kept
+JOB_MAX_JOBS = 1000
+JOB_MAX_RESULT_BYTES = 64 * 1024 * 1024         # JSON size of one job's result
+JOB_MAX_RESULTS_BYTES = 512 * 1024 * 1024       # of all results kept in the table
+
+# Limits for job operations, far above the interactive endpoints' ones
+JOB_LONGEST_PATH_NODE_BUDGET = 1_000_000_000
+JOB_LONGEST_PATH_TIME_LIMIT = 3600.0
+JOB_CYCLES_MAX_COUNT = 1_000_000
+JOB_SEARCH_TASKS = 1024
+
+FINISHED = ("done", "failed", "cancelled")
+
+# Parameters each operation needs; a tuple means any one of them
+REQUIRED_PARAMS = {
+    "graph": ("numOfCodons", "codons"),
+    "properties": ("numOfCodons", "codons"),
+    "batch": ("codes",),
+    "longest-path": (("edges", "graphId"),),
+    "cycles": (("edges", "graphId"),),
+    "search": ("length",),
+}
+
+class JobCancelled(Exception):
+    """Raised inside a job once cancellation was requested."""
+
+class Job:
+    """
+    One submitted operation: its status ("queued", "running", "done",
+    "failed" or "cancelled"), progress and, once finished, result or error.
+    The running operation polls ``cancelled()`` / ``check()`` to stop early.
+    """
+
+    def __init__(self, operation: str, params: dict):
+        self.id = uuid.uuid4().hex
+        self.operation = operation
+        self.params = params
+        self.status = "queued"
+        self.progress = None            # {"done": n, "total": m or None}
+        self.result = None
+        self.result_bytes = 0           # JSON size of the result
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self._cancel = threading.Event()
+
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def check(self) -> None:
+        """Raise JobCancelled if cancellation was requested."""
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def report(self, done: int, total: int = None) -> None:
+        """Record progress and honour a pending cancellation."""
+        self.progress = {"done": done, "total": total}
+        self.check()
+
+    def to_dict(self) -> dict:
+        """Status of the job, without its result."""
+        return {
+            "jobId": self.id,
+            "operation": self.operation,
+            "status": self.status,
+            "progress": self.progress,
+            "error": self.error,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+class JobService:
+    """
+    Service class for background jobs: a job table plus a small thread pool.
+
+    Finished jobs are dropped JOB_TTL seconds after they end; cleanup runs
+    whenever the table is used.  A result larger than *max_result_bytes*
+    fails its job, and once the kept results exceed *max_results_bytes*
+    the oldest finished jobs are dropped early.  Cancellation is cooperative, every
+    operation checks its job between units of work.
+    """
+
+    def __init__(self, graph_service, properties_service, batch_service,
+                 workers: int = JOB_WORKERS, ttl: float = JOB_TTL,
+                 max_jobs: int = JOB_MAX_JOBS, max_result_bytes: int = JOB_MAX_RESULT_BYTES,
+                 max_results_bytes: int = JOB_MAX_RESULTS_BYTES):
+        self.graph_service = graph_service
+        self.properties_service = properties_service
+        self.batch_service = batch_service
+        self.ttl = ttl
+        self.max_jobs = max_jobs
+        self.max_result_bytes = max_result_bytes
+        self.max_results_bytes = max_results_bytes
+        self.jobs = dict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="job")
+        self.operations = {
+            "graph": self._graph,
+            "properties": self._properties,
+            "batch": self._batch,
+            "longest-path": self._longest_path,
+            "cycles": self._cycles,
+            "search": self._search,
+        }
+
+    def submit(self, operation: str, params: dict) -> Job:
+        """Queue an operation; ValueError if it is unknown or the table is full."""
+        if operation not in self.operations:
+            raise ValueError(f"Unknown job operation: {operation}")
+        params = dict(params or {})
+        for names in REQUIRED_PARAMS[operation]:
+            names = names if isinstance(names, tuple) else (names,)
+            if not any(name in params for name in names):
+                raise ValueError(f"Missing parameter: {' or '.join(names)}")
+        self.cleanup()
+        job = Job(operation, params)
+        with self._lock:
+            if len(self.jobs) >= self.max_jobs:
+                raise ValueError("Too many jobs, try again later")
+            self.jobs[job.id] = job
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Job:
+        """Look up a job; raise KeyError if it is unknown or expired."""
+        self.cleanup()
+        with self._lock:
+            job = self.jobs.get(job_id)
+        if job is None:
+            raise KeyError(f"Unknown job id: {job_id}")
+        return job
+
+    def all_jobs(self) -> list:
+        """Every job in the table, oldest first."""
+        self.cleanup()
+        with self._lock:
+            return list(self.jobs.values())
+
+    def cancel(self, job_id: str) -> Job:
+        """Request cancellation; a queued job never starts, a running one stops soon."""
+        job = self.get(job_id)
+        job._cancel.set()
+        if job.status == "queued":
+            job.status = "cancelled"
+            job.finished = time.time()
+        return job
+
+    def cleanup(self, now: float = None) -> int:
+        """Drop finished jobs older than the TTL; return how many were dropped."""
+        now = time.time() if now is None else now
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self.jobs.items()
+                if job.finished is not None and now - job.finished > self.ttl
+            ]
+            for job_id in expired:
+                del self.jobs[job_id]
+        return len(expired)
+
+    def _bound_results(self) -> None:
+        """Drop the oldest finished jobs while their results exceed the total limit."""
+        with self._lock:
+            finished = sorted(
+                (job for job in self.jobs.values() if job.finished is not None),
+                key=lambda job: job.finished,
+            )
+            total = sum(job.result_bytes for job in finished)
+            for job in finished:
+                if total <= self.max_results_bytes:
+                    break
+                if job.result_bytes:
+                    total -= job.result_bytes
+                    del self.jobs[job.id]
+
+    def shutdown(self) -> None:
+        """Cancel every job and stop the worker threads."""
+        for job in self.all_jobs():
+            job._cancel.set()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> dict:
+        counts = dict()
+        for job in self.all_jobs():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "jobs": sum(counts.values()),
+            "byStatus": counts,
+            "resultBytes": sum(job.result_bytes for job in self.all_jobs()),
+            "maxResultBytes": self.max_results_bytes,
+        }
+
+    def _run(self, job: Job) -> None:
+        if job.cancelled():
+            return
+        job.status = "running"
+        job.started = time.time()
+        try:
+            result = self.operations[job.operation](job, job.params)
+            job.check()
+            size = len(json.dumps(result, separators=(",", ":")))
+            if size > self.max_result_bytes:
+                raise ValueError(
+                    f"Result too large ({size} bytes, at most {self.max_result_bytes}); "
+                    "narrow the job's parameters"
+                )
+            job.result, job.result_bytes = result, size
+            job.status = "done"
+        except JobCancelled:
+            job.status = "cancelled"
+        except KeyError as e:
+            job.error = e.args[0] if e.args else str(e)
+            job.status = "failed"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished = time.time()
+        self._bound_results()
+
+    #####################
+    # operations        #
+    #####################
+
+    def _request_graph(self, params: dict):
+        if params.get("graphId") is not None:
+            return self.graph_service.get_compiled_graph(params["graphId"])
+        return params["edges"]
+
+    def _graph(self, job: Job, params: dict) -> dict:
+        """{"variant": "original" | "alpha-<k>", "numOfCodons", "codons"}"""
+        variant = params.get("variant", "original")
+        number_of_codons, codons = int(params["numOfCodons"]), params["codons"]
+        if variant == "original":
+            return self.graph_service.get_original_graph(number_of_codons, codons)
+        if variant.startswith("alpha-") and variant[len("alpha-"):].isdigit():
+            k = int(variant[len("alpha-"):])
+            return self.graph_service.get_alpha_graph(k, number_of_codons, codons)
+        raise ValueError(f"Unknown graph variant: {variant}")
+
+    def _properties(self, job: Job, params: dict):
+        """{"operation", "numOfCodons", "codons"(, "property")}"""
+        operation = params.get("operation", "original")
+        number_of_codons, codons = int(params["numOfCodons"]), params["codons"]
+        if operation == "extensions":
+            return self.properties_service.get_extensions(
+                number_of_codons, codons, params.get("property", "circular")
+            )
+        if operation == "k-circularity":
+            return self.properties_service.get_k_circularity(number_of_codons, codons)
+        entry = self.batch_service.get_properties(operation, [(number_of_codons, codons)])[0]
+        if "error" in entry:
+            raise ValueError(entry["error"])
+        return entry["result"]
+
+    def _batch(self, job: Job, params: dict) -> list:
+        """{"operation", "codes", "numOfCodons"} as for /properties/batch"""
+        items = parse_batch_codes(params["codes"], params.get("numOfCodons"))
+        results = []
+        entries = self.batch_service.iter_properties(params.get("operation", "original"), items)
+        for entry in entries:
+            results.append({key: value for key, value in entry.items() if key != "index"})
+            job.report(len(results), len(items))
+        return results
+
+    def _longest_path(self, job: Job, params: dict) -> dict:
+        """{"edges" | "graphId"(, "nodeBudget", "timeLimit")}"""
+        result = self.graph_service.find_longest_path(
+            self._request_graph(params),
+            node_budget=int(params.get("nodeBudget", JOB_LONGEST_PATH_NODE_BUDGET)),
+            time_limit=min(float(params.get("timeLimit", JOB_LONGEST_PATH_TIME_LIMIT)),
+                           JOB_LONGEST_PATH_TIME_LIMIT),
+            cancelled=job.cancelled,
+        )
+        job.check()
+        return result
+
+    def _cycles(self, job: Job, params: dict) -> dict:
+        """{"edges" | "graphId"(, "maxLength", "maxCount", "minLength")}"""
+        max_length = params.get("maxLength")
+        cycles = self.graph_service.iter_cycles(
+            self._request_graph(params),
+            max_length=int(max_length) if max_length is not None else None,
+            max_count=min(int(params.get("maxCount", JOB_CYCLES_MAX_COUNT)), JOB_CYCLES_MAX_COUNT),
+            min_length=int(params.get("minLength", 1)),
+            cancelled=job.cancelled,
+        )
+        found = []
+        for cycle in cycles:
+            found.append(cycle)
+            if len(found) % 1024 == 0:
+                job.report(len(found))
+        job.check()
+        return {"cycles": found, "count": cycles.count, "stopped": cycles.stopped}
+
+    def _search(self, job: Job, params: dict) -> dict:
+        """{"length"(, "property", "size", "selfComplementary", "workers")}"""
+        prop = params.get("property", "circular")
+        if prop not in SEARCH_PROPERTIES:
+            raise ValueError(f"Unknown property: {prop}")
+        size = params.get("size")
+        search = CodeSearch(
+            int(params["length"]), prop,
+            int(size) if size is not None else None,
+            bool(params.get("selfComplementary", False)),
+        )
+        processes = max(1, min(int(params.get("workers", 1)), os.cpu_count() or 1))
+        # Many small subtrees, so progress moves and cancellation is quick
+        depth = search.task_depth(max(JOB_SEARCH_TASKS, 8 * processes))
+        total = len(search.tasks(depth))
+        codes = []
+        tasks = run_tasks(search, processes, depth, done=(), cancelled=job.cancelled)
+        try:
+            for finished, (_, found) in enumerate(tasks, start=1):
+                codes.extend(found)
+                job.report(finished, total)
+            job.check()                 # the last subtree may have stopped early
+        finally:
+            tasks.close()               # terminates the pool on cancellation
+        return {"search": search.params(), "count": len(codes), "codes": codes}
@@ -2,35 +2,105 @@
 Service for handling properties-related operations.
 """
 from utils.properties_utils import (
-    properties, properties_alpha_one, properties_alpha_two, properties_alpha_three,
-    c3, is_circular_code
+    properties, properties_alpha, properties_alpha_one, properties_alpha_two,
+    properties_alpha_three, c3, is_circular_code, extension_words,
+    shortest_ambiguity, word_graph, has_duplicates, has_property
 )
+from utils.codon_utils import parseinput
+from utils.cache_utils import ResultCache, cache_key, canonical_cache_key
+from utils.store_utils import default_store
+
+# Operations whose results only depend on the symmetry class of the code, and
+# the (group, reversal) they are invariant under: reversal maps α_k to
+# α_(L-k), and self-complementarity needs complement-preserving renamings.
+# Generic "alpha-<k>" operations are treated like the named ones.
+SYMMETRIC_OPERATIONS = {
+    "original": ("complementary", True),
+    "alpha-one": ("complementary", False),
+    "alpha-two": ("complementary", False),
+    "alpha-three": ("complementary", False),
+    "c3": ("nucleotide", True),
+}
 
 class PropertiesService:
     """Service class for properties operations."""
     
-    def __init__(self):
-        pass
+    def __init__(self, cache_size: int = 1024):
+        self.cache = ResultCache(cache_size, store=default_store(), name="properties")
+    
+    def result_key(self, operation: str, number_of_codons: int, codons) -> str:
+        """
+        Content-addressed cache key (and ETag) of a properties operation;
+        symmetric operations share one key per class of equivalent codes.
+        """
+        symmetry = SYMMETRIC_OPERATIONS.get(operation)
+        if symmetry is None and operation.startswith("alpha-"):
+            symmetry = SYMMETRIC_OPERATIONS["alpha-one"]
+        if symmetry is not None:
+            group, reversal = symmetry
+            return canonical_cache_key(
+                number_of_codons, codons, f"properties/{operation}", group, reversal
+            )
+        return cache_key(number_of_codons, codons, f"properties/{operation}")
+    
+    def _cached(self, operation: str, number_of_codons: int, codons, compute):
+        key = self.result_key(operation, number_of_codons, codons)
+        return self.cache.get_or_compute(key, lambda: compute(number_of_codons, codons))
     
     def get_original_properties(self, number_of_codons: int, codons: list) -> dict:
         """Get properties for original codons."""
-        return properties(number_of_codons, codons)
+        return self._cached("original", number_of_codons, codons, properties)
     
     def get_alpha_one_properties(self, number_of_codons: int, codons: list) -> dict:
         """Get properties for alpha-one transformed codons."""
-        return properties_alpha_one(number_of_codons, codons)
+        return self._cached("alpha-one", number_of_codons, codons, properties_alpha_one)
     
     def get_alpha_two_properties(self, number_of_codons: int, codons: list) -> dict:
         """Get properties for alpha-two transformed codons."""
-        return properties_alpha_two(number_of_codons, codons)
+        return self._cached("alpha-two", number_of_codons, codons, properties_alpha_two)
     
     def get_alpha_three_properties(self, number_of_codons: int, codons: list) -> dict:
         """Get properties for alpha-three transformed codons."""
-        return properties_alpha_three(number_of_codons, codons)
+        return self._cached("alpha-three", number_of_codons, codons, properties_alpha_three)
+    
+    def get_alpha_properties(self, k: int, number_of_codons: int, codons: list) -> dict:
+        """Get properties for α_k transformed codons, any 1 ≤ k < codon length."""
+        return self._cached(
+            f"alpha-{k}", number_of_codons, codons,
+            lambda number, codons: properties_alpha(number, codons, k),
+        )
     
     def get_c3_properties(self, number_of_codons: int, codons: list):
         """Get C3 properties for codons."""
-        return c3(number_of_codons, codons)
+        return self._cached("c3", number_of_codons, codons, c3)
+    
+    def get_extensions(self, number_of_codons: int, codons, property: str = "circular") -> dict:
+        """Get every codon that can be added keeping the code circular (or C3)."""
+        def compute(number_of_codons, codons):
+            code = parseinput(number_of_codons, codons)
+            words = extension_words(number_of_codons, code, property)
+            # No addable word is only maximal if the code has the property at all
+            maximal = not words and has_property(number_of_codons, code, property)
+            return {"property": property, "words": words, "maximal": maximal}
+        return self._cached(f"extensions/{property}", number_of_codons, codons, compute)
+    
+    def get_k_circularity(self, number_of_codons: int, codons) -> dict:
+        """
+        Get the k-circularity degree of a code with a witness: the closed walk
+        of the representing graph behind its shortest ambiguous necklace.
+        """
+        def compute(number_of_codons, codons):
+            words = parseinput(number_of_codons, codons)
+            if len(set(len(w) for w in words)) > 1:
+                raise ValueError("k-circularity needs words of a single length")
+            if has_duplicates(words):
+                return {"circular": False, "degree": 0, "ambiguousWords": 1, "cycle": None}
+            ambiguity = shortest_ambiguity(word_graph(words))
+            if ambiguity is None:
+                return {"circular": bool(words), "degree": None, "ambiguousWords": None, "cycle": None}
+            m, walk = ambiguity
+            return {"circular": False, "degree": m - 1, "ambiguousWords": m, "cycle": walk}
+        return self._cached("k-circularity", number_of_codons, codons, compute)
     
     def check_circular_code(self, number_of_codons: int, codon_input: list) -> bool:
         """Check if the given codons form a circular code."""
@@ -0,0 +1,73 @@
+"""
+Service for analyses of long nucleotide sequences (FASTA or raw files).
+"""
+from utils.cache_utils import ResultCache
+from utils.density_utils import (
+    DENSITY_POINTS, DensityIndex, build_density_index, density_directory
+)
+from utils.scan_utils import SCAN_WINDOW, X_CODE, scan_sequence
+from utils.sequence_utils import SEQUENCE_CHUNK_SIZE, word_usage
+
+class SequenceService:
+    """
+    Service class for sequence operations.  Sources are streamed through
+    utils.sequence_utils.SequenceReader, so a file is never held in memory
+    as one cleaned string.  Density indexes live on disk (see
+    density_utils); the most recently used ones stay memory-mapped.
+    """
+
+    def __init__(self, chunk_size: int = SEQUENCE_CHUNK_SIZE, index_cache_size: int = 16,
+                 directory: str = None):
+        self.chunk_size = chunk_size
+        self.directory = directory
+        # index id -> DensityIndex
+        self.indexes = ResultCache(index_cache_size)
+
+    def _code(self, length: int, codons: str = None) -> str:
+        """The given code, or the X code for trinucleotides."""
+        if codons is None:
+            if length != 3:
+                raise ValueError("A code is required for words of length other than 3")
+            return X_CODE
+        return codons
+
+    def get_word_usage(self, source, length: int) -> dict:
+        """Per-record counts of the words of *length* in a path, bytes or binary file."""
+        return word_usage(source, length, self.chunk_size)
+
+    def scan(self, source, length: int = 3, codons: str = None,
+             window: int = SCAN_WINDOW, processes: int = 1) -> dict:
+        """
+        Per-window frame calls of a sequence against a code (the X code when
+        *codons* is not given); *processes* only applies to file paths.
+        """
+        return scan_sequence(source, length, self._code(length, codons), window,
+                             processes, self.chunk_size)
+
+    def build_density_index(self, source, length: int = 3, codons: str = None) -> dict:
+        """
+        Index a sequence against a code (reusing a stored index of the same
+        sequence and code) and return its "indexId", code and records.
+        """
+        meta = build_density_index(source, length, self._code(length, codons),
+                                   self.directory or density_directory(), self.chunk_size)
+        return {
+            **meta,
+            "records": [{"name": r["name"], "letters": r["letters"]} for r in meta["records"]],
+        }
+
+    def get_density_index(self, index_id: str) -> DensityIndex:
+        """Look up a stored index; raise KeyError if there is none."""
+        index = self.indexes.get(index_id)
+        if index is None:
+            index = DensityIndex(self.directory or density_directory(), index_id)
+            self.indexes.put(index_id, index)
+        else:
+            index.touch()
+        return index
+
+    def get_density_profile(self, index_id: str, record=None, window: int = None,
+                            start: int = 0, end: int = None,
+                            points: int = DENSITY_POINTS) -> dict:
+        """Windowed hits and density per frame over a region of an indexed record."""
+        return self.get_density_index(index_id).profile(record, window, start, end, points)
@@ -0,0 +1,69 @@
+"""
+Utility functions for evaluating one properties operation on many codes.
+
+Codes travel to worker processes in chunks; every chunk comes back as a list
+of {"result": ...} or {"error": message} entries in input order, so one bad
+code does not fail the whole batch.
+"""
+from .properties_utils import (
+    properties, properties_alpha, properties_alpha_one, properties_alpha_two,
+    properties_alpha_three, c3
+)
+
+BATCH_CHUNK_SIZE = 256
+BATCH_MAX_CODES = 100_000
+
+NAMED_OPERATIONS = {
+    "original": properties,
+    "alpha-one": properties_alpha_one,
+    "alpha-two": properties_alpha_two,
+    "alpha-three": properties_alpha_three,
+    "c3": c3,
+}
+
+def batch_operation(operation: str):
+    """
+    The properties function behind an operation name: the named ones of
+    /properties/* or "alpha-<k>".  Raises ValueError for anything else.
+    """
+    if operation in NAMED_OPERATIONS:
+        return NAMED_OPERATIONS[operation]
+    if operation.startswith("alpha-") and operation[len("alpha-"):].isdigit():
+        k = int(operation[len("alpha-"):])
+        return lambda number, codons: properties_alpha(number, codons, k)
+    raise ValueError(f"Unknown operation: {operation}")
+
+def evaluate_chunk(operation: str, items) -> list[dict]:
+    """Run an operation on (numOfCodons, codons) pairs, catching per-code errors."""
+    compute = batch_operation(operation)
+    results = []
+    for number_of_codons, codons in items:
+        try:
+            results.append({"result": compute(number_of_codons, codons)})
+        except Exception as e:
+            results.append({"error": str(e)})
+    return results
+
+def chunked(items, size: int = BATCH_CHUNK_SIZE) -> list[list]:
+    """Split a list into consecutive chunks of at most *size* items."""
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+def parse_batch_codes(codes, number_of_codons=None) -> list[tuple]:
+    """
+    Normalize a batch to (numOfCodons, codons) pairs.  Entries are either
+    codon strings using the batch-wide *number_of_codons*, or objects with
+    their own "codons" and optional "numOfCodons".
+    """
+    if not isinstance(codes, list):
+        raise ValueError("codes must be a list")
+    if len(codes) > BATCH_MAX_CODES:
+        raise ValueError(f"At most {BATCH_MAX_CODES} codes per batch")
+    items = []
+    for entry in codes:
+        if isinstance(entry, dict):
+            number = entry.get("numOfCodons", number_of_codons)
+            codons = entry.get("codons")
+        else:
+            number, codons = number_of_codons, entry
+        items.append((int(number) if number is not None else None, codons))
+    return items
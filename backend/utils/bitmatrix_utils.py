@@ -0,0 +1,175 @@
+"""
+Utility functions for representing graphs as adjacency bit-matrices.
+
+For a fixed word length L every representing graph lives on the same vertex
+universe: the 4 + 16 + ... + 4^(L-1) words of length 1 .. L-1 (84 for L=4).
+A vertex of length i packed as ``value`` (see packed_utils) gets the dense
+index ``(4**i - 4) // 3 + value``, so one graph is an (N, N) boolean matrix
+and a batch of graphs a (B, N, N) array.  Transitive closure, cycle
+detection, path counts and strongly connected components are then matrix
+operations over the whole batch.
+
+The matrices grow with 16^L, so batch checks use this backend up to
+BITMATRIX_MAX_LENGTH (84 vertices); beyond that the per-code adjacency-dict
+functions in properties_utils are faster.
+"""
+import numpy as np
+
+from .packed_utils import decode_word, node_length
+from .vector_utils import letter_codes, pack_array, text_to_array
+
+BITMATRIX_MAX_LENGTH = 4
+
+# Upper bound on matrix cells handled per step, to bound memory on big batches
+BATCH_CELLS = 1 << 24
+
+#####################
+# vertex universe   #
+#####################
+
+def universe_size(length: int) -> int:
+    """Number of proper prefixes/suffixes of words of the given length."""
+    return (4 ** length - 4) // 3
+
+def vertex_offset(size: int) -> int:
+    """Dense index of the first vertex of the given word size."""
+    return (4 ** size - 4) // 3
+
+def vertex_index(node: int) -> int:
+    """Dense index of a packed vertex id (``value | 1 << 2*size``)."""
+    size = node_length(node)
+    return node - 4 ** size + vertex_offset(size)
+
+def vertex_labels(length: int) -> list[str]:
+    """Word of every dense vertex index."""
+    return [decode_word(value, size)
+            for size in range(1, length) for value in range(4 ** size)]
+
+def batch_size(length: int) -> int:
+    """Graphs per step so that one step stays within BATCH_CELLS cells."""
+    return max(1, BATCH_CELLS // max(1, universe_size(length)) ** 2)
+
+#####################
+# construction      #
+#####################
+
+def adjacency_from_packed(length: int, packed, batch=None) -> np.ndarray:
+    """
+    (B, N, N) adjacency matrices from packed words.
+
+    *packed* is either a (B, n) array (B codes of n words each) or a flat
+    array of words with *batch* giving the code index of every word.
+    """
+    packed = np.asarray(packed, dtype=np.uint64)
+    if batch is None:
+        count = packed.shape[0]
+        batch = np.repeat(np.arange(count), packed.shape[1] if packed.ndim > 1 else 0)
+        packed = packed.reshape(-1)
+    else:
+        batch = np.asarray(batch, dtype=np.int64)
+        count = int(batch.max()) + 1 if len(batch) else 0
+    size = universe_size(length)
+    matrices = np.zeros((count, size, size), dtype=bool)
+    for i in range(1, length):
+        shift = np.uint64(2 * (length - i))
+        prefix = (packed >> shift).astype(np.int64) + vertex_offset(i)
+        suffix = (packed & ((np.uint64(1) << shift) - np.uint64(1))).astype(np.int64)
+        matrices[batch, prefix, suffix + vertex_offset(length - i)] = True
+    return matrices
+
+def adjacency_batch(length: int, codes) -> np.ndarray:
+    """(B, N, N) adjacency matrices of codes of A/C/G/T words (any sizes)."""
+    codes = [list(code) for code in codes]
+    if any(len(w) != length for code in codes for w in code):
+        raise ValueError(f"All words must have length {length}")
+    text = "".join("".join(code) for code in codes)
+    packed = pack_array(letter_codes(text_to_array(text, length))) if text else []
+    batch = np.repeat(np.arange(len(codes)), [len(code) for code in codes])
+    matrices = adjacency_from_packed(length, packed, batch)
+    if len(matrices) < len(codes):        # trailing empty codes
+        size = universe_size(length)
+        padding = np.zeros((len(codes) - len(matrices), size, size), dtype=bool)
+        matrices = np.concatenate([matrices, padding])
+    return matrices
+
+#####################
+# matrix algorithms #
+#####################
+
+def transitive_closure(matrices: np.ndarray) -> np.ndarray:
+    """
+    Reachability by paths of one or more edges, by repeated squaring:
+    after t rounds every path of up to 2^t edges is covered.
+    """
+    reach = matrices.astype(np.float32)
+    for _ in range(max(1, matrices.shape[-1].bit_length())):
+        step = np.minimum(reach + reach @ reach, 1)
+        if np.array_equal(step, reach):
+            break
+        reach = step
+    return reach > 0
+
+def has_cycles(matrices: np.ndarray) -> np.ndarray:
+    """
+    Per graph: some vertex reaches itself.  Vertices without an active
+    predecessor or successor cannot lie on a cycle, so they are peeled off
+    together until nothing changes; a graph is cyclic iff vertices remain.
+    Each round is one matrix-vector product per graph, and the rounds are
+    bounded by the longest path instead of log N full squarings.
+    """
+    edges = matrices.astype(np.float32)
+    active = (matrices.any(axis=-1) & matrices.any(axis=-2)).astype(np.float32)
+    while True:
+        successors = (edges @ active[..., None])[..., 0]
+        predecessors = (active[..., None, :] @ edges)[..., 0, :]
+        step = active * (successors > 0) * (predecessors > 0)
+        if np.array_equal(step, active):
+            return active.any(axis=-1)
+        active = step
+
+def path_counts(matrices: np.ndarray, max_edges: int = None) -> np.ndarray:
+    """
+    Number of walks of 1 .. *max_edges* edges (default: N) between every
+    pair of vertices; in an acyclic graph these are exactly its paths.
+    """
+    size = matrices.shape[-1]
+    max_edges = size if max_edges is None else max_edges
+    step = matrices.astype(np.int64)
+    power = step
+    total = step.copy()
+    for _ in range(max_edges - 1):
+        power = power @ step
+        if not power.any():
+            break
+        total += power
+    return total
+
+def scc_labels(matrices: np.ndarray) -> np.ndarray:
+    """
+    Strongly connected component of every vertex, labelled by the smallest
+    vertex index in it (vertices u, v share one iff each reaches the other).
+    """
+    reach = transitive_closure(matrices) | np.eye(matrices.shape[-1], dtype=bool)
+    mutual = reach & np.swapaxes(reach, -1, -2)
+    return mutual.argmax(axis=-1)
+
+#####################
+# code properties   #
+#####################
+
+def circular_batch_packed(length: int, packed) -> np.ndarray:
+    """
+    ``is_circular`` for a (B, n) array of packed codes, in chunks of
+    ``batch_size`` graphs.
+    """
+    packed = np.asarray(packed, dtype=np.uint64)
+    result = np.zeros(packed.shape[0], dtype=bool)
+    if packed.ndim < 2 or packed.shape[1] == 0:
+        return result
+    ordered = np.sort(packed, axis=1)
+    duplicate_free = ~(ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+    step = batch_size(length)
+    for start in range(0, packed.shape[0], step):
+        chunk = packed[start:start + step]
+        result[start:start + step] = ~has_cycles(adjacency_from_packed(length, chunk))
+    return result & duplicate_free
@@ -0,0 +1,152 @@
+"""
+Utility functions for caching computed results.
+
+Results are content-addressed: the key is a hash of the operation, the codon
+length and the canonicalized codon list, so the same code typed with other
+spacing, case or word order maps to the same entry.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from .codon_utils import parseinput
+from .symmetry_utils import canonical_form
+
+# Bump when an algorithm change alters results, to invalidate old keys/ETags
+CACHE_VERSION = 5
+
+def canonical_codons(codon_length: int, codons) -> list[str]:
+    """Parsed, upper-cased and sorted words of a codon string or list."""
+    if isinstance(codons, str):
+        words = parseinput(codon_length, codons)
+    else:
+        words = [str(word).upper() for word in codons]
+    return sorted(words)
+
+def cache_key(codon_length: int, codons, operation: str) -> str:
+    """Stable hex digest identifying *operation* applied to a code."""
+    payload = json.dumps(
+        [CACHE_VERSION, operation, codon_length, canonical_codons(codon_length, codons)],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def canonical_cache_key(codon_length: int, codons, operation: str,
+                        group: str = "nucleotide", reversal: bool = True) -> str:
+    """
+    ``cache_key`` shared by every code in a symmetry class (see
+    symmetry_utils), for operations whose result is invariant under that
+    group.  Codes that cannot be canonicalized keep their plain key.
+    """
+    words = canonical_codons(codon_length, codons)
+    try:
+        canonical = canonical_form(codon_length, words, group, reversal)["canonical"]
+    except ValueError:
+        return cache_key(codon_length, codons, operation)
+    suffix = "+reversal" if reversal else ""
+    return cache_key(codon_length, canonical, f"{operation}@{group}{suffix}")
+
+class ResultCache:
+    """
+    Bounded, thread-safe LRU cache with hit/miss counters.
+
+    With a *store* (see store_utils.ResultStore), misses fall through to the
+    persistent store before computing, and computed values are written back
+    to it under the cache *name*.
+
+    With *maxbytes* and a *sizeof* callable, entries are also evicted until
+    their total size is at most *maxbytes*; a single value larger than that
+    is not kept.
+
+    Cached values are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, maxsize: int = 1024, store=None, name: str = "",
+                 maxbytes: int = None, sizeof=None):
+        self.maxsize = maxsize
+        self.store = store
+        self.name = name
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.store_hits = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key: str, default=None):
+        """Return the cached value for *key* (and mark it recently used)."""
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+            self.misses += 1
+            return default
+
+    def put(self, key: str, value) -> None:
+        """Store *value*, evicting the least recently used entries if full."""
+        if self.maxsize <= 0:
+            return
+        size = self.sizeof(value) if self.sizeof is not None else 0
+        if self.maxbytes is not None and size > self.maxbytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.bytes -= self._entries[key][1]
+            self._entries[key] = (value, size)
+            self._entries.move_to_end(key)
+            self.bytes += size
+            while len(self._entries) > self.maxsize or (
+                    self.maxbytes is not None and self.bytes > self.maxbytes):
+                self.bytes -= self._entries.popitem(last=False)[1][1]
+
+    def get_or_compute(self, key: str, compute):
+        """Return the cached value for *key*, computing and storing it on a miss."""
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+        if self.store is not None:
+            value = self.store.get(key, missing)
+            if value is not missing:
+                with self._lock:
+                    self.store_hits += 1
+                self.put(key, value)
+                return value
+        # Computed outside the lock: concurrent misses may compute twice.
+        value = compute()
+        self.put(key, value)
+        if self.store is not None:
+            self.store.put(key, value, self.name)
+        return value
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.store_hits = 0
+
+    def stats(self) -> dict:
+        """Size and hit/miss counters."""
+        with self._lock:
+            stats = {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "store_hits": self.store_hits,
+            }
+            if self.maxbytes is not None:
+                stats["bytes"] = self.bytes
+                stats["maxbytes"] = self.maxbytes
+            return stats
@@ -3,6 +3,7 @@ import re
 """
 Utility functions for codon operations.
 """
+from .vector_utils import text_to_array, array_to_text, rotate_batch
 
 def remove_spaces(s: str) -> str:
     """Remove spaces from string."""
@@ -16,8 +17,7 @@ def parseinput(codon_length: int, codons: str) -> list:
     """Parse input codons string into list."""
     if codon_length < 1:
         return []
-    codonsy = remove_spaces(codons)
-    codonsy = remove_backslashes(codonsy)
+    codonsy = _clean(codons)
     return [codonsy[i : i + codon_length] for i in range(0, len(codonsy), codon_length)]
 
 def get_complement(nucleotide: str) -> str:
@@ -108,25 +108,42 @@ def alpha(codons_string: str,
     """
     if not (1 <= k < codon_length):
         raise ValueError("k must satisfy 1 ≤ k < codon_length")
+    return alpha_all(codons_string, codon_length, (k,))[0]
+
+def alpha_all(codons_string: str,
+              codon_length: int,
+              ks=None) -> list[str]:
+    """
+    α_k of the same input for several *k* (default: every 1 ≤ k < codon_length).
+    The string is cleaned and split once and all rotations of the full codons
+    come out of a single vectorized call; tails follow the rules of ``alpha``.
+    """
+    ks = list(range(1, codon_length)) if ks is None else list(ks)
+    if not all(1 <= k < codon_length for k in ks):
+        raise ValueError("k must satisfy 1 ≤ k < codon_length")
 
     clean    = _clean(codons_string)
     full_len = len(clean) // codon_length * codon_length
-    tail_len = len(clean) - full_len
+    tail     = clean[full_len:]
 
     # ------ rotate the full codons ------
     codon_part = clean[:full_len]
-    codons     = _split(codon_part, codon_length)
-    rotated    = [c[-k:] + c[:-k] for c in codons]
+    if codon_part.isascii():
+        rotated = rotate_batch(text_to_array(codon_part, codon_length), ks)
+        bodies  = [array_to_text(r) for r in rotated]
+    else:
+        codons = _split(codon_part, codon_length)
+        bodies = [''.join(c[-k:] + c[:-k] for c in codons) for k in ks]
 
     # ------ handle the tail ------
-    if tail_len:
-        tail = clean[full_len:]
-        if tail_len > k:
-            tail = tail[-k:] + tail[:-k]     # rotate only when possible
-        # otherwise: keep tail as-is
-        rotated.append(tail)
-
-    return ''.join(rotated)
+    results = []
+    for body, k in zip(bodies, ks):
+        if len(tail) > k:
+            body += tail[-k:] + tail[:-k]    # rotate only when possible
+        else:
+            body += tail                     # otherwise: keep tail as-is
+        results.append(body)
+    return results
 # --------------------------------------------------------------------
 # convenience wrappers
 # --------------------------------------------------------------------
@@ -0,0 +1,340 @@
+"""
+Utility functions for code-word density profiles of long sequences.
+
+A density index holds, for every record and frame f (see scan_utils), the
+running count of code-word hits over the word starts f, f+L, f+2L, ...:
+row k of a record's (rows, L) uint32 table counts the hits of each frame
+before letter k*L.  It is built in one streaming pass per (sequence, code)
+and written to disk, where queries memory-map it: the hits of a frame in
+any region are the difference of two rows, so a profile costs O(1) per
+point whatever the window size, and the sequence is never scanned again.
+
+An index is named by a digest of the raw sequence and the code, and stored
+as <id>.u32 (every record's table, back to back) and <id>.json (the code and
+the records' names, lengths and first rows) in CODONS_DENSITY_DIR (default
+"codons-density" in the temp directory).  The .json file is written last and
+its modification time records the last use; after every build the least
+recently used indexes are pruned beyond CODONS_DENSITY_MAX_MB (default 4096)
+and those unused for CODONS_DENSITY_MAX_AGE_HOURS (default 168).
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from .packed_utils import decode_code
+from .scan_utils import call_frames, code_table, iter_hits, scan_code
+from .sequence_utils import SEQUENCE_CHUNK_SIZE, SequenceReader
+
+# Bump when the file layout changes, so old indexes are not reused
+DENSITY_INDEX_VERSION = 1
+DENSITY_POINTS = 1000               # profile points returned by default
+DENSITY_MAX_POINTS = 100_000
+DENSITY_MAX_MB = 4096
+DENSITY_MAX_AGE_HOURS = 168
+DENSITY_LOW_WATER = 0.9             # pruning frees space down to this share of the limit
+DENSITY_STALE_SECONDS = 3600        # unfinished or orphaned files older than this are removed
+
+def density_directory() -> str:
+    """Directory holding density indexes (CODONS_DENSITY_DIR or the temp dir)."""
+    return os.environ.get("CODONS_DENSITY_DIR") or os.path.join(
+        tempfile.gettempdir(), "codons-density"
+    )
+
+def density_limits() -> tuple:
+    """(max bytes, max age in seconds) of the index directory, from the environment."""
+    return (
+        int(os.environ.get("CODONS_DENSITY_MAX_MB", DENSITY_MAX_MB)) * 1024 * 1024,
+        float(os.environ.get("CODONS_DENSITY_MAX_AGE_HOURS", DENSITY_MAX_AGE_HOURS)) * 3600,
+    )
+
+def density_index_id(sequence_digest: str, length: int, values: tuple) -> str:
+    """Stable id of the index of one sequence against one code."""
+    payload = json.dumps([DENSITY_INDEX_VERSION, sequence_digest, length, list(values)],
+                         separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+#####################
+# building          #
+#####################
+
+class _RunningRows:
+    """Cumulative hit rows of one record, written as its hits arrive."""
+
+    def __init__(self, out, length: int, previous: "_RunningRows" = None):
+        self.out = out
+        self.length = length
+        self.first = previous.first + previous.rows if previous is not None else 0
+        self.totals = np.zeros(length, dtype=np.uint32)
+        self.pending = np.empty(0, dtype=bool)      # hits of the unfinished row
+        self.rows = 1
+        self.letters = 0
+        out.write(self.totals.tobytes())            # row 0: nothing counted yet
+
+    def add(self, hits: np.ndarray) -> None:
+        hits = np.concatenate([self.pending, hits]) if len(self.pending) else hits
+        full = len(hits) // self.length
+        if full:
+            rows = np.cumsum(hits[:full * self.length].reshape(full, self.length),
+                             axis=0, dtype=np.uint32) + self.totals
+            self.out.write(rows.astype("<u4").tobytes())
+            self.totals = rows[-1]
+            self.rows += full
+        self.pending = hits[full * self.length:]
+
+    def finish(self) -> None:
+        if len(self.pending):
+            self.add(np.zeros(self.length - len(self.pending), dtype=bool))
+
+def build_density_index(source, length: int, codons: str, directory: str = None,
+                        chunk_size: int = SEQUENCE_CHUNK_SIZE, max_bytes: int = None,
+                        max_age: float = None) -> dict:
+    """
+    Index a sequence (path, bytes or seekable binary file) against a code
+    and return the index metadata.  An index that already exists for the
+    same sequence and code is reused without reading past the digest.
+    Afterwards the directory is pruned to *max_bytes* and *max_age*
+    (default: ``density_limits()``), always keeping this index.
+    """
+    values = scan_code(length, codons)
+    directory = directory or density_directory()
+    reader = SequenceReader(source, chunk_size)
+    index_id = density_index_id(reader.digest(), length, values)
+    try:
+        meta = read_density_meta(directory, index_id)
+        touch_density_index(directory, index_id)
+        return meta
+    except KeyError:
+        pass
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, index_id)
+    records = []
+    with tempfile.NamedTemporaryFile(dir=directory, suffix=".u32.tmp", delete=False) as out:
+        try:
+            with reader:
+                for record, letters, offset, hits in iter_hits(reader, length, code_table(length, values)):
+                    while len(records) <= record:
+                        if records:
+                            records[-1].finish()
+                        records.append(_RunningRows(out, length, records[-1] if records else None))
+                    records[record].add(hits)
+                    records[record].letters += letters
+                if records:
+                    records[-1].finish()
+                while len(records) < len(reader.names):
+                    records.append(_RunningRows(out, length, records[-1] if records else None))
+                names = reader.names
+        except BaseException:
+            out.close()
+            os.unlink(out.name)
+            raise
+    os.replace(out.name, base + ".u32")
+    meta = {
+        "indexId": index_id,
+        "length": length,
+        "code": decode_code(values, length),
+        "records": [
+            {"name": name, "letters": rows.letters, "firstRow": rows.first, "rows": rows.rows}
+            for name, rows in zip(names, records)
+        ],
+    }
+    with open(base + ".json.tmp", "w") as f:
+        json.dump(meta, f)
+    os.replace(base + ".json.tmp", base + ".json")
+    limit, age = density_limits()
+    prune_density_indexes(directory, limit if max_bytes is None else max_bytes,
+                          age if max_age is None else max_age, keep=index_id)
+    return meta
+
+def read_density_meta(directory: str, index_id: str) -> dict:
+    """Metadata of a stored index; KeyError unless both of its files exist."""
+    if not index_id or any(c not in "0123456789abcdef" for c in index_id):
+        raise KeyError(f"Unknown density index id: {index_id}")
+    base = os.path.join(directory, index_id)
+    try:
+        if not os.path.exists(base + ".u32"):
+            raise FileNotFoundError(base + ".u32")
+        with open(base + ".json") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise KeyError(f"Unknown density index id: {index_id}")
+
+def touch_density_index(directory: str, index_id: str) -> None:
+    """Mark an index as just used, so pruning evicts it last."""
+    try:
+        os.utime(os.path.join(directory, index_id + ".json"))
+    except FileNotFoundError:
+        pass
+
+def _remove(*paths) -> None:
+    for path in paths:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+def _remove_index(directory: str, index_id: str) -> None:
+    """Delete an index, metadata first so it is never half visible."""
+    _remove(os.path.join(directory, index_id + ".json"), os.path.join(directory, index_id + ".u32"))
+
+def prune_density_indexes(directory: str, max_bytes: int, max_age: float,
+                          keep: str = None, now: float = None) -> int:
+    """
+    Remove indexes unused for *max_age* seconds, then the least recently
+    used ones until the rest fit in DENSITY_LOW_WATER of *max_bytes* (only
+    when the directory holds more than *max_bytes*).  Unfinished and
+    orphaned files are removed once they are DENSITY_STALE_SECONDS old.
+    The *keep* index is never removed.  Returns the number of indexes removed.
+    """
+    now = time.time() if now is None else now
+    indexes, orphans = [], []               # (last use, bytes or None, id), paths
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return 0
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        index_id, _, suffix = name.partition(".")
+        if suffix == "json":
+            try:
+                size = stat.st_size + os.path.getsize(os.path.join(directory, index_id + ".u32"))
+            except FileNotFoundError:
+                size = None                 # its table is gone: unusable
+            indexes.append((stat.st_mtime, size, index_id))
+        elif suffix == "u32" and index_id + ".json" in names:
+            continue
+        elif suffix in ("u32", "u32.tmp", "json.tmp") and now - stat.st_mtime > DENSITY_STALE_SECONDS:
+            orphans.append(path)            # a failed build, or a table without metadata
+    _remove(*orphans)
+    removed, protected, candidates = 0, 0, []
+    for accessed, size, index_id in sorted(indexes, key=lambda entry: -entry[0]):
+        if index_id == keep:
+            protected = size or 0
+        elif size is None or now - accessed > max_age:
+            _remove_index(directory, index_id)
+            removed += 1
+        else:
+            candidates.append((size, index_id))
+    if protected + sum(size for size, _ in candidates) <= max_bytes:
+        return removed
+    # Keep the most recently used indexes that fit under the low-water mark
+    running, full = protected, False
+    for size, index_id in candidates:
+        full = full or running + size > max_bytes * DENSITY_LOW_WATER
+        if full:
+            _remove_index(directory, index_id)
+            removed += 1
+        else:
+            running += size
+    return removed
+
+#####################
+# querying          #
+#####################
+
+class DensityIndex:
+    """A stored index, memory-mapped; every query is a few row lookups."""
+
+    def __init__(self, directory: str, index_id: str):
+        self.meta = read_density_meta(directory, index_id)
+        self.id = index_id
+        self.length = self.meta["length"]
+        rows = sum(record["rows"] for record in self.meta["records"])
+        self.directory = directory
+        path = os.path.join(directory, index_id + ".u32")
+        try:
+            self.table = (
+                np.memmap(path, dtype="<u4", mode="r", shape=(rows, self.length))
+                if rows else np.zeros((0, self.length), dtype=np.uint32)
+            )
+        except FileNotFoundError:           # pruned since the metadata was read
+            raise KeyError(f"Unknown density index id: {index_id}")
+        touch_density_index(directory, index_id)
+
+    def touch(self) -> None:
+        """Record a use of the index (see prune_density_indexes)."""
+        touch_density_index(self.directory, self.id)
+
+    def record(self, record=None) -> int:
+        """Index of a record given by position or name (default: the first)."""
+        records = self.meta["records"]
+        if record is None:
+            record = 0
+        if isinstance(record, int):
+            if not 0 <= record < len(records):
+                raise ValueError(f"No record {record}, the index has {len(records)}")
+            return record
+        for i, entry in enumerate(records):
+            if entry["name"] == record:
+                return i
+        raise ValueError(f"No record named {record!r}")
+
+    def _rows(self, entry: dict, positions: np.ndarray) -> np.ndarray:
+        """Row of each frame (columns) counting the hits before each position."""
+        frames = np.arange(self.length)
+        rows = (positions[:, None] - frames + self.length - 1) // self.length
+        return entry["firstRow"] + np.clip(rows, 0, entry["rows"] - 1)
+
+    def counts(self, record: int, starts, ends) -> np.ndarray:
+        """(n, L) hits of each frame in the regions [starts[i], ends[i])."""
+        entry = self.meta["records"][record]
+        starts, ends = np.asarray(starts, dtype=np.int64), np.asarray(ends, dtype=np.int64)
+        frames = np.arange(self.length)
+        upper = self.table[self._rows(entry, ends), frames].astype(np.int64)
+        return upper - self.table[self._rows(entry, starts), frames]
+
+    def words(self, record: int, starts, ends) -> np.ndarray:
+        """(n, L) complete words of each frame starting in the regions."""
+        last = max(0, self.meta["records"][record]["letters"] - self.length + 1)
+        frames = np.arange(self.length)
+        starts = np.clip(np.asarray(starts, dtype=np.int64), 0, last)[:, None]
+        ends = np.clip(np.asarray(ends, dtype=np.int64), 0, last)[:, None]
+        return np.maximum(0, (ends - frames + self.length - 1) // self.length
+                          - (starts - frames + self.length - 1) // self.length)
+
+    def profile(self, record=None, window: int = None, start: int = 0, end: int = None,
+                points: int = DENSITY_POINTS) -> dict:
+        """
+        Hits and density (hits per word start) of every frame in windows of
+        *window* letters over [start, end) of a record, for at most *points*
+        evenly spaced window starts, plus the totals of the whole region.
+        """
+        record = self.record(record)
+        letters = self.meta["records"][record]["letters"]
+        end = letters if end is None else min(int(end), letters)
+        start = max(0, int(start))
+        if start > end:
+            raise ValueError("start must not be after end")
+        if not 1 <= points <= DENSITY_MAX_POINTS:
+            raise ValueError(f"points must be between 1 and {DENSITY_MAX_POINTS}")
+        window = min(int(window), end - start) if window is not None else end - start
+        if window < 0 or (window == 0 and end > start):
+            raise ValueError("window must be at least one letter")
+        last = end - window
+        positions = np.unique(np.linspace(start, last, min(points, last - start + 1)).astype(np.int64))
+        counts = self.counts(record, positions, positions + window)
+        words = self.words(record, positions, positions + window)
+        density = np.divide(counts, words, out=np.zeros(counts.shape), where=words > 0)
+        totals = self.counts(record, [start], [end])
+        frames = call_frames(counts)
+        region_frame = int(call_frames(totals)[0])
+        return {
+            "indexId": self.id,
+            "record": self.meta["records"][record]["name"],
+            "start": start,
+            "end": end,
+            "window": window,
+            "positions": positions.tolist(),
+            "counts": counts.T.tolist(),
+            "density": np.round(density.T, 6).tolist(),
+            "frames": [int(f) if f >= 0 else None for f in frames],
+            "totals": totals[0].tolist(),
+            "frame": region_frame if region_frame >= 0 else None,
+        }
@@ -1,146 +1,193 @@
 """
 Utility functions for graph operations.
 """
-from collections import defaultdict
-from .codon_utils import alph1, alph2, alph3
-from .processing_utils import (
-    last_parse, get_component_graph, get_full_representing_graph,
-    process_codons_1_rest, process_codons_2_2, process_codons_rest_1
-)
+import hashlib
+import json
+import time
+from collections import defaultdict, deque
+from functools import cached_property
+
+import numpy as np
+
+from .codon_utils import parseinput, alpha, alph1, alph2, alph3
+from .processing_utils import build_graph, breakdown_positions
 
 def all_cycles(edge_list):
-    """Find all cycles in a graph."""
-    graph = defaultdict(list)
-    for u, v in edge_list:
-        graph[u].append(v)
+    """
+    Find all cycles of at least three nodes in a graph.
 
+    Kept for compatibility: every rotation of every cycle is returned as a
+    closed tuple (first node repeated at the end).  Use CycleEnumerator to
+    get each cycle once, lazily and with limits.
+    """
     cycles = set()
-    stack = []
-
-    def dfs(node, start):
-        stack.append(node)
-        for nxt in graph.get(node, []):
-            if nxt == start and len(stack) > 1:
-                cycles.add(tuple(stack + [start]))
-            elif nxt not in stack:
-                dfs(nxt, start)
-        stack.pop()
-
-    for v in list(graph):
-        dfs(v, v)
-    
-    # Filter the tuples that are exactly 3, because A -> B -> A or B -> A -> B. Which are essentially not a real circle
-    cycles = {c for c in cycles if len(c) > 3}
-
+    for cycle in CycleEnumerator(edge_list, min_length=3):
+        for i in range(len(cycle)):
+            rotation = cycle[i:] + cycle[:i]
+            cycles.add(tuple(rotation + [rotation[0]]))
     return cycles
 
+class CycleEnumerator:
+    """
+    Lazily enumerate the elementary cycles of an edge list or CompiledGraph.
+
+    Iterating yields every cycle exactly once as a list of nodes in canonical
+    rotation (starting at its lexicographically smallest node).  Without a
+    *max_length* this is Johnson's algorithm run per strongly connected
+    component, with time polynomial per cycle; with one it is a depth-bounded
+    search.  Iteration stops early after *max_count* cycles, after
+    *time_limit* seconds or once the *cancelled* callable returns true;
+    ``stopped`` then names the limit that was hit.
+    """
+
+    def __init__(self, edge_list, max_length=None, max_count=None,
+                 time_limit=None, min_length=1, cancelled=None):
+        compiled = compile_graph(edge_list)
+        self.names = compiled.names
+        self.graph = [set(successors) for successors in compiled.adjacency]
+        self.max_length = max_length
+        self.max_count = max_count
+        self.time_limit = time_limit
+        self.min_length = min_length
+        self.cancelled = cancelled
+        self.count = 0
+        self.stopped = None
+
+    def __iter__(self):
+        deadline = None if self.time_limit is None else time.monotonic() + self.time_limit
+        for steps, cycle in enumerate(self._cycles()):
+            if steps % 256 == 0:
+                if deadline is not None and time.monotonic() > deadline:
+                    self.stopped = "time_limit"
+                    return
+                if self.cancelled is not None and self.cancelled():
+                    self.stopped = "cancelled"
+                    return
+            if cycle is None:            # heartbeat, lets the deadline fire
+                continue
+            if len(cycle) < self.min_length:
+                continue
+            if self.max_count is not None and self.count >= self.max_count:
+                self.stopped = "max_count"
+                return
+            self.count += 1
+            yield [self.names[v] for v in cycle]
+
+    def _component(self, start):
+        """Nodes >= start in the strongly connected component of *start*."""
+        def reach(successors):
+            seen = {start}
+            stack = [start]
+            while stack:
+                for w in successors(stack.pop()):
+                    if w >= start and w not in seen:
+                        seen.add(w)
+                        stack.append(w)
+            return seen
+        predecessors = defaultdict(set)
+        for u in range(start, len(self.graph)):
+            for w in self.graph[u]:
+                predecessors[w].add(u)
+        return reach(self.graph.__getitem__) & reach(predecessors.__getitem__)
+
+    def _cycles(self):
+        """Cycles as index lists, interleaved with None heartbeats."""
+        for start in range(len(self.graph)):
+            component = self._component(start)
+            if start in self.graph[start]:
+                yield [start]
+            if len(component) < 2:
+                continue
+            successors = {v: [w for w in self.graph[v] if w in component and w != v]
+                          for v in component}
+            if self.max_length is None:
+                yield from self._johnson(start, successors)
+            else:
+                yield from self._bounded(start, successors)
+
+    @staticmethod
+    def _johnson(start, successors):
+        """Johnson's circuit search from *start* inside its component."""
+        path = [start]
+        blocked = {start}
+        closed = set()
+        B = defaultdict(set)
+        stack = [(start, list(successors[start]))]
+        while stack:
+            yield None
+            node, neighbours = stack[-1]
+            if neighbours:
+                nxt = neighbours.pop()
+                if nxt == start:
+                    yield path[:]
+                    closed.update(path)
+                elif nxt not in blocked:
+                    path.append(nxt)
+                    stack.append((nxt, list(successors[nxt])))
+                    closed.discard(nxt)
+                    blocked.add(nxt)
+                    continue
+            if not neighbours:
+                if node in closed:
+                    unblock = {node}
+                    while unblock:
+                        v = unblock.pop()
+                        if v in blocked:
+                            blocked.remove(v)
+                            unblock.update(B[v])
+                            B[v].clear()
+                else:
+                    for w in successors[node]:
+                        B[w].add(node)
+                stack.pop()
+                path.pop()
+
+    def _bounded(self, start, successors):
+        """Depth-bounded cycle search from *start* inside its component."""
+        path = [start]
+        on_path = {start}
+        stack = [iter(successors[start])]
+        while stack:
+            yield None
+            for nxt in stack[-1]:
+                if nxt == start:
+                    yield path[:]
+                elif nxt not in on_path and len(path) < self.max_length:
+                    path.append(nxt)
+                    on_path.add(nxt)
+                    stack.append(iter(successors[nxt]))
+                    break
+            else:
+                stack.pop()
+                on_path.discard(path.pop())
+
 def get_graph(number_of_codons, codons):
     """Get the original codon graph using processing_utils."""
-    parsed_input = last_parse(number_of_codons, codons)
-
-    nodes = list(
-        filter(
-            lambda y: len(y) > 0,
-            {x[0] for x in parsed_input["rows"]} | {x[1] for x in parsed_input["rows"]},
-        )
-    )
-
-    edges = list(
-        filter(lambda x: len(x[0]) > 0 and len(x[1]) > 0, parsed_input["rows"])
-    )
-    
-    graph = {"nodes": nodes, "edges": edges}
-    return remove_isolated_nodes(graph)
+    return get_code_graph(number_of_codons, parseinput(number_of_codons, codons))
+
+def get_code_graph(number_of_codons, code):
+    """Get the codon graph of an already parsed list of codons."""
+    return build_graph(code, breakdown_positions(number_of_codons))
 
 def get_component_graph_direct(codons, component_index):
     """Get a specific component graph directly using processing_utils."""
-    result = get_component_graph(codons, component_index)
-    
-    nodes = list(
-        filter(
-            lambda y: len(y) > 0,
-            {x[0] for x in result["rows"]} | {x[1] for x in result["rows"]},
-        )
-    )
-
-    edges = list(
-        filter(lambda x: len(x[0]) > 0 and len(x[1]) > 0, result["rows"])
-    )
-    
-    graph = {"nodes": nodes, "edges": edges}
-    return remove_isolated_nodes(graph)
+    return build_graph(codons, (component_index,))
 
 def get_full_graph_direct(codons):
     """Get the full representing graph directly using processing_utils."""
-    result = get_full_representing_graph(codons)
-    
-    nodes = list(
-        filter(
-            lambda y: len(y) > 0,
-            {x[0] for x in result["rows"]} | {x[1] for x in result["rows"]},
-        )
-    )
-
-    edges = list(
-        filter(lambda x: len(x[0]) > 0 and len(x[1]) > 0, result["rows"])
-    )
-    
-    graph = {"nodes": nodes, "edges": edges}
-    return remove_isolated_nodes(graph)
+    return build_graph(codons, range(1, len(codons[0])) if codons else (), by_codon=True)
 
 def get_1_rest_graph(codons):
     """Get 1-rest breakdown graph using processing_utils."""
-    result = process_codons_1_rest(codons)
-    
-    nodes = list(
-        filter(
-            lambda y: len(y) > 0,
-            {x[0] for x in result["rows"]} | {x[1] for x in result["rows"]},
-        )
-    )
-
-    edges = list(
-        filter(lambda x: len(x[0]) > 0 and len(x[1]) > 0, result["rows"])
-    )
-    
-    graph = {"nodes": nodes, "edges": edges}
-    return remove_isolated_nodes(graph)
+    return build_graph(codons, (1,))
 
 def get_2_2_graph(codons):
     """Get 2-2 breakdown graph using processing_utils."""
-    result = process_codons_2_2(codons)
-    
-    nodes = list(
-        filter(
-            lambda y: len(y) > 0,
-            {x[0] for x in result["rows"]} | {x[1] for x in result["rows"]},
-        )
-    )
-
-    edges = list(
-        filter(lambda x: len(x[0]) > 0 and len(x[1]) > 0, result["rows"])
-    )
-    
-    graph = {"nodes": nodes, "edges": edges}
-    return remove_isolated_nodes(graph)
+    return build_graph(codons, (len(codons[0]) // 2,) if codons else ())
 
 def get_rest_1_graph(codons):
     """Get rest-1 breakdown graph using processing_utils."""
-    result = process_codons_rest_1(codons)
-    
-    nodes = list(
-        filter(
-            lambda y: len(y) > 0,
-            {x[0] for x in result["rows"]} | {x[1] for x in result["rows"]},
-        )
-    )
-
-    edges = list(
-        filter(lambda x: len(x[0]) > 0 and len(x[1]) > 0, result["rows"])
-    )
-    
-    graph = {"nodes": nodes, "edges": edges}
-    return remove_isolated_nodes(graph)
+    return build_graph(codons, (len(codons[0]) - 1,) if codons else ())
 
 def get_graph_alpha_one(number_of_codons, codons):
     """Get the alpha-one transformed codon graph."""
@@ -157,6 +204,56 @@ def get_graph_alpha_three(number_of_codons, codons):
     alpha_three_codons = alph3(codons,number_of_codons)
     return get_graph(number_of_codons, alpha_three_codons)
 
+def get_graph_alpha(number_of_codons, codons, k):
+    """Get the α_k transformed codon graph for any 1 ≤ k < codon length."""
+    return get_graph(number_of_codons, alpha(codons, k, number_of_codons))
+
+def variant_label(k):
+    """Short label of variant k in merged graphs: "O" for the original, else k."""
+    return "O" if k == 0 else str(k)
+
+def rotate_words(words, k, codon_length):
+    """α_k of already parsed words, with the tail rules of ``codon_utils.alpha``."""
+    rotated = []
+    for w in words:
+        if len(w) == codon_length or len(w) > k:
+            w = w[-k:] + w[:-k]
+        rotated.append(w)
+    return rotated
+
+def get_merged_graph(number_of_codons, codons):
+    """
+    The original and every α_k graph merged into one, from a single parse.
+
+    Returns {"variants": ["O", "1", ...], "nodes", "edges", "nodeMasks",
+    "edgeMasks"}: nodes are interned once across all variants and bit k of a
+    node's or edge's mask is set when it belongs to variant k (bit 0 is the
+    original), so membership costs one integer instead of a label string.
+    """
+    words = parseinput(number_of_codons, codons)
+    variants = [words] + [
+        rotate_words(words, k, number_of_codons) for k in range(1, number_of_codons)
+    ]
+    positions = breakdown_positions(number_of_codons)
+    ids = dict()
+    edge_masks = dict()
+    for k, variant in enumerate(variants):
+        for source, target in build_graph(variant, positions)["edges"]:
+            edge = (ids.setdefault(source, len(ids)), ids.setdefault(target, len(ids)))
+            edge_masks[edge] = edge_masks.get(edge, 0) | 1 << k
+    names = list(ids)
+    node_masks = [0] * len(names)
+    for (u, v), mask in edge_masks.items():
+        node_masks[u] |= mask
+        node_masks[v] |= mask
+    return {
+        "variants": [variant_label(k) for k in range(len(variants))],
+        "nodes": names,
+        "edges": [[names[u], names[v]] for u, v in edge_masks],
+        "nodeMasks": node_masks,
+        "edgeMasks": list(edge_masks.values()),
+    }
+
 def remove_isolated_nodes(graph_data):
     """Remove nodes that have no connections (isolated nodes) from the graph."""
     if not graph_data or "nodes" not in graph_data or "edges" not in graph_data:
@@ -180,34 +277,133 @@ def remove_isolated_nodes(graph_data):
         "edges": edges
     }
 
-def longest_path(number, edge_list):
-    """Return one longest simple path in a directed graph using DFS with memoization."""
-    if not edge_list:
-        return []
-    
-    # Create a set of nodes from the edge list
-    nodes = set()
-    for edge in edge_list:
-        # Handle both object format {source: ..., target: ...} and array format [source, target]
-        if isinstance(edge, dict):
-            source = edge.get('source')
-            target = edge.get('target')
-        else:
-            source = edge[0]
-            target = edge[1]
-        
-        if source and target:
-            nodes.add(source)
-            nodes.add(target)
-    
-    if not nodes:
-        return []
-    
-    # Build adjacency list
-    graph = {}
-    for node in nodes:
-        graph[node] = []
-    
+class CompiledGraph:
+    """
+    Immutable directed graph compiled once for repeated queries.
+
+    Node names are interned to ids in sorted order, and the adjacency is kept
+    in CSR form: the successors of node ``v`` are
+    ``targets[offsets[v]:offsets[v + 1]]``.  ``graph_id`` is a content hash of
+    the node and edge sets, so equal graphs always get the same id.
+    """
+
+    def __init__(self, names, offsets, targets):
+        self.names = names
+        self.index = {name: i for i, name in enumerate(names)}
+        self.offsets = offsets
+        self.targets = targets
+
+    @classmethod
+    def from_edges(cls, edge_list, nodes=None):
+        """Compile an edge list (object or array format) plus optional extra nodes."""
+        pairs = sorted(set(edge_pairs(edge_list)))
+        names = sorted({node for pair in pairs for node in pair} | set(nodes or ()))
+        index = {name: i for i, name in enumerate(names)}
+        sources = np.fromiter((index[u] for u, _ in pairs), dtype=np.int32, count=len(pairs))
+        targets = np.fromiter((index[v] for _, v in pairs), dtype=np.int32, count=len(pairs))
+        offsets = np.zeros(len(names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=len(names)), out=offsets[1:])
+        return cls(names, offsets, targets)
+
+    @cached_property
+    def graph_id(self) -> str:
+        digest = hashlib.sha256()
+        digest.update(json.dumps(self.names, separators=(",", ":")).encode("utf-8"))
+        digest.update(self.offsets.tobytes())
+        digest.update(self.targets.tobytes())
+        return digest.hexdigest()[:32]
+
+    @property
+    def node_count(self) -> int:
+        return len(self.names)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    @cached_property
+    def adjacency(self) -> list:
+        """Successor id lists, for pure-Python traversals."""
+        offsets = self.offsets.tolist()
+        targets = self.targets.tolist()
+        return [targets[offsets[v]:offsets[v + 1]] for v in range(len(self.names))]
+
+    def edges(self) -> list:
+        """[source, target] name pairs."""
+        return [[self.names[u], self.names[v]]
+                for u, successors in enumerate(self.adjacency) for v in successors]
+
+    def bfs(self, source: int) -> tuple[list, list]:
+        """
+        Hop distances and BFS predecessors of every node id from *source*
+        (-1 where unreachable; the source is its own predecessor).
+        """
+        adjacency = self.adjacency
+        distance = [-1] * len(self.names)
+        predecessor = [-1] * len(self.names)
+        distance[source] = 0
+        predecessor[source] = source
+        queue = deque([source])
+        while queue:
+            current_node = queue.popleft()
+            step = distance[current_node] + 1
+            for neighbor in adjacency[current_node]:
+                if distance[neighbor] < 0:
+                    distance[neighbor] = step
+                    predecessor[neighbor] = current_node
+                    queue.append(neighbor)
+        return distance, predecessor
+
+# Largest graph whose all-pairs table is precomputed (two n*n int16 arrays)
+SHORTEST_PATH_TABLE_MAX_NODES = 2048
+# Total size of the path tables GraphService keeps (one is up to 16 MB)
+SHORTEST_PATH_TABLES_MAX_BYTES = 256 * 1024 * 1024
+
+class ShortestPathTable:
+    """
+    All-pairs shortest paths of a CompiledGraph from one BFS per node.
+
+    ``distance[s, v]`` is the hop count from ``s`` to ``v`` (-1 if
+    unreachable) and ``predecessor[s, v]`` the node before ``v`` on one
+    shortest path from ``s``, so a path is rebuilt in O(path length).
+    """
+
+    def __init__(self, graph: CompiledGraph):
+        n = graph.node_count
+        self.graph = graph
+        self.distance = np.empty((n, n), dtype=np.int16)
+        self.predecessor = np.empty((n, n), dtype=np.int16)
+        for source in range(n):
+            self.distance[source], self.predecessor[source] = graph.bfs(source)
+
+    @classmethod
+    def build(cls, graph: CompiledGraph):
+        """The table of *graph*, or None above SHORTEST_PATH_TABLE_MAX_NODES."""
+        if graph.node_count > SHORTEST_PATH_TABLE_MAX_NODES:
+            return None
+        return cls(graph)
+
+    @property
+    def nbytes(self) -> int:
+        return self.distance.nbytes + self.predecessor.nbytes
+
+    def path(self, source: int, target: int) -> list:
+        """Node ids of one shortest path, [] if *target* is unreachable."""
+        return _walk_back(self.predecessor[source], source, target)
+
+def compile_graph(graph, nodes=None) -> CompiledGraph:
+    """Return *graph* if it is already compiled, else compile it as an edge list."""
+    if isinstance(graph, CompiledGraph):
+        return graph
+    return CompiledGraph.from_edges(graph, nodes)
+
+# Default search budget for longest paths in graphs with cycles
+LONGEST_PATH_NODE_BUDGET = 200_000
+LONGEST_PATH_TIME_LIMIT = 5.0
+
+def edge_pairs(edge_list):
+    """(source, target) pairs of an edge list, skipping incomplete edges."""
+    pairs = []
     for edge in edge_list:
         # Handle both object format {source: ..., target: ...} and array format [source, target]
         if isinstance(edge, dict):
@@ -218,98 +414,188 @@ def longest_path(number, edge_list):
             target = edge[1]
         
         if source and target:
-            graph[source].append(target)
-    
-    longest_path_found = []
-    max_length = 0
-    
-    def dfs(node, path, visited):
-        nonlocal longest_path_found, max_length
-        
-        if len(path) > max_length:
-            max_length = len(path)
-            longest_path_found = path.copy()
-        
-        # Explore neighbors
-        for neighbor in graph.get(node, []):
-            if neighbor not in visited:
-                visited.add(neighbor)
-                path.append(neighbor)
-                dfs(neighbor, path, visited)
-                path.pop()
-                visited.remove(neighbor)
-    
-    # Try starting from each node
-    for start_node in nodes:
-        visited = {start_node}
-        path = [start_node]
-        dfs(start_node, path, visited)
-    
-    return longest_path_found
+            pairs.append((source, target))
+    return pairs
 
-def shortest_path(edge_list, source, target, nodes=None):
-    """Find the shortest path between two nodes using BFS."""
-    if not edge_list:
-        return []
-    
-    # Create a set of nodes from the edge list if not provided
-    if nodes is None:
-        nodes = set()
-        for edge in edge_list:
-            # Handle both object format {source: ..., target: ...} and array format [source, target]
-            if isinstance(edge, dict):
-                edge_source = edge.get('source')
-                edge_target = edge.get('target')
+def longest_path(number, edge_list):
+    """Return one longest simple path in a directed graph."""
+    return find_longest_path(edge_list)["path"]
+
+def find_longest_path(edge_list, node_budget=LONGEST_PATH_NODE_BUDGET,
+                      time_limit=LONGEST_PATH_TIME_LIMIT, cancelled=None):
+    """
+    Return {"path", "engine", "optimal"} for one longest simple path of an
+    edge list or CompiledGraph.
+
+    Acyclic graphs (the representing graph of every circular code) are solved
+    exactly in O(V+E) by dynamic programming over a topological order
+    (engine "dag").  Graphs with cycles use a branch-and-bound search that
+    prunes on the number of still reachable nodes (engine "branch-and-bound");
+    once it has expanded *node_budget* search nodes, run for *time_limit*
+    seconds or the *cancelled* callable returns true it returns the best path
+    so far with optimal=False.
+    """
+    compiled = compile_graph(edge_list)
+    if not compiled.edge_count:
+        return {"path": [], "engine": "dag", "optimal": True}
+    names = compiled.names
+    graph = compiled.adjacency
+    
+    order = topological_order(graph)
+    if order is not None:
+        path = _dag_longest_path(graph, order)
+        return {"path": [names[v] for v in path], "engine": "dag", "optimal": True}
+    
+    path, optimal = _bounded_longest_path(graph, node_budget, time_limit, cancelled)
+    return {
+        "path": [names[v] for v in path],
+        "engine": "branch-and-bound",
+        "optimal": optimal,
+    }
+
+def topological_order(graph):
+    """Kahn's algorithm on an adjacency list of indices; None if there is a cycle."""
+    indegree = [0] * len(graph)
+    for successors in graph:
+        for v in successors:
+            indegree[v] += 1
+    order = [v for v, degree in enumerate(indegree) if degree == 0]
+    for u in order:                      # the list grows while we walk it
+        for v in graph[u]:
+            indegree[v] -= 1
+            if indegree[v] == 0:
+                order.append(v)
+    return order if len(order) == len(graph) else None
+
+def _dag_longest_path(graph, order):
+    """Longest path (in nodes) of a DAG given a topological order."""
+    length = [1] * len(graph)
+    parent = [-1] * len(graph)
+    for u in order:
+        for v in graph[u]:
+            if length[u] + 1 > length[v]:
+                length[v] = length[u] + 1
+                parent[v] = u
+    
+    node = max(range(len(graph)), key=length.__getitem__)
+    path = []
+    while node != -1:
+        path.append(node)
+        node = parent[node]
+    path.reverse()
+    return path
+
+def _bounded_longest_path(graph, node_budget, time_limit, cancelled=None):
+    """
+    Branch-and-bound longest simple path; returns (path, proven_optimal).
+
+    Visited sets and successor sets are int bitmasks.  A branch is cut when
+    its length plus every node still reachable from its end cannot beat the
+    best path found so far.
+    """
+    n = len(graph)
+    successors = [0] * n
+    for u, targets in enumerate(graph):
+        for v in targets:
+            successors[u] |= 1 << v
+    
+    def reachable(node, visited):
+        """Number of unvisited nodes reachable from *node*."""
+        seen = 0
+        frontier = successors[node] & ~visited
+        while frontier:
+            seen |= frontier
+            expanded = 0
+            while frontier:
+                low = frontier & -frontier
+                expanded |= successors[low.bit_length() - 1]
+                frontier ^= low
+            frontier = expanded & ~visited & ~seen
+        return bin(seen).count("1")
+    
+    deadline = time.monotonic() + time_limit
+    expanded = 0
+    best = []
+    # Nodes with many successors tend to start long paths
+    for start in sorted(range(n), key=lambda v: -len(graph[v])):
+        if 1 + reachable(start, 1 << start) <= len(best):
+            continue
+        path = [start]
+        visited = 1 << start
+        stack = [iter(graph[start])]
+        if len(path) > len(best):
+            best = path[:]
+        while stack:
+            if len(best) == n:           # Hamiltonian: cannot be beaten
+                return best, True
+            for v in stack[-1]:
+                if (visited >> v) & 1:
+                    continue
+                expanded += 1
+                if expanded > node_budget or expanded % 1024 == 0 and (
+                    time.monotonic() > deadline or cancelled is not None and cancelled()
+                ):
+                    return best, False
+                if len(path) + 1 + reachable(v, visited | (1 << v)) <= len(best):
+                    continue
+                path.append(v)
+                visited |= 1 << v
+                stack.append(iter(graph[v]))
+                if len(path) > len(best):
+                    best = path[:]
+                break
             else:
-                edge_source = edge[0]
-                edge_target = edge[1]
-            
-            if edge_source and edge_target:
-                nodes.add(edge_source)
-                nodes.add(edge_target)
-    
-    # Check if source and target exist in the graph
-    if source not in nodes or target not in nodes:
-        return []
-    
-    # If source and target are the same, return single node path
-    if source == target:
-        return [source]
-    
-    # Build adjacency list
-    graph = {}
-    for node in nodes:
-        graph[node] = []
-    
-    for edge in edge_list:
-        # Handle both object format {source: ..., target: ...} and array format [source, target]
-        if isinstance(edge, dict):
-            edge_source = edge.get('source')
-            edge_target = edge.get('target')
+                stack.pop()
+                visited &= ~(1 << path.pop())
+    return best, True
+
+def shortest_path(edge_list, source, target, nodes=None):
+    """
+    Find the shortest path between two nodes of an edge list or CompiledGraph
+    using BFS.  When *nodes* is given, both endpoints must be among them.
+    """
+    return shortest_paths(edge_list, [(source, target)], nodes)[0]
+
+def shortest_paths(edge_list, pairs, nodes=None, table=None):
+    """
+    Shortest path (list of node names, [] if none) for every (source, target)
+    pair of an edge list or CompiledGraph.
+
+    Given the ShortestPathTable of a CompiledGraph as *table*, paths are read
+    from it; otherwise one BFS is run per distinct source.
+    """
+    pairs = [tuple(pair) for pair in pairs]
+    if not isinstance(edge_list, CompiledGraph) and not edge_list:
+        return [[] for _ in pairs]
+    
+    graph = compile_graph(edge_list, nodes)
+    if table is not None and table.graph.graph_id != graph.graph_id:
+        table = None
+    rows = {}
+    paths = []
+    for source, target in pairs:
+        # Check if source and target exist in the graph
+        if (nodes is not None and (source not in nodes or target not in nodes)) \
+                or source not in graph.index or target not in graph.index:
+            paths.append([])
+            continue
+        start = graph.index[source]
+        goal = graph.index[target]
+        if table is not None:
+            path = table.path(start, goal)
         else:
-            edge_source = edge[0]
-            edge_target = edge[1]
-        
-        if edge_source and edge_target:
-            graph[edge_source].append(edge_target)
-    
-    # BFS to find shortest path
-    from collections import deque
-    
-    queue = deque([(source, [source])])
-    visited = {source}
-    
-    while queue:
-        current_node, path = queue.popleft()
-        
-        # Check all neighbors
-        for neighbor in graph.get(current_node, []):
-            if neighbor == target:
-                return path + [neighbor]
-            
-            if neighbor not in visited:
-                visited.add(neighbor)
-                queue.append((neighbor, path + [neighbor]))
-    
-    # No path found
-    return []
+            if start not in rows:
+                rows[start] = graph.bfs(start)[1]
+            path = _walk_back(rows[start], start, goal)
+        paths.append([graph.names[v] for v in path])
+    return paths
+
+def _walk_back(predecessor, source, target):
+    """Follow BFS predecessors from *target* back to *source*."""
+    if predecessor[target] < 0:
+        return []
+    path = [target]
+    while target != source:
+        target = int(predecessor[target])
+        path.append(target)
+    return path[::-1]
@@ -0,0 +1,129 @@
+"""
+Utility functions for the packed integer codon representation.
+
+Every nucleotide is stored in 2 bits (A=0, C=1, G=2, T=3), so a word of
+length L is an int below 4**L whose first letter sits in the most significant
+bits.  A code over a fixed word length is a membership bitmask with bit ``w``
+set for every packed word ``w`` (a 64-bit int for trinucleotides).
+
+Vertices of the representing graph (proper prefixes and suffixes) are packed
+the same way plus a leading sentinel bit, so words of different lengths never
+share an id: "A" is 0b100, "AA" is 0b10000.
+
+Strings only appear at the API boundary; use ``encode_*``/``decode_*`` there.
+"""
+from functools import lru_cache
+
+NUCLEOTIDES = "ACGT"
+_ENCODE = {base: index for index, base in enumerate(NUCLEOTIDES)}
+
+#####################
+# conversion        #
+#####################
+
+def is_packable(words) -> bool:
+    """Check if every word consists of upper-case A/C/G/T letters only."""
+    return all(word and not word.strip(NUCLEOTIDES) for word in words)
+
+def encode_word(word: str) -> int:
+    """Pack a word into an int, two bits per nucleotide."""
+    value = 0
+    try:
+        for base in word:
+            value = (value << 2) | _ENCODE[base]
+    except KeyError:
+        raise ValueError(f"Invalid nucleotide: {base}")
+    return value
+
+@lru_cache(maxsize=None)
+def decode_word(value: int, length: int) -> str:
+    """Unpack an int produced by ``encode_word`` back into its string."""
+    letters = []
+    for _ in range(length):
+        letters.append(NUCLEOTIDES[value & 3])
+        value >>= 2
+    return "".join(reversed(letters))
+
+def encode_code(words) -> list[int]:
+    """Pack a list of words, preserving order."""
+    return [encode_word(word) for word in words]
+
+def decode_code(values, length: int) -> list[str]:
+    """Unpack a list of packed words of the given length."""
+    return [decode_word(value, length) for value in values]
+
+#####################
+# codes as bitmasks #
+#####################
+
+def code_mask(values) -> int:
+    """Membership bitmask of a packed code."""
+    mask = 0
+    for value in values:
+        mask |= 1 << value
+    return mask
+
+def mask_words(mask: int) -> list[int]:
+    """Packed words contained in a membership bitmask, ascending."""
+    words = []
+    while mask:
+        low = mask & -mask
+        words.append(low.bit_length() - 1)
+        mask ^= low
+    return words
+
+def in_mask(mask: int, value: int) -> bool:
+    """Check if a packed word is a member of a code bitmask."""
+    return (mask >> value) & 1 == 1
+
+#####################
+# word transforms   #
+#####################
+
+def rotate_word(value: int, k: int, length: int) -> int:
+    """Right-rotate a packed word by *k* letters (``w[-k:] + w[:-k]``)."""
+    k %= length
+    if not k:
+        return value
+    shift = 2 * k
+    return (value >> shift) | ((value & ((1 << shift) - 1)) << (2 * (length - k)))
+
+def complement_word(value: int, length: int) -> int:
+    """Watson–Crick complement of a packed word (A<->T, C<->G)."""
+    return value ^ ((1 << (2 * length)) - 1)
+
+def reverse_word(value: int, length: int) -> int:
+    """Reverse the letters of a packed word."""
+    result = 0
+    for _ in range(length):
+        result = (result << 2) | (value & 3)
+        value >>= 2
+    return result
+
+def revcomp_word(value: int, length: int) -> int:
+    """Reverse complement of a packed word."""
+    return reverse_word(complement_word(value, length), length)
+
+#####################
+# graph vertices    #
+#####################
+
+def node_id(value: int, length: int) -> int:
+    """Vertex id of a packed word: the word plus a leading sentinel bit."""
+    return value | (1 << (2 * length))
+
+def node_length(node: int) -> int:
+    """Number of letters of the word behind a vertex id."""
+    return (node.bit_length() - 1) // 2
+
+@lru_cache(maxsize=None)
+def node_label(node: int) -> str:
+    """String label of a vertex id."""
+    length = node_length(node)
+    return decode_word(node ^ (1 << (2 * length)), length)
+
+def split_word(value: int, i: int, length: int) -> tuple[int, int]:
+    """Vertex ids of ``w[:i]`` and ``w[i:]`` for a packed word *w*."""
+    tail = 2 * (length - i)
+    return (node_id(value >> tail, i),
+            node_id(value & ((1 << tail) - 1), length - i))
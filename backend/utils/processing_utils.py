@@ -2,6 +2,67 @@
 Utility functions for processing operations.
 """
 from .codon_utils import parseinput
+from .packed_utils import is_packable, encode_code, split_word, node_label
+
+def split_rows(codons: list, positions) -> list:
+    """
+    Split every codon at each of the given positions into [prefix, suffix] rows.
+
+    Codes of equal-length A/C/G/T words are split on their packed form, so only
+    the distinct vertex labels are ever materialized as strings.
+    """
+    codon_length = len(codons[0])
+    if is_packable(codons) and all(len(codon) == codon_length for codon in codons):
+        rows = []
+        for value in encode_code(codons):
+            for i in positions:
+                source, target = split_word(value, i, codon_length)
+                rows.append([node_label(source), node_label(target)])
+        return rows
+    return [[codon[:i], codon[i:]] for codon in codons for i in positions]
+
+def build_graph(codons: list, positions, by_codon: bool = False) -> dict:
+    """
+    {"nodes", "edges"} of the breakdown of *codons* at the given split
+    positions, built in one traversal.
+
+    Edges come out deduplicated in position-major order (the order
+    ``last_parse`` merges its breakdowns in), or codon-major with *by_codon*,
+    without empty halves.  Every node label is created once and nodes are
+    listed in first-seen order, so none is isolated.  Equal-length A/C/G/T
+    codes are split on packed words and deduplicated on integer node ids;
+    other codes are split as strings.
+    """
+    if not codons:
+        return {"nodes": [], "edges": []}
+    codon_length = len(codons[0])
+    positions = [i for i in dict.fromkeys(positions) if 1 <= i < codon_length]
+    packed = is_packable(codons) and all(len(codon) == codon_length for codon in codons)
+    words = list(dict.fromkeys(encode_code(codons) if packed else codons))
+    if by_codon:
+        splits = ((word, i) for word in words for i in positions)
+    else:
+        splits = ((word, i) for i in positions for word in words)
+    labels = dict()         # node key -> label, in first-seen order
+    seen = set()
+    edges = []
+    for word, i in splits:
+        if packed:
+            pair = split_word(word, i, codon_length)
+        else:
+            pair = (word[:i], word[i:])
+            if not pair[0] or not pair[1]:
+                continue
+        if pair in seen:
+            continue
+        seen.add(pair)
+        source, target = pair
+        if source not in labels:
+            labels[source] = node_label(source) if packed else source
+        if target not in labels:
+            labels[target] = node_label(target) if packed else target
+        edges.append((labels[source], labels[target]))
+    return {"nodes": list(labels.values()), "edges": edges}
 
 def get_component_graph(codons: list, component_index: int) -> dict:
     """
@@ -26,13 +87,7 @@ def get_component_graph(codons: list, component_index: int) -> dict:
         return {"rows": []}
     
     # Create edges by splitting each codon at the component position
-    edges = []
-    for codon in codons:
-        source = codon[:component_index]
-        target = codon[component_index:]
-        edges.append([source, target])
-    
-    return {"rows": edges}
+    return {"rows": split_rows(codons, (component_index,))}
 
 def get_full_representing_graph(codons: list) -> dict:
     """
@@ -51,14 +106,9 @@ def get_full_representing_graph(codons: list) -> dict:
         return {"rows": []}
     
     codon_length = len(codons[0])
-    all_edges = []
     
     # For each codon, create edges for all possible splits
-    for codon in codons:
-        for i in range(1, codon_length):
-            source = codon[:i]
-            target = codon[i:]
-            all_edges.append([source, target])
+    all_edges = split_rows(codons, range(1, codon_length))
     
     # Remove duplicates while preserving order
     seen = set()
@@ -143,20 +193,25 @@ def last_parse(number_of_codons, codons):
         return {"rows": []}
 
     parsed_input = parseinput(number_of_codons, codons)
-    result = {"rows": []}
+    return parse_code_rows(number_of_codons, parsed_input)
 
-    # Always process the 1-rest breakdown
-    codons_broke_down = process_codons_1_rest(parsed_input)
-    result = merge_rows(result, codons_broke_down)
+def breakdown_positions(codon_length: int) -> list:
+    """
+    Split positions of the representing-graph breakdowns in the order
+    ``last_parse`` applies them: 1-rest, rest-1, the middle (2-2) split and
+    then every remaining position, so all L-1 components are covered for
+    any tuple length L.
+    """
+    positions = [1, codon_length - 1, codon_length // 2, *range(2, codon_length - 1)]
+    return [i for i in dict.fromkeys(positions) if 1 <= i < codon_length]
 
-    # For 3 or 4 codons, add rest-1 breakdown
-    if number_of_codons >= 3:
-        codons_broke_down3 = process_codons_rest_1(parsed_input)
-        result = merge_rows(result, codons_broke_down3)
+def parse_code_rows(number_of_codons, parsed_input):
+    """Apply the ``last_parse`` breakdowns to an already parsed list of codons."""
+    result = {"rows": []}
+    if not parsed_input:
+        return result
 
-    # For any number of codons, add 2-2 breakdown
-    codons_broke_down2 = process_codons_2_2(parsed_input)
-    if codons_broke_down2:  # Only merge if we got a result
-        result = merge_rows(result, codons_broke_down2)
+    for position in breakdown_positions(number_of_codons):
+        result = merge_rows(result, get_component_graph(parsed_input, position))
 
     return result
@@ -3,9 +3,19 @@ import re
 """
 Utility functions for properties operations.
 """
-from collections import Counter
+from collections import Counter, deque
+from functools import cached_property
 from itertools import product
 
+import numpy as np
+
+from .packed_utils import NUCLEOTIDES, is_packable, encode_code, decode_code, split_word
+from .vector_utils import (
+    words_to_array, array_to_words, letter_codes, pack_array, rotate_batch,
+    rotate_packed_batch
+)
+from .bitmatrix_utils import BITMATRIX_MAX_LENGTH, circular_batch_packed
+
 #####################
 # helper utilities  #
 #####################
@@ -76,19 +86,28 @@ def collections_disjoint(set1, set2):
     """Check if two collections have no elements in common (like Collections.disjoint)."""
     return len(set(set1) & set(set2)) == 0
 
-def is_comma_free(strings, length=None):
+COMMA_FREE_ENGINES = ("fast", "gcat")
+
+def is_comma_free(strings, length=None, engine="fast"):
     """
     Checks if a sequence of strings is comma-free according to the GCAT implementation.
     
-    This is a direct translation of the Java CommaFree.test() method.
+    Two engines give the same answers:
+    - "fast": hashed lookup of every interior factor of w_i·w_j, O(n · L).
+    - "gcat": direct translation of the Java CommaFree.test() method, kept as
+      the reference implementation.
     
     Parameters:
     - strings: List of strings to check.
     - length: The length of each string (optional, will be inferred if not provided).
+    - engine: One of COMMA_FREE_ENGINES.
     
     Returns:
     - True if the sequence is comma-free, False otherwise.
     """
+    if engine not in COMMA_FREE_ENGINES:
+        raise ValueError(f"Unknown comma-free engine: {engine}")
+
     if not strings:
         return True  # Empty set is comma-free
     
@@ -103,7 +122,40 @@ def is_comma_free(strings, length=None):
     # Check for duplicates first
     if has_duplicates(strings):
         return False
-    
+
+    if engine == "gcat":
+        return comma_free_gcat(strings, length)
+    return comma_free_fast(strings)
+
+def comma_free_fast(strings):
+    """
+    Comma-free test on a duplicate-free, equal-length code.
+
+    The factor of w_i·w_j starting at position s is w_i[s:] + w_j[:s].  For
+    every s the words are indexed once by that suffix and that prefix, so
+    each code word x is tested as a factor with two dict lookups: x is hit
+    when some w_i ends with x[:L-s] and some *other* w_j starts with x[L-s:]
+    (like GCAT, a word is never paired with itself).
+    """
+    length = len(strings[0])
+    for s in range(1, length):
+        heads = dict()      # w[s:] -> words ending with it
+        tails = dict()      # w[:s] -> words starting with it
+        for w in strings:
+            heads.setdefault(w[s:], []).append(w)
+            tails.setdefault(w[:s], []).append(w)
+        for x in strings:
+            left = heads.get(x[:length - s])
+            right = tails.get(x[length - s:])
+            if left and right and (len(left) > 1 or len(right) > 1 or left[0] != right[0]):
+                return False
+    return True
+
+def comma_free_gcat(strings, length):
+    """
+    Reference comma-free test on a duplicate-free, equal-length code: a direct
+    translation of the Java CommaFree.test() method from GCAT.
+    """
     # Direct translation of the Java algorithm:
     # for(Tuple tupleA:tuples) for(Tuple tupleB:tuples)
     #   if(tupleA!=tupleB) for(shift=1,shifted=Arrays.asList(tupleA,tupleB);shift<length;shift++)
@@ -142,54 +194,113 @@ def is_circular(code):
     
     if len(set(len(s) for s in code)) != 1:
         return False
-    V = set()
+    return not has_cycle(representing_graph(code))
+
+def representing_graph(code):
+    """
+    Adjacency sets of the representing graph G(X) of an equal-length code.
+
+    Vertices are packed ids (see packed_utils) for plain A/C/G/T words; any
+    other alphabet is interned to ids in first-seen order instead.
+    """
+    if not code:
+        return dict()
+    length = len(code[0])
+    if is_packable(code):
+        return packed_representing_graph(encode_code(code), length)
     E = dict()          # adjacency list
+    ids = dict()
     for w in code:
         for i in range(1, len(w)):
-            a, b = w[:i], w[i:]
-            V.update((a, b))
+            a = ids.setdefault(w[:i], len(ids))
+            b = ids.setdefault(w[i:], len(ids))
             E.setdefault(a, set()).add(b)
-    colour = dict()     # DFS: 0=unseen, 1=stack, 2=done
+    return E
+
+def packed_representing_graph(values, length):
+    """Adjacency sets of G(X) for a code of packed words of the given length."""
+    E = dict()
+    for value in values:
+        for i in range(1, length):
+            a, b = split_word(value, i, length)
+            E.setdefault(a, set()).add(b)
+    return E
 
-    def dfs(v):
-        colour[v] = 1
-        for nxt in E.get(v, ()):
-            c = colour.get(nxt, 0)
-            if c == 1:                  # back-edge → cycle
-                return True
-            if c == 0 and dfs(nxt):
-                return True
-        colour[v] = 2
+def is_circular_packed(values, length):
+    """``is_circular`` for a code of packed words of the given length."""
+    values = list(values)
+    if not values or has_duplicates(values):
         return False
+    return not has_cycle(packed_representing_graph(values, length))
 
-    return not any(colour.get(v, 0) == 0 and dfs(v) for v in V)
+def has_cycle(E):
+    """Iterative three-colour DFS for a directed cycle in an adjacency dict."""
+    colour = dict()     # DFS: 0=unseen, 1=stack, 2=done
+    for root in E:
+        if colour.get(root, 0):
+            continue
+        colour[root] = 1
+        stack = [(root, iter(E[root]))]
+        while stack:
+            v, neighbours = stack[-1]
+            for nxt in neighbours:
+                c = colour.get(nxt, 0)
+                if c == 1:              # back-edge → cycle
+                    return True
+                if c == 0:
+                    colour[nxt] = 1
+                    stack.append((nxt, iter(E.get(nxt, ()))))
+                    break
+            else:
+                colour[v] = 2
+                stack.pop()
+    return False
 
 ########################################
 # 3. is_C3 ---------------------------- #
 ########################################
 
+def rotation_codes(length, code, ks=None):
+    """
+    α_k(code) as lists of words for every *k* (default: 0..length-1), all
+    produced by a single vectorized rotation of the code.
+    Codes with words of other lengths are rotated word by word.
+    """
+    ks = range(length) if ks is None else ks
+    if not ''.join(code).isascii() or any(len(w) != length for w in code):
+        # like ``alpha``: a short tail is only rotated when it is longer than k
+        return [[w[-k:] + w[:-k] if 0 < k < len(w) else w for w in code] for k in ks]
+    rotated = rotate_batch(words_to_array([code], length), ks)
+    return [variant[0] for variant in array_to_words(rotated)]
+
 def is_C3(length,code):
     """
-    A code is C³ iff the code itself *and* the two rotation codes obtained by
-    shifting every word left by 1 or 2 positions are circular.                  
-    """
-    codon  = ''.join(code)
-    print(codon)
-    if length == 4:
-        alpha1 = chunk(alph1(codon,length),4) 
-        alpha2 = chunk(alph2(codon,length),4) 
-        alpha3 = chunk(alph3(codon,length),4) 
-        print(is_circular(code) , is_circular(alpha1) , is_circular(alpha2) , is_circular(alpha3))
-        return is_circular(code) and is_circular(alpha1) and is_circular(alpha2) and is_circular(alpha3)
-    elif length == 3:
-        alpha1 = chunk(alph1(codon,length),4) 
-        alpha2 = chunk(alph2(codon,length),4) 
-        return is_circular(code) and is_circular(alpha1) and is_circular(alpha2)
-    elif length == 2:
-        alpha1 = chunk(alph1(codon,length),4)  
-        return is_circular(code) and is_circular(alpha1)
-    
-    return False 
+    A code is C³ iff the code itself *and* the rotation codes obtained by
+    shifting every word by 1 .. length-1 positions are circular.
+    """
+    return CodeAnalysis(length, code).c_n
+
+def is_C3_batch(length, codes):
+    """
+    ``is_C3`` for many equal-sized codes of A/C/G/T words.  All rotations of
+    all codes come out of one vectorized call; up to BITMATRIX_MAX_LENGTH
+    their graphs are checked together as bit-matrices, above that one by one
+    on packed words.
+    """
+    codes = list(codes)
+    if not codes:
+        return []
+    rotated = rotate_batch(letter_codes(words_to_array(codes, length)))
+    packed = pack_array(rotated)                  # (length, n_codes, n_words)
+    if length <= BITMATRIX_MAX_LENGTH:
+        circular = circular_batch_packed(length, packed.reshape(length * len(codes), packed.shape[-1]))
+        return circular.reshape(length, len(codes)).all(axis=0).tolist()
+    packed = packed.tolist()
+    return [
+        all(is_circular_packed(packed[k][c], length) for k in range(length))
+        for c in range(len(codes))
+    ]
+
 ########################################
 # 4. is_self_complementary ------------ #
 ########################################
@@ -215,20 +326,510 @@ def is_duplicate_free(code):
     """
     return len(code) == len(set(code))
 
+########################################
+# 6. shared analysis context ---------- #
+########################################
+
+class CodeAnalysis:
+    """
+    Lazily computed, memoized analysis of one code and its α_k variants.
+
+    Variant k is α_k(code), variant 0 the code itself.  All variants come out
+    of one vectorized rotation, and each variant's representing graph and
+    circularity verdict is computed at most once no matter how many
+    properties of how many variants are requested.  The Cⁿ verdict is shared
+    by every variant, since they all have the same set of rotation codes.
+    """
+
+    def __init__(self, length, code):
+        self.length = length
+        self.code = list(code)
+        self._graphs = dict()
+        self._circular = dict()
+        self._properties = dict()
+
+    @classmethod
+    def from_input(cls, length, codon_input):
+        """Parse a raw codon string once and analyse it."""
+        return cls(length, parseinput(length, codon_input))
+
+    @cached_property
+    def variants(self):
+        """α_k(code) for every k in 0 .. length-1."""
+        if self.length < 2:
+            return [self.code]
+        return rotation_codes(self.length, self.code)
+
+    def variant(self, k=0):
+        """Words of α_k(code)."""
+        if not 0 <= k < len(self.variants):
+            raise ValueError("k must satisfy 0 ≤ k < codon_length")
+        return self.variants[k]
+
+    def graph(self, k=0):
+        """Representing graph of variant k, None if its word lengths differ."""
+        if k not in self._graphs:
+            words = self.variant(k)
+            uniform = len(set(len(w) for w in words)) == 1
+            self._graphs[k] = representing_graph(words) if uniform else None
+        return self._graphs[k]
+
+    def circular(self, k=0):
+        """``is_circular`` of variant k."""
+        if k not in self._circular:
+            self._circular[k] = (
+                not has_duplicates(self.variant(k))
+                and self.graph(k) is not None
+                and not has_cycle(self.graph(k))
+            )
+        return self._circular[k]
+
+    def circularity_degree(self, k=0):
+        """
+        ``circularity_degree`` of variant k, from the graph already built for
+        the circularity test; None when circular or of mixed word lengths.
+        """
+        if self.circular(k) or self.graph(k) is None:
+            return None
+        if has_duplicates(self.variant(k)):
+            return 0
+        return shortest_ambiguity(self.graph(k))[0] - 1
+
+    @cached_property
+    def c_n(self):
+        """Cⁿ verdict: every rotation code α_0 .. α_(length-1) is circular."""
+        if not self.code or any(len(w) != self.length for w in self.code):
+            return False
+        return all(self.circular(k) for k in range(self.length))
+
+    def properties(self, k=0):
+        """The ``analyse_code`` diagnostics of variant k."""
+        if k not in self._properties:
+            words = self.variant(k)
+            self._properties[k] = dict(
+                duplicate_free      = is_duplicate_free(words),
+                self_complementary  = is_self_complementary(words),
+                comma_free          = is_comma_free(words,self.length),
+                circular            = self.circular(k),
+                maximal             = self.circular(k) and not has_extension(self.length, words),
+                circularity_degree  = self.circularity_degree(k),
+                maximal_self_complementary = is_maximal_self_complementary(words),
+                **{f"C{self.length}": self.c_n}
+            )
+        return self._properties[k]
+
+    def legacy_properties(self, k=0):
+        """Diagnostics of variant k with the labels the frontend expects."""
+        analysis = self.properties(k)
+        return {
+            "maximal self complementary": analysis['maximal_self_complementary'],
+            "self complementary": analysis['self_complementary'],
+            "circular code": analysis['circular'],
+            "maximal circular": analysis['maximal'],
+            "comma-free": analysis['comma_free'],
+            "duplicate free": analysis['duplicate_free'],
+            f"C{self.length}" : analysis[f'C{self.length}'],
+        }
+
+########################################
+# 7. incremental circularity ---------- #
+########################################
+
+def closure_bitsets(E, order):
+    """
+    Transitive closure of an acyclic adjacency dict, given a topological
+    *order* of its nodes: returns (index, reach) where index maps each node
+    to a bit and reach[v] is the bitmask of the nodes reachable from v.
+    """
+    index = {v: i for i, v in enumerate(order)}
+    reach = dict()
+    for v in reversed(order):
+        mask = 0
+        for w in E.get(v, ()):
+            mask |= (1 << index[w]) | reach[w]
+        reach[v] = mask
+    return index, reach
+
+def keeps_acyclic(index, reach, edges):
+    """
+    Check that adding *edges* (pairs) to the graph behind a closure creates
+    no cycle.  Any new cycle alternates new edges with old paths, so it is a
+    cycle of the small graph with i→j when edge i's target reaches (or is)
+    edge j's source.
+    """
+    def reaches(u, v):
+        return u == v or (u in index and v in index and (reach[u] >> index[v]) & 1)
+    return not has_cycle({
+        i: {j for j, (source, _) in enumerate(edges) if reaches(target, source)}
+        for i, (_, target) in enumerate(edges)
+    })
+
+class IncrementalCode:
+    """
+    Representing graph of a code under single-word edits, answering
+    ``is_circular`` after every add_word/remove_word without a rebuild.
+
+    The edges are kept acyclic under an online topological order
+    (Pearce–Kelly): an edge that agrees with the order is inserted in O(1),
+    otherwise only the nodes between its endpoints are searched and
+    reordered.  An edge that would close a cycle is parked in ``pending``
+    and retried whenever an edge is removed, so the code is circular exactly
+    when nothing is pending, no word is repeated and all lengths agree.
+    """
+
+    def __init__(self, code=()):
+        self.words = Counter()
+        self.lengths = Counter()
+        self.edges = Counter()      # edge -> number of words adding it
+        self.succ = dict()          # acyclic part of the graph
+        self.pred = dict()
+        self.order = dict()         # node -> position in the topological order
+        self.pending = set()        # edges that would close a cycle
+        for w in code:
+            self.add_word(w)
+
+    @property
+    def circular(self):
+        """``is_circular`` of the current code."""
+        return (bool(self.words) and not self.pending and len(self.lengths) == 1
+                and max(self.words.values()) == 1)
+
+    @property
+    def code(self):
+        return list(self.words.elements())
+
+    def add_word(self, w):
+        """Add one word; return whether the code is still circular."""
+        self.words[w] += 1
+        self.lengths[len(w)] += 1
+        for i in range(1, len(w)):
+            edge = (w[:i], w[i:])
+            self.edges[edge] += 1
+            if self.edges[edge] == 1:
+                self._insert(edge)
+        return self.circular
+
+    def remove_word(self, w):
+        """Remove one occurrence of a word; return whether the code is circular."""
+        if not self.words[w]:
+            raise ValueError(f"{w} is not in the code")
+        self.words[w] -= 1
+        self.lengths[len(w)] -= 1
+        self.words += Counter()         # drop zero counts
+        self.lengths += Counter()
+        retry = False
+        for i in range(1, len(w)):
+            edge = (w[:i], w[i:])
+            self.edges[edge] -= 1
+            if self.edges[edge]:
+                continue
+            del self.edges[edge]
+            if edge in self.pending:
+                self.pending.discard(edge)
+            else:
+                self.succ[edge[0]].discard(edge[1])
+                self.pred[edge[1]].discard(edge[0])
+                retry = True
+        if retry:
+            # Removing edges never invalidates the order, but may break the
+            # cycles that kept pending edges out
+            pending, self.pending = self.pending, set()
+            for edge in pending:
+                self._insert(edge)
+        return self.circular
+
+    def _node(self, v):
+        if v not in self.order:
+            self.order[v] = len(self.order)
+            self.succ[v] = set()
+            self.pred[v] = set()
+
+    def _insert(self, edge):
+        a, b = edge
+        self._node(a)
+        self._node(b)
+        if a == b:
+            self.pending.add(edge)
+            return
+        lower, upper = self.order[b], self.order[a]
+        if lower < upper:
+            forward = self._search(b, self.succ, lambda v: self.order[v] <= upper)
+            if a in forward:
+                self.pending.add(edge)
+                return
+            backward = self._search(a, self.pred, lambda v: self.order[v] >= lower)
+            self._reorder(backward, forward)
+        self.succ[a].add(b)
+        self.pred[b].add(a)
+
+    @staticmethod
+    def _search(start, adjacency, inside):
+        """Nodes reachable from *start* through nodes satisfying *inside*."""
+        seen = {start}
+        stack = [start]
+        while stack:
+            v = stack.pop()
+            for w in adjacency[v]:
+                if w not in seen and inside(w):
+                    seen.add(w)
+                    stack.append(w)
+        return seen
+
+    def _reorder(self, backward, forward):
+        """Move *backward* before *forward*, reusing their positions."""
+        by_order = lambda v: self.order[v]
+        nodes = sorted(backward, key=by_order) + sorted(forward, key=by_order)
+        positions = sorted(self.order[v] for v in nodes)
+        for v, position in zip(nodes, positions):
+            self.order[v] = position
+
+    def addable_words(self, alphabet="ACGT", length=None):
+        """
+        Words over *alphabet* that keep the code circular when added, from
+        one closure of the graph and one sweep over all len(alphabet)**L
+        candidates.  Empty when the code is not circular.
+        """
+        if self.words and not self.circular:
+            return []
+        if length is None:
+            if not self.lengths:
+                raise ValueError("The word length of an empty code must be given")
+            length = next(iter(self.lengths))
+        index, reach = closure_bitsets(self.succ, sorted(self.order, key=self.order.get))
+        addable = []
+        for letters in product(alphabet, repeat=length):
+            w = "".join(letters)
+            if w in self.words:
+                continue
+            if keeps_acyclic(index, reach, [(w[:i], w[i:]) for i in range(1, length)]):
+                addable.append(w)
+        return addable
+
+########################################
+# 8. maximality ----------------------- #
+########################################
+
+EXTENSION_PROPERTIES = ("circular", "c3")
+
+def word_graph(code):
+    """Representing graph of a code with the prefix/suffix strings as nodes."""
+    E = dict()
+    for w in code:
+        for i in range(1, len(w)):
+            E.setdefault(w[:i], set()).add(w[i:])
+    return E
+
+def word_graph_order(E):
+    """
+    Topological order of a representing graph given as an adjacency dict
+    (see graph_utils.topological_order for index lists); None if cyclic.
+    """
+    indegree = Counter(w for targets in E.values() for w in targets)
+    nodes = set(E) | set(indegree)
+    order = [v for v in nodes if not indegree[v]]
+    for v in order:                 # grows while iterating
+        for w in E.get(v, ()):
+            indegree[w] -= 1
+            if not indegree[w]:
+                order.append(w)
+    return order if len(order) == len(nodes) else None
+
+# Candidates checked per vectorized step of the packed extension sweep
+EXTENSION_CHUNK = 1 << 14
+
+def extension_words(length, code, property="circular"):
+    """
+    Every A/C/G/T word of the given length that can be added to *code* while
+    it stays circular (or C^length with property="c3"), in lexicographic order.
+
+    One bitset closure of the representing graph of each needed rotation
+    code is built up front; the 4^length candidates are then checked against
+    it instead of with a fresh circularity test each, vectorized for A/C/G/T
+    codes and otherwise by ``IncrementalCode.addable_words``.
+    Empty if the code itself does not have the property.
+    """
+    return [w for chunk in _extensions(length, code, property) for w in chunk]
+
+def has_extension(length, code, property="circular"):
+    """``extension_words`` is non-empty; stops at the first addable word."""
+    return any(chunk for chunk in _extensions(length, code, property))
+
+def _extensions(length, code, property):
+    """Yield the addable words in lexicographic chunks."""
+    if property not in EXTENSION_PROPERTIES:
+        raise ValueError(f"Unknown extension property: {property}")
+    code = list(code)
+    if any(len(w) != length for w in code) or has_duplicates(code):
+        return
+    ks = list(range(length)) if property == "c3" else [0]
+    variants = rotation_codes(length, code, ks)
+    if is_packable(code) and 2 <= length <= 31:
+        yield from _packed_extensions(length, code, ks, variants)
+        return
+    addable = []
+    for variant in variants:
+        incremental = IncrementalCode(variant)
+        if variant and not incremental.circular:
+            return
+        addable.append(set(incremental.addable_words(NUCLEOTIDES, length)))
+    present = set(code)
+    for letters in product(NUCLEOTIDES, repeat=length):
+        w = "".join(letters)
+        if w not in present and all(
+            (w[-k:] + w[:-k] if k else w) in words for k, words in zip(ks, addable)
+        ):
+            yield [w]
+
+def _reach_matrix(E):
+    """
+    Sorted vertex ids and reflexive reachability matrix (rows and columns in
+    that order) of an acyclic packed representing graph; None if cyclic.
+    """
+    order = word_graph_order(E)
+    if order is None:
+        return None
+    index, reach = closure_bitsets(E, order)
+    nodes = sorted(index)
+    n = len(nodes)
+    sorted_position = np.empty(n, dtype=np.int64)
+    sorted_position[[index[v] for v in nodes]] = np.arange(n)
+    matrix = np.eye(n, dtype=bool)
+    for row, v in enumerate(nodes):
+        bits = np.unpackbits(
+            np.frombuffer(reach[v].to_bytes((n + 7) // 8, "little"), dtype=np.uint8),
+            bitorder="little",
+        )[:n]
+        matrix[row, sorted_position[np.flatnonzero(bits)]] = True
+    return np.array(nodes, dtype=np.uint64), matrix
+
+def _packed_extensions(length, code, ks, variants):
+    """
+    Vectorized sweep for A/C/G/T codes.  For every candidate word and
+    rotation k, M[i, j] says whether the target of the candidate's i-th new
+    edge reaches the source of its j-th one in α_k(code); the candidate
+    closes a cycle exactly when M has one, i.e. its transitive closure
+    (by repeated boolean squaring) has a set diagonal bit.
+    """
+    matrices = []
+    for variant in variants:
+        reach = _reach_matrix(packed_representing_graph(encode_code(variant), length))
+        if reach is None:
+            return
+        matrices.append(reach)
+    present = np.zeros(4 ** length, dtype=bool)
+    present[encode_code(code)] = True
+    splits = np.arange(1, length, dtype=np.uint64)
+    prefix_shift = (2 * (length - splits))[:, np.newaxis]
+    prefix_bit = (np.uint64(1) << (2 * splits))[:, np.newaxis]
+    suffix_bit = (np.uint64(1) << prefix_shift)
+    squarings = max(1, (length - 2).bit_length())
+
+    for start in range(0, 4 ** length, EXTENSION_CHUNK):
+        values = np.arange(start, min(start + EXTENSION_CHUNK, 4 ** length), dtype=np.uint64)
+        ok = ~present[start:start + len(values)]
+        for k, (nodes, matrix) in zip(ks, matrices):
+            rotated = rotate_packed_batch(values, length, [k])[0] if k else values
+            prefixes = (rotated >> prefix_shift) | prefix_bit               # (L-1, m)
+            suffixes = (rotated & (suffix_bit - np.uint64(1))) | suffix_bit
+            M = suffixes[:, np.newaxis, :] == prefixes[np.newaxis, :, :]    # (L-1, L-1, m)
+            if len(nodes):
+                p = np.minimum(np.searchsorted(nodes, prefixes), len(nodes) - 1)
+                q = np.minimum(np.searchsorted(nodes, suffixes), len(nodes) - 1)
+                known_p = nodes[p] == prefixes
+                known_q = nodes[q] == suffixes
+                M |= (matrix[q[:, np.newaxis, :], p[np.newaxis, :, :]]
+                      & known_q[:, np.newaxis, :] & known_p[np.newaxis, :, :])
+            T = np.moveaxis(M, -1, 0).astype(np.uint8)                     # (m, L-1, L-1)
+            for _ in range(squarings):
+                T = ((T | (T @ T)) > 0).astype(np.uint8)
+            ok &= ~T.diagonal(axis1=1, axis2=2).any(axis=1)
+        words = values[ok].tolist()
+        if words:
+            yield decode_code(words, length)
+
+def has_property(length, code, property="circular"):
+    """
+    The code is a duplicate-free set of words of the given length that is
+    circular (or C^length with property="c3").
+    """
+    code = list(code)
+    if any(len(w) != length for w in code) or has_duplicates(code):
+        return False
+    if property == "c3":
+        return CodeAnalysis(length, code).c_n
+    return is_circular(code)
+
+def is_maximal(length, code, property="circular"):
+    """
+    The code has the property (circular or C^length) and no word can be
+    added without losing it.
+    """
+    return has_property(length, code, property) and not has_extension(length, code, property)
+
+########################################
+# 9. k-circularity -------------------- #
+########################################
+
+def shortest_ambiguity(E):
+    """
+    Fewest words in a circular sequence with two decompositions, read off a
+    representing graph: (m, closed walk as a node list), or None if acyclic.
+
+    A closed walk of c edges in G(X) spells a necklace of c/2 words when c
+    is even; odd walks only exist when every edge splits words in the middle
+    (even L) and need c words.  A BFS over (node, walk-length parity) from
+    each node finds its shortest even and odd closed walks; it stops as soon
+    as no longer walk can beat the best m found so far.
+    """
+    best = None
+    for s in E:
+        start = (s, 0)
+        depth = {start: 0}
+        parent = {start: None}
+        queue = deque([start])
+        while queue:
+            state = queue.popleft()
+            c = depth[state] + 1
+            if best is not None and (c + 1) // 2 >= best[0]:
+                break
+            for v in E.get(state[0], ()):
+                if v == s:
+                    m = c // 2 if c % 2 == 0 else c
+                    if best is None or m < best[0]:
+                        walk = [s]
+                        node = state
+                        while node is not None:
+                            walk.append(node[0])
+                            node = parent[node]
+                        best = (m, walk[::-1])
+                nxt = (v, c % 2)
+                if nxt not in depth:
+                    depth[nxt] = c
+                    parent[nxt] = state
+                    queue.append(nxt)
+    return best
+
+def circularity_degree(code):
+    """
+    Largest k for which the code is k-circular (every circular sequence of
+    at most k words has one decomposition): one less than the fewest words
+    of an ambiguous necklace.  None if the code is circular, i.e. k-circular
+    for every k; 0 if it repeats a word.
+    """
+    if len(set(len(w) for w in code)) > 1:
+        raise ValueError("k-circularity needs words of a single length")
+    if has_duplicates(code):
+        return 0
+    ambiguity = shortest_ambiguity(representing_graph(code))
+    return None if ambiguity is None else ambiguity[0] - 1
+
 ########################################
 # convenience bundle ------------------ #
 ########################################
 
 def analyse_code(length,code):
-    """Return a dict with all five yes/no diagnostics."""
-    return dict(
-        duplicate_free      = is_duplicate_free(code),
-        self_complementary  = is_self_complementary(code),
-        comma_free          = is_comma_free(code,length),
-        circular            = is_circular(code),
-        maximal_self_complementary = is_maximal_self_complementary(code),
-        **{f"C{length}": is_C3(length,code)}
-    )
+    """Return a dict with all diagnostics (yes/no, plus the k-circularity degree)."""
+    return CodeAnalysis(length, code).properties()
 
 ########################################
 # Legacy compatibility functions ------ #
@@ -247,73 +848,24 @@ def is_circular_code(number, codon_input):
 
 def properties(number, codon_input):
     """Get properties for original codons."""
-    parsed_input = parseinput(number, codon_input)
-    code_list = list(parsed_input)
-    analysis = analyse_code(number,code_list)
-    
-    # Map to legacy format
-    eigenshaften_parameter = {
-        "maximal self complementary": analysis['maximal_self_complementary'],  # Not implemented in new version
-        "self complementary": analysis['self_complementary'],
-        "circular code": analysis['circular'],
-        "comma-free": analysis['comma_free'],
-        "duplicate free": analysis['duplicate_free'],
-        f"C{number}" : analysis[f'C{number}'],
-    }
-    return eigenshaften_parameter
+    return CodeAnalysis.from_input(number, codon_input).legacy_properties(0)
 
 def properties_alpha_one(number, codon_input):
     """Get properties for alpha-one transformed codons."""
-    alpha_input = alph1(codon_input, number)
-    parsed_input = parseinput(number, alpha_input)
-    code_list = list(parsed_input)
-    analysis = analyse_code(number,code_list)
-    
-    properties_parameter1 = {
-        "maximal self complementary": analysis['maximal_self_complementary'],  # Not implemented in new version
-        "self complementary": analysis['self_complementary'],
-        "circular code": analysis['circular'],
-        "comma-free": analysis['comma_free'],
-        "duplicate free": analysis['duplicate_free'],
-        f"C{number}" : analysis[f'C{number}']
-    }
-    return properties_parameter1
+    return CodeAnalysis.from_input(number, codon_input).legacy_properties(1)
 
 def properties_alpha_two(number, codon_input):
     """Get properties for alpha-two transformed codons."""
-    alpha_input = alph2(codon_input, number)
-    parsed_input = parseinput(number, alpha_input)
-    code_list = list(parsed_input)
-    analysis = analyse_code(number,code_list)
-    
-    properties_parameter2 = {
-        "maximal self complementary": analysis['maximal_self_complementary'],  # Not implemented in new version
-        "self complementary": analysis['self_complementary'],
-        "circular code": analysis['circular'],
-        "comma-free": analysis['comma_free'],
-        "duplicate free": analysis['duplicate_free'],
-        f"C{number}" : analysis[f'C{number}']
-    }
-    return properties_parameter2
+    return CodeAnalysis.from_input(number, codon_input).legacy_properties(2)
 
 def properties_alpha_three(number, codon_input):
     """Get properties for alpha-three transformed codons."""
-    alpha_input = alph3(codon_input, number)
-    parsed_input = parseinput(number, alpha_input)
-    code_list = list(parsed_input)
-    analysis = analyse_code(number,code_list)
-    
-    properties_parameter3 = {
-        "maximal self complementary": analysis['maximal_self_complementary'],
-        "self complementary": analysis['self_complementary'],
-        "circular code": analysis['circular'],
-        "comma-free": analysis['comma_free'],
-        "duplicate free": analysis['duplicate_free'],
-        f"C{number}" : analysis[f'C{number}']
-    }
-    return properties_parameter3
+    return CodeAnalysis.from_input(number, codon_input).legacy_properties(3)
+
+def properties_alpha(number, codon_input, k):
+    """Get properties for α_k transformed codons, any 0 ≤ k < codon length."""
+    return CodeAnalysis.from_input(number, codon_input).legacy_properties(k)
 
 def c3(number, codon_input):
     """Check C3 properties for codons."""
-    parsed_input = parseinput(number, codon_input)
-    return is_C3(number,parsed_input)
+    return CodeAnalysis.from_input(number, codon_input).c_n
@@ -0,0 +1,234 @@
+"""
+Utility functions for finding the reading frame of long sequences with a code.
+
+A code of words of length L splits a sequence into L frames: frame f holds
+the words starting at letters f, f+L, f+2L, ... of a record (0-based).  In
+the reading frame of a gene, words of a circular code such as the X code
+occur far more often than in the two shifted frames, so counting code-word
+hits per frame in consecutive windows calls the frame of every window.
+
+Words are looked up in a table of 4**L booleans indexed by packed value (see
+packed_utils); all words of a chunk are packed at once with NumPy.  Words
+holding a letter other than A/C/G/T never hit.  ``scan_sequence`` streams any
+source through SequenceReader; for a file path with *processes* > 1 the
+record bodies are cut into byte segments scanned on a process pool, each
+worker mapping the file itself.
+"""
+import os
+from functools import lru_cache
+from multiprocessing import Pool
+
+import numpy as np
+
+from .codon_utils import parseinput
+from .packed_utils import decode_code, encode_code, is_packable
+from .sequence_utils import (
+    SEQUENCE_CHUNK_SIZE, SequenceReader, clean_bytes, count_letters, map_file, record_spans
+)
+from .vector_utils import lenient_letter_codes
+
+# The circular code of Arquès and Michel, found in the reading frame of genes
+X_CODE = "AAC AAT ACC ATC ATT CAG CTC CTG GAA GAC GAG GAT GCC GGC GGT GTA GTC GTT TAC TTC"
+
+SCAN_WINDOW = 300                    # letters per window
+SCAN_MAX_LENGTH = 12                 # the lookup table holds 4**L entries
+SCAN_SEGMENT_SIZE = 1 << 24          # bytes per process-pool task
+
+#####################
+# code words        #
+#####################
+
+def scan_code(length: int, codons: str) -> tuple:
+    """Sorted packed words of a code given as text, for ``code_table``."""
+    if not 1 <= length <= SCAN_MAX_LENGTH:
+        raise ValueError(f"Word length must be between 1 and {SCAN_MAX_LENGTH}")
+    words = parseinput(length, codons)
+    if not words:
+        raise ValueError("The code is empty")
+    if any(len(word) != length for word in words) or not is_packable(words):
+        raise ValueError(f"Code words must be {length} letters of A, C, G, T")
+    return tuple(sorted(set(encode_code(words))))
+
+@lru_cache(maxsize=8)
+def code_table(length: int, values: tuple) -> np.ndarray:
+    """Boolean lookup table over all 4**L packed words, True for code words."""
+    table = np.zeros(4 ** length, dtype=bool)
+    table[list(values)] = True
+    return table
+
+def word_hits(letters: np.ndarray, length: int, table: np.ndarray, starts: int) -> np.ndarray:
+    """
+    Mask over the first *starts* positions of an upper-case letter array:
+    True where the word of *length* letters starting there is a code word.
+    Needs ``starts + length - 1 <= len(letters)``.
+    """
+    codes = lenient_letter_codes(letters)
+    values = np.zeros(starts, dtype=np.uint32)
+    invalid = np.zeros(starts, dtype=bool)
+    for j in range(length):
+        window = codes[j:j + starts]
+        values <<= np.uint32(2)
+        values |= window & np.uint8(3)
+        invalid |= window == 255        # a letter other than A/C/G/T never hits
+    return table[values] & ~invalid
+
+def window_counts(hits: np.ndarray, offset: int, length: int, window: int):
+    """
+    (first window, counts) for a hit mask whose first position is letter
+    *offset* of its record: counts[w, f] is the number of hits in frame f
+    of window first + w.
+    """
+    if not len(hits):
+        return offset // window, np.zeros((0, length), dtype=np.int64)
+    first = offset // window
+    last = (offset + len(hits) - 1) // window
+    positions = np.flatnonzero(hits) + offset
+    index = (positions // window - first) * length + positions % length
+    counts = np.bincount(index, minlength=(last - first + 1) * length)
+    return first, counts.reshape(-1, length)
+
+def call_frames(counts: np.ndarray) -> np.ndarray:
+    """Frame with the most hits per row of *counts*; -1 for no hits or a tie."""
+    best = counts.max(axis=1, initial=0)
+    tied = (counts == best[:, None]).sum(axis=1) > 1
+    return np.where((best > 0) & ~tied, counts.argmax(axis=1), -1)
+
+#####################
+# scanning          #
+#####################
+
+class _RecordCounts:
+    """Window counts of one record, grown as chunks or segments arrive."""
+
+    def __init__(self, name, length: int):
+        self.name = name
+        self.letters = 0
+        self.counts = np.zeros((0, length), dtype=np.int64)
+
+    def add(self, first: int, counts: np.ndarray) -> None:
+        end = first + len(counts)
+        if end > len(self.counts):
+            grown = np.zeros((max(end, 2 * len(self.counts)), counts.shape[1]), dtype=np.int64)
+            grown[:len(self.counts)] = self.counts
+            self.counts = grown
+        self.counts[first:end] += counts
+
+    def result(self, window: int) -> dict:
+        windows = -(-self.letters // window)
+        counts = self.counts[:windows]
+        if len(counts) < windows:
+            counts = np.vstack([counts, np.zeros((windows - len(counts), counts.shape[1]), dtype=np.int64)])
+        totals = counts.sum(axis=0)
+        frame = int(call_frames(totals[None, :])[0])
+        return {
+            "name": self.name,
+            "letters": self.letters,
+            "counts": totals.tolist(),
+            "frame": frame if frame >= 0 else None,
+            "windows": {
+                "counts": counts.tolist(),
+                "frames": [int(f) if f >= 0 else None for f in call_frames(counts)],
+            },
+        }
+
+def iter_hits(reader: SequenceReader, length: int, table: np.ndarray):
+    """
+    Yield (record, letters, offset, hits) for every chunk of *reader*:
+    *letters* new letters arrived and hits masks the word starts from
+    record position *offset* on whose words are complete so far.  The last
+    L-1 letters are carried into the next chunk, so every word start of a
+    record shows up exactly once, in order.
+    """
+    carry = np.empty(0, dtype=np.uint8)
+    offset, current = 0, None               # record position of carry[0]
+    for record, letters in reader.chunks():
+        if record != current:
+            carry, offset, current = np.empty(0, dtype=np.uint8), 0, record
+        buffer = np.concatenate([carry, letters]) if len(carry) else letters
+        starts = max(0, len(buffer) - length + 1)
+        yield record, len(letters), offset, word_hits(buffer, length, table, starts)
+        carry, offset = buffer[starts:], offset + starts
+
+def _scan_stream(source, length: int, table: np.ndarray, window: int, chunk_size: int) -> list:
+    """Scan any source in one process."""
+    records = []
+    with SequenceReader(source, chunk_size) as reader:
+        for record, letters, offset, hits in iter_hits(reader, length, table):
+            while len(records) <= record:
+                records.append(_RecordCounts(reader.names[len(records)], length))
+            records[record].add(*window_counts(hits, offset, length, window))
+            records[record].letters += letters
+        for name in reader.names[len(records):]:
+            records.append(_RecordCounts(name, length))
+    return records
+
+def _lookahead(data: np.ndarray, stop: int, end: int, needed: int) -> np.ndarray:
+    """The first *needed* letters of data[stop:end] (fewer at the end of a record)."""
+    letters, step = np.empty(0, dtype=np.uint8), 4 * needed + 64
+    while len(letters) < needed and stop < end:
+        letters = np.concatenate([letters, clean_bytes(np.asarray(data[stop:stop + step]))])
+        stop += step
+        step *= 2
+    return letters[:needed]
+
+def _count_segment(args) -> int:
+    path, start, stop = args
+    return count_letters(np.asarray(map_file(path)[start:stop]))
+
+def _scan_segment(args):
+    path, start, stop, end, offset, length, values, window = args
+    data = map_file(path)
+    letters = clean_bytes(np.asarray(data[start:stop]))
+    buffer = np.concatenate([letters, _lookahead(data, stop, end, length - 1)])
+    starts = min(len(letters), max(0, len(buffer) - length + 1))
+    hits = word_hits(buffer, length, code_table(length, values), starts)
+    return window_counts(hits, offset, length, window)
+
+def _scan_mapped(path, length: int, values: tuple, window: int, processes: int,
+                 segment_size: int) -> list:
+    """
+    Scan a file on a process pool: count the letters of every segment, then
+    scan the segments at their record offsets and add up the window counts.
+    """
+    records, segments = [], []
+    for index, (name, start, end) in enumerate(record_spans(map_file(path))):
+        records.append(_RecordCounts(name, length))
+        for begin in range(start, end, segment_size):
+            segments.append((index, begin, min(begin + segment_size, end), end))
+    with Pool(processes) as pool:
+        sizes = pool.map(_count_segment, [(path, begin, stop) for _, begin, stop, _ in segments])
+        tasks = []
+        for (index, begin, stop, end), size in zip(segments, sizes):
+            tasks.append((path, begin, stop, end, records[index].letters, length, values, window))
+            records[index].letters += size
+        for (index, *_), (first, counts) in zip(segments, pool.imap(_scan_segment, tasks)):
+            records[index].add(first, counts)
+    return records
+
+def scan_sequence(source, length: int, codons: str, window: int = SCAN_WINDOW,
+                  processes: int = 1, chunk_size: int = SEQUENCE_CHUNK_SIZE,
+                  segment_size: int = SCAN_SEGMENT_SIZE) -> dict:
+    """
+    Count the code-word hits of every frame in consecutive windows of
+    *window* letters of every record of *source* (a path, bytes or binary
+    file) and call each window's frame.
+
+    Returns {"length", "window", "code", "records": [{"name", "letters",
+    "counts", "frame", "windows": {"counts", "frames"}}]} where counts are
+    per frame and a frame is None when no frame has strictly the most hits.
+    Windows start every *window* letters; words belong to the window they
+    start in.
+    """
+    values = scan_code(length, codons)
+    if window < 1:
+        raise ValueError("Window must be at least one letter")
+    if processes > 1 and isinstance(source, (str, os.PathLike)):
+        records = _scan_mapped(source, length, values, window, processes, segment_size)
+    else:
+        records = _scan_stream(source, length, code_table(length, values), window, chunk_size)
+    return {
+        "length": length,
+        "window": window,
+        "code": decode_code(values, length),
+        "records": [record.result(window) for record in records],
+    }
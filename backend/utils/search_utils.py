@@ -0,0 +1,439 @@
+"""
+Utility functions for exhaustively searching the code space.
+
+The search runs over the non-periodic words of one length and takes at most
+one word per conjugacy (rotation) class: a circular code never holds a
+periodic word or two rotations of one word, and C³ and comma-free codes are
+circular.  Words are packed ints (see packed_utils).  Every partial code
+carries the transitive closure of its representing graph as bitmasks, so
+adding a word is an incremental cycle check instead of a fresh DFS.
+
+The search tree is split into independent subtrees by the choices for the
+first few classes.  ``search_codes`` runs them in-process or on a process
+pool, and ``search_to_file`` appends the results to an NDJSON file that can
+be resumed after an interruption.
+"""
+import json
+import os
+from itertools import product
+from multiprocessing import Pool, TimeoutError
+
+from .packed_utils import (
+    decode_code, rotate_word, revcomp_word, split_word
+)
+from .properties_utils import (
+    is_circular, is_C3, is_comma_free, is_self_complementary
+)
+
+SEARCH_PROPERTIES = ("circular", "comma_free", "c3")
+SEARCH_CHECK_INTERVAL = 1024        # search nodes between cancellation checks
+SEARCH_POLL_INTERVAL = 0.1          # seconds between checks while waiting on the pool
+
+#####################
+# search space      #
+#####################
+
+def conjugacy_classes(length: int) -> list[tuple[int, ...]]:
+    """
+    Classes of non-periodic packed words of the given length, ordered by
+    their smallest word; class ``c`` lists ``rotate_word(min(c), k)`` for
+    k = 0 .. length-1.
+    """
+    seen = set()
+    classes = []
+    for value in range(4 ** length):
+        if value in seen:
+            continue
+        rotations = tuple(rotate_word(value, k, length) for k in range(length))
+        seen.update(rotations)
+        if len(set(rotations)) == length:
+            classes.append(rotations)
+    return classes
+
+def search_units(length: int, self_complementary: bool = False) -> list[tuple]:
+    """
+    Units of the search tree: each is a tuple of choices, and a choice is the
+    tuple of packed words it adds to the code.
+
+    Without *self_complementary* every class is a unit with one choice per
+    rotation.  With it, a class and its reverse-complement class form one unit
+    whose choices add a word together with its reverse complement; a class
+    that is its own reverse complement only offers its palindromic words.
+    """
+    classes = conjugacy_classes(length)
+    if not self_complementary:
+        return [tuple((word,) for word in cls) for cls in classes]
+    class_of = {word: i for i, cls in enumerate(classes) for word in cls}
+    units = []
+    done = set()
+    for i, cls in enumerate(classes):
+        if i in done:
+            continue
+        partner = class_of[revcomp_word(cls[0], length)]
+        done.update((i, partner))
+        if partner == i:
+            choices = tuple((word,) for word in cls if revcomp_word(word, length) == word)
+        else:
+            choices = tuple((word, revcomp_word(word, length)) for word in cls)
+        if choices:
+            units.append(choices)
+    return units
+
+#####################
+# partial codes     #
+#####################
+
+def _add_edge(reach: dict, a: int, b: int) -> bool:
+    """
+    Add a→b to a transitive closure (node -> bitmask of reachable nodes) in
+    place; return False instead if the edge closes a cycle.
+    """
+    reach_b = reach.get(b, 0)
+    if a == b or (reach_b >> a) & 1:
+        return False
+    new = reach_b | (1 << b)
+    if (reach.get(a, 0) | new) == reach.get(a, 0):
+        return True
+    bit = 1 << a
+    for node, mask in reach.items():
+        if mask & bit:
+            reach[node] = mask | new
+    reach[a] = reach.get(a, 0) | new
+    return True
+
+class PartialCode:
+    """
+    An immutable code under construction together with the state needed to
+    test one more word incrementally.
+
+    ``closures[k]`` is the transitive closure of the representing graph of
+    α_k(code) (only k = 0 unless the property is "c3"); for "comma_free",
+    ``forbidden`` is the bitmask of every interior factor of every pair of
+    code words (a word w and a pair x·y may be equal, as in the classical
+    definition).
+    """
+
+    __slots__ = ("length", "property", "words", "mask", "closures", "forbidden")
+
+    def __init__(self, length: int, property: str, words=(), mask=0,
+                 closures=None, forbidden=0):
+        if property not in SEARCH_PROPERTIES:
+            raise ValueError(f"Unknown search property: {property}")
+        self.length = length
+        self.property = property
+        self.words = words
+        self.mask = mask
+        rotations = length if property == "c3" else 1
+        self.closures = closures if closures is not None else tuple({} for _ in range(rotations))
+        self.forbidden = forbidden
+
+    def _factors(self, x: int, y: int) -> int:
+        """Bitmask of the interior factors of x·y."""
+        length = self.length
+        full = (1 << (2 * length)) - 1
+        mask = 0
+        for s in range(1, length):
+            mask |= 1 << (((x << (2 * s)) | (y >> (2 * (length - s)))) & full)
+        return mask
+
+    def extend(self, new_words) -> "PartialCode | None":
+        """The code with *new_words* added, or None if it loses the property."""
+        length = self.length
+        closures = []
+        for k, closure in enumerate(self.closures):
+            reach = dict(closure)
+            for word in new_words:
+                rotated = rotate_word(word, k, length)
+                for i in range(1, length):
+                    if not _add_edge(reach, *split_word(rotated, i, length)):
+                        return None
+            closures.append(reach)
+
+        mask = self.mask
+        for word in new_words:
+            mask |= 1 << word
+        forbidden = self.forbidden
+        if self.property == "comma_free":
+            if any((forbidden >> word) & 1 for word in new_words):
+                return None
+            words = self.words + tuple(new_words)
+            for x in new_words:
+                for y in words:
+                    forbidden |= self._factors(x, y) | self._factors(y, x)
+            if forbidden & mask:
+                return None
+
+        return PartialCode(length, self.property, self.words + tuple(new_words),
+                           mask, tuple(closures), forbidden)
+
+    def rotated(self, k: int) -> list[int]:
+        """α_k of the code as sorted packed words."""
+        return sorted(rotate_word(word, k, self.length) for word in self.words)
+
+#####################
+# search            #
+#####################
+
+class CodeSearch:
+    """
+    Enumeration of the codes of *size* words with a property from
+    SEARCH_PROPERTIES (optionally also self-complementary) that are maximal:
+    no further unit of the search (a word, or a word and its reverse
+    complement) can be added.  *size* defaults to the largest possible size,
+    one word from every class, where maximality holds by construction.
+
+    For "c3" without the self-complementary constraint, α_k(X) is C³ whenever
+    X is, so only codes whose first chosen word is a class's smallest word
+    are searched and each is emitted with its length-1 rotations.
+    """
+
+    def __init__(self, length: int, property: str = "circular", size: int = None,
+                 self_complementary: bool = False):
+        if property not in SEARCH_PROPERTIES:
+            raise ValueError(f"Unknown search property: {property}")
+        if length < 2:
+            raise ValueError("Codes must have a word length of at least 2")
+        self.length = length
+        self.property = property
+        self.self_complementary = self_complementary
+        self.units = search_units(length, self_complementary)
+        # capacity[i]: most words the units from i on can still add
+        capacity = [0] * (len(self.units) + 1)
+        for i in range(len(self.units) - 1, -1, -1):
+            capacity[i] = capacity[i + 1] + max(len(choice) for choice in self.units[i])
+        self.capacity = capacity
+        self.size = capacity[0] if size is None else size
+        self.rotation_symmetry = property == "c3" and not self_complementary
+
+    def params(self) -> dict:
+        return {
+            "length": self.length,
+            "property": self.property,
+            "size": self.size,
+            "selfComplementary": self.self_complementary,
+        }
+
+    def tasks(self, depth: int) -> list[tuple]:
+        """
+        Prefixes splitting the tree into independent subtrees: a choice index
+        (or -1 to skip the unit) for each of the first *depth* units.
+        """
+        depth = min(depth, len(self.units))
+        options = [range(-1, len(unit)) for unit in self.units[:depth]]
+        return [prefix[::-1] for prefix in product(*reversed(options))]
+
+    def task_depth(self, tasks: int) -> int:
+        """Smallest prefix depth that yields at least *tasks* subtrees."""
+        depth, count = 0, 1
+        while count < tasks and depth < len(self.units):
+            count *= len(self.units[depth]) + 1
+            depth += 1
+        return depth
+
+    def run(self, prefix=(), cancelled=None):
+        """
+        Yield the codes of one subtree as sorted lists of packed words; stop
+        early once the *cancelled* callable returns true.
+        """
+        stop = _Checkpoint(cancelled)
+        state = PartialCode(self.length, self.property)
+        anchored = False
+        for i, index in enumerate(prefix):
+            if index < 0:
+                continue
+            if self.rotation_symmetry and not anchored and index != 0:
+                return
+            anchored = True
+            state = state.extend(self.units[i][index])
+            if state is None or len(state.words) > self.size:
+                return
+        yield from self._search(state, len(prefix), anchored, stop)
+
+    def _search(self, state: PartialCode, unit: int, anchored: bool, stop: "_Checkpoint"):
+        if stop():
+            return
+        needed = self.size - len(state.words)
+        if needed == 0:
+            if self._maximal(state):
+                if self.rotation_symmetry:
+                    for k in range(self.length):
+                        yield state.rotated(k)
+                else:
+                    yield sorted(state.words)
+            return
+        if self.capacity[unit] < needed:
+            return
+        choices = self.units[unit]
+        if self.rotation_symmetry and not anchored:
+            choices = choices[:1]
+        for choice in choices:
+            if len(choice) > needed:
+                continue
+            child = state.extend(choice)
+            if child is not None:
+                yield from self._search(child, unit + 1, True, stop)
+        yield from self._search(state, unit + 1, anchored, stop)
+
+    def _maximal(self, state: PartialCode) -> bool:
+        used = set(state.words)
+        for unit in self.units:
+            if any(word in used for choice in unit for word in choice):
+                continue
+            if any(state.extend(choice) is not None for choice in unit):
+                return False
+        return True
+
+    def verify(self, code: list[str]) -> bool:
+        """Re-check a found code with the regular property functions."""
+        if self.property == "c3":
+            ok = is_C3(self.length, code)
+        elif self.property == "comma_free":
+            ok = is_circular(code) and is_comma_free(code, self.length)
+        else:
+            ok = is_circular(code)
+        return ok and (not self.self_complementary or is_self_complementary(code))
+
+class _Checkpoint:
+    """Ask *cancelled* every SEARCH_CHECK_INTERVAL calls; a true answer sticks."""
+
+    def __init__(self, cancelled=None):
+        self.cancelled = cancelled
+        self.calls = 0
+        self.stopped = False
+
+    def __call__(self) -> bool:
+        if self.cancelled is not None and not self.stopped:
+            self.calls += 1
+            if self.calls % SEARCH_CHECK_INTERVAL == 0:
+                self.stopped = bool(self.cancelled())
+        return self.stopped
+
+def _run_task(args, cancelled=None):
+    search, index, prefix = args
+    return index, [decode_code(code, search.length) for code in search.run(prefix, cancelled)]
+
+def search_codes(length: int, property: str = "circular", size: int = None,
+                 self_complementary: bool = False, processes: int = 1):
+    """
+    Yield every maximal code found by ``CodeSearch`` as a sorted word list.
+    With *processes* > 1 the subtrees run on a process pool and arrive in
+    completion order.
+    """
+    search = CodeSearch(length, property, size, self_complementary)
+    processes = processes or os.cpu_count() or 1
+    depth = search.task_depth(8 * processes)
+    for _, codes in run_tasks(search, processes, depth, done=()):
+        yield from codes
+
+def run_tasks(search: CodeSearch, processes: int, depth: int, done, cancelled=None):
+    """
+    Yield (task index, codes) for every subtree of a split not in *done*.
+    Once the *cancelled* callable returns true no further results arrive:
+    the running subtree stops at its next checkpoint, or the pool is
+    terminated.  The subtree running at that moment may be incomplete.
+    """
+    prefixes = search.tasks(depth)
+    pending = [(search, i, prefix) for i, prefix in enumerate(prefixes) if i not in done]
+    if processes <= 1:
+        for task in pending:
+            if cancelled is not None and cancelled():
+                return
+            yield _run_task(task, cancelled)
+        return
+    with Pool(processes) as pool:           # leaving the block terminates the workers
+        results = pool.imap_unordered(_run_task, pending)
+        while True:
+            try:
+                yield results.next(timeout=SEARCH_POLL_INTERVAL)
+            except TimeoutError:
+                if cancelled is not None and cancelled():
+                    return
+            except StopIteration:
+                return
+
+#####################
+# resumable output  #
+#####################
+
+def _read_progress(path: str, params: dict):
+    """
+    Task split depth, finished task indexes and code count recorded in a
+    result file, after truncating any partial block left by an interruption.
+    """
+    depth = None
+    done = set()
+    count = 0
+    finished = False
+    keep = 0
+    with open(path, "rb") as handle:
+        lines = handle.readlines()
+    offset = 0
+    for number, raw in enumerate(lines):
+        offset += len(raw)
+        if not raw.endswith(b"\n"):
+            break
+        record = json.loads(raw)
+        if number == 0:
+            if record.get("search") != params:
+                raise ValueError(f"{path} holds results of a different search")
+            depth = record["depth"]
+            keep = offset
+        elif isinstance(record, dict) and "task" in record:
+            done.add(record["task"])
+            count += record["count"]
+            keep = offset
+        elif isinstance(record, dict) and record.get("done"):
+            finished = True
+            keep = offset
+    with open(path, "r+b") as handle:
+        handle.truncate(keep)
+    return depth, done, count, finished
+
+def search_to_file(path: str, length: int, property: str = "circular", size: int = None,
+                   self_complementary: bool = False, processes: int = None,
+                   resume: bool = True, verify: bool = False) -> int:
+    """
+    Run a ``CodeSearch`` and stream its codes to *path* as NDJSON; return the
+    total number of codes.
+
+    The file starts with a {"search": params, "depth": d} header (d fixes
+    how the tree is split, so a resumed run may use other *processes*); each finished subtree
+    appends its codes (one JSON word list per line) followed by a
+    {"task": i, "count": n} marker, and a {"done": true, "count": total}
+    line ends a complete search.  With *resume*, an existing file for the
+    same search is continued: finished subtrees are skipped and any partial
+    block after the last marker is discarded.  With *verify*, every code is
+    re-checked with the regular property functions before it is written.
+    """
+    search = CodeSearch(length, property, size, self_complementary)
+    params = search.params()
+    processes = processes or os.cpu_count() or 1
+    depth, done, count, finished = None, set(), 0, False
+    if resume and os.path.exists(path) and os.path.getsize(path):
+        depth, done, count, finished = _read_progress(path, params)
+    if depth is None:
+        depth = search.task_depth(8 * processes)
+        with open(path, "w") as handle:
+            handle.write(json.dumps({"search": params, "depth": depth}) + "\n")
+    if finished:
+        return count
+
+    with open(path, "a") as handle:
+        for index, codes in run_tasks(search, processes, depth, done):
+            for code in codes:
+                if verify and not search.verify(code):
+                    raise AssertionError(f"Search produced an invalid code: {code}")
+                handle.write(json.dumps(code) + "\n")
+            handle.write(json.dumps({"task": index, "count": len(codes)}) + "\n")
+            handle.flush()
+            count += len(codes)
+        handle.write(json.dumps({"done": True, "count": count}) + "\n")
+    return count
+
+def read_codes(path: str):
+    """Yield the codes stored in a ``search_to_file`` result file."""
+    with open(path) as handle:
+        for line in handle:
+            record = json.loads(line)
+            if isinstance(record, list):
+                yield record
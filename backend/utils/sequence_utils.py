@@ -0,0 +1,305 @@
+"""
+Utility functions for streaming long nucleotide sequences.
+
+``SequenceReader`` reads FASTA or raw sequence files (a path, which is
+memory-mapped, or any binary file object, which is read in blocks) and
+yields the sequence letters in bounded chunks: header lines (">" or ";")
+are skipped, whitespace and backslashes dropped and letters upper-cased,
+like ``codon_utils.parseinput`` does for pasted input, but without ever
+materializing the whole cleaned string.  Each FASTA record is a separate
+sequence; words never span two records.
+
+Input is expected to be ASCII.
+"""
+import hashlib
+import io
+import mmap
+import os
+
+import numpy as np
+
+from .packed_utils import decode_word
+from .vector_utils import lenient_letter_codes, pack_array
+
+SEQUENCE_CHUNK_SIZE = 1 << 22        # bytes read per block
+USAGE_MAX_LENGTH = 12                # longest word counted by word_usage
+
+_HEADER_BYTES = np.frombuffer(b">;", dtype=np.uint8)
+
+# Bytes removed from the sequence: whitespace and backslash (see codon_utils._clean)
+_DROPPED = np.zeros(256, dtype=bool)
+_DROPPED[np.frombuffer(b" \t\n\r\x0b\x0c\\", dtype=np.uint8)] = True
+
+# Byte -> upper-case byte
+_UPPER = np.arange(256, dtype=np.uint8)
+_UPPER[ord("a"):ord("z") + 1] -= 32
+
+def map_file(path) -> np.ndarray:
+    """The bytes of a file as a read-only, memory-mapped uint8 array."""
+    if os.path.getsize(path) == 0:
+        return np.empty(0, dtype=np.uint8)
+    return np.memmap(path, dtype=np.uint8, mode="r")
+
+def clean_bytes(data: np.ndarray) -> np.ndarray:
+    """Upper-case letters of a header-free uint8 array, whitespace and backslashes dropped."""
+    return _UPPER[data[~_DROPPED[data]]]
+
+def count_letters(data: np.ndarray) -> int:
+    """Number of letters ``clean_bytes`` keeps of *data*."""
+    return len(data) - int(np.count_nonzero(_DROPPED[data]))
+
+def record_spans(data: np.ndarray, chunk_size: int = SEQUENCE_CHUNK_SIZE) -> list[tuple]:
+    """
+    (name, start, end) byte spans of the record bodies of a whole sequence
+    held in (or mapped into) a uint8 array, in the order and with the names
+    ``SequenceReader`` gives them.  Bodies hold no header lines, so they can
+    be cut at any byte.  The data is scanned in blocks of *chunk_size*;
+    only header offsets are kept.
+    """
+    headers, header_ends = [], []
+    for start in range(0, len(data), chunk_size):
+        newlines = np.flatnonzero(np.asarray(data[start:start + chunk_size]) == 10) + start
+        if len(header_ends) < len(headers) and len(newlines):
+            header_ends.append(int(newlines[0]))     # a header line from an earlier block
+        line_starts = newlines + 1
+        if start == 0:
+            line_starts = np.concatenate([[0], line_starts])
+        line_starts = line_starts[line_starts < len(data)]
+        found = line_starts[np.isin(np.asarray(data[line_starts]), _HEADER_BYTES)]
+        ends = np.searchsorted(newlines, found)
+        headers.extend(found.tolist())
+        header_ends.extend(newlines[ends[ends < len(newlines)]].tolist())
+    header_ends += [len(data)] * (len(headers) - len(header_ends))
+    spans = []
+    first = headers[0] if headers else len(data)
+    if any(count_letters(np.asarray(data[start:min(start + chunk_size, first)]))
+           for start in range(0, first, chunk_size)):
+        spans.append((None, 0, first))
+    for i, header in enumerate(headers):
+        body = min(header_ends[i] + 1, len(data))
+        end = headers[i + 1] if i + 1 < len(headers) else len(data)
+        name = bytes(data[header:body]).decode("ascii", "replace")[1:].strip()
+        spans.append((name, body, end))
+    return spans
+
+class SequenceReader:
+    """
+    Stream the letters of a FASTA or raw sequence.
+
+    *source* is a path (memory-mapped), bytes, or a binary file object.
+    ``chunks()`` yields (record, letters) with letters an upper-case uint8
+    array; ``words(length)`` yields (record, words) with words an
+    (n, length) uint8 array.  ``names[record]`` is the FASTA header of a
+    record (None for raw input).
+    """
+
+    def __init__(self, source, chunk_size: int = SEQUENCE_CHUNK_SIZE):
+        self.source = source
+        self.chunk_size = chunk_size
+        self.names = []
+        self.tails = []             # letters left over at the end of each record
+        self._handle = None
+        self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def _blocks(self):
+        """Raw byte blocks of the input, at most chunk_size each."""
+        source = self.source
+        if isinstance(source, (str, os.PathLike)):
+            self.close()
+            self._handle = open(source, "rb")
+            if os.fstat(self._handle.fileno()).st_size == 0:
+                return
+            self._map = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+            view = memoryview(self._map)
+            try:
+                for start in range(0, len(view), self.chunk_size):
+                    yield view[start:start + self.chunk_size]
+            finally:
+                view.release()
+            return
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = io.BytesIO(source)
+        while True:
+            block = source.read(self.chunk_size)
+            if not block:
+                return
+            yield block
+
+    def digest(self) -> str:
+        """
+        SHA-256 of the raw input, identifying the sequence.  A file object
+        is read to its end and rewound, so it must be seekable.
+        """
+        position = None
+        if not isinstance(self.source, (str, os.PathLike, bytes, bytearray, memoryview)):
+            if not self.source.seekable():
+                raise ValueError("The sequence must be a seekable file")
+            position = self.source.tell()
+        digest = hashlib.sha256()
+        for block in self._blocks():
+            digest.update(block)
+            del block                   # a mapped block pins the map until released
+        self.close()
+        if position is not None:
+            self.source.seek(position)
+        return digest.hexdigest()
+
+    def _record(self, name=None) -> int:
+        self.names.append(name)
+        self.tails.append(b"")
+        return len(self.names) - 1
+
+    def chunks(self):
+        """Yield (record, letters) for every cleaned piece of the sequence."""
+        self.names, self.tails = [], []
+        record = None
+        at_line_start, in_header = True, False
+        header = []                 # pieces of the header line being read
+        for block in self._blocks():
+            data = np.frombuffer(block, dtype=np.uint8)
+            if not len(data):
+                continue
+            newlines = np.flatnonzero(data == 10)
+            # Is each line of the block (the first one possibly continued) a header?
+            starts = newlines + 1
+            headers = np.zeros(len(newlines) + 1, dtype=bool)
+            headers[0] = np.isin(data[0], _HEADER_BYTES) if at_line_start else in_header
+            inside = starts < len(data)
+            headers[1:][inside] = np.isin(data[starts[inside]], _HEADER_BYTES)
+            position = 0
+            for line in np.flatnonzero(headers):
+                begin = 0 if line == 0 else int(newlines[line - 1]) + 1
+                end = int(newlines[line]) if line < len(newlines) else len(data)
+                if begin > position:
+                    record = yield from self._emit(record, data[position:begin])
+                if not (line == 0 and in_header and not at_line_start):
+                    header = []
+                header.append(bytes(data[begin:end]))
+                if line < len(newlines):
+                    name = b"".join(header).decode("ascii", "replace")[1:].strip()
+                    record = self._record(name)
+                    in_header = False
+                    position = end + 1
+                else:
+                    in_header = True
+                    position = len(data)
+            if position < len(data):
+                record = yield from self._emit(record, data[position:])
+            at_line_start = data[-1] == 10
+        if in_header:                   # a last header line without a newline
+            self._record(b"".join(header).decode("ascii", "replace")[1:].strip())
+
+    def _emit(self, record, data):
+        """Clean one header-free piece; yields it and returns the record."""
+        letters = clean_bytes(data)
+        if len(letters):
+            if record is None:
+                record = self._record()
+            yield record, letters
+        return record
+
+    def words(self, length: int):
+        """
+        Yield (record, words) with words an (n, length) uint8 array of
+        consecutive words of one record.  Letters that do not fill a last
+        word are kept in ``tails[record]``.
+        """
+        record, leftover = None, np.empty(0, dtype=np.uint8)
+        for current, letters in self.chunks():
+            if current != record:
+                if record is not None:
+                    self.tails[record] = leftover.tobytes()
+                record, leftover = current, np.empty(0, dtype=np.uint8)
+            if len(leftover):
+                letters = np.concatenate([leftover, letters])
+            usable = len(letters) // length * length
+            leftover = letters[usable:].copy()
+            if usable:
+                yield record, letters[:usable].reshape(-1, length)
+        if record is not None:
+            self.tails[record] = leftover.tobytes()
+
+def pack_words(words: np.ndarray):
+    """
+    Packed values (see packed_utils) of an (n, L) byte array of words, and a
+    mask of the words made of A/C/G/T only; other words pack to 0.
+    """
+    codes = lenient_letter_codes(words)
+    valid = (codes != 255).all(axis=1)
+    codes = np.where(valid[:, None], codes, 0).astype(np.uint8)
+    return pack_array(codes), valid
+
+def word_usage(source, length: int, chunk_size: int = SEQUENCE_CHUNK_SIZE) -> dict:
+    """
+    Count the words of every record of a sequence file in bounded memory.
+
+    Returns {"records": [{"name", "words", "skipped", "tail", "counts"}]}
+    where counts maps each occurring word to its number of occurrences and
+    skipped counts words with letters other than A/C/G/T.  Only the record
+    being read is counted in arrays, sparsely (one entry per distinct word).
+    """
+    if not 1 <= length <= USAGE_MAX_LENGTH:
+        raise ValueError(f"Word length must be between 1 and {USAGE_MAX_LENGTH}")
+    counts, skipped = dict(), dict()
+    current, found = None, _SparseCounts()
+    with SequenceReader(source, chunk_size) as reader:
+        for record, words in reader.words(length):
+            if record != current:
+                if current is not None:
+                    counts[current] = found.to_dict(length)
+                current, found = record, _SparseCounts()
+                skipped[record] = 0
+            values, valid = pack_words(words)
+            found.add(values[valid])
+            skipped[record] += int((~valid).sum())
+        if current is not None:
+            counts[current] = found.to_dict(length)
+        names, tails = reader.names, reader.tails
+    records = []
+    for record, name in enumerate(names):
+        found = counts.get(record, {})
+        records.append({
+            "name": name,
+            "words": sum(found.values()) + skipped.get(record, 0),
+            "skipped": skipped.get(record, 0),
+            "tail": tails[record].decode("ascii"),
+            "counts": found,
+        })
+    return {"length": length, "records": records}
+
+class _SparseCounts:
+    """Occurrences of packed word values, kept as sorted (values, counts) arrays."""
+
+    def __init__(self):
+        self.values = np.empty(0, dtype=np.uint64)
+        self.counts = np.empty(0, dtype=np.int64)
+
+    def add(self, values: np.ndarray) -> None:
+        if not len(values):
+            return
+        values, counts = np.unique(values, return_counts=True)
+        values = np.concatenate([self.values, values])
+        counts = np.concatenate([self.counts, counts])
+        self.values, inverse = np.unique(values, return_inverse=True)
+        self.counts = np.zeros(len(self.values), dtype=np.int64)
+        np.add.at(self.counts, inverse, counts)
+
+    def to_dict(self, length: int) -> dict:
+        return {
+            decode_word(value, length): count
+            for value, count in zip(self.values.tolist(), self.counts.tolist())
+        }
@@ -0,0 +1,193 @@
+"""
+Utility functions for the persistent result store.
+
+Computed results are kept in a local SQLite file (WAL mode, so several
+worker processes can read and write it concurrently) keyed by the same
+content-addressed keys as the in-memory caches (see cache_utils).  The
+store is optional: it is only enabled when CODONS_RESULT_STORE names a
+database file.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key       TEXT PRIMARY KEY,
+    operation TEXT NOT NULL,
+    value     TEXT NOT NULL,
+    size      INTEGER NOT NULL,
+    created   REAL NOT NULL,
+    accessed  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+"""
+
+# SQLite limits the number of host parameters per statement
+_BATCH = 500
+
+class ResultStore:
+    """
+    SQLite-backed key/value store for JSON-serializable results.
+
+    Entries are evicted least-recently-accessed first whenever the store
+    grows past *max_entries* or *max_bytes*, down to *low_water* of both.
+    """
+
+    def __init__(self, path: str, max_entries: int = 100_000,
+                 max_bytes: int = 512 * 1024 * 1024, low_water: float = 0.9,
+                 prune_interval: int = 100):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.low_water = low_water
+        self.prune_interval = prune_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        with self._connection() as connection:
+            connection.executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Per-thread connection (sqlite3 connections are not thread-safe)."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10.0)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str, default=None):
+        """Return the stored value for *key*, or *default*."""
+        return self.get_many([key]).get(key, default)
+
+    def get_many(self, keys) -> dict:
+        """Return {key: value} for every stored key among *keys*."""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        connection = self._connection()
+        for start in range(0, len(keys), _BATCH):
+            batch = keys[start:start + _BATCH]
+            marks = ",".join("?" * len(batch))
+            rows = connection.execute(
+                f"SELECT key, value FROM results WHERE key IN ({marks})", batch
+            ).fetchall()
+            found.update((key, json.loads(value)) for key, value in rows)
+        if found:
+            hit = list(found)
+            with connection:
+                for start in range(0, len(hit), _BATCH):
+                    batch = hit[start:start + _BATCH]
+                    marks = ",".join("?" * len(batch))
+                    connection.execute(
+                        f"UPDATE results SET accessed = ? WHERE key IN ({marks})",
+                        [time.time(), *batch],
+                    )
+        return found
+
+    def put(self, key: str, value, operation: str = "") -> None:
+        """Store one JSON-serializable value."""
+        self.put_many([(key, value)], operation)
+
+    def put_many(self, items, operation: str = "") -> None:
+        """Store (key, value) pairs in one transaction."""
+        now = time.time()
+        rows = []
+        for key, value in items:
+            text = json.dumps(value, separators=(",", ":"))
+            rows.append((key, operation, text, len(text), now, now))
+        if not rows:
+            return
+        connection = self._connection()
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO results "
+                "(key, operation, value, size, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        with self._lock:
+            self._writes += len(rows)
+            due = self._writes >= self.prune_interval
+            if due:
+                self._writes = 0
+        if due:
+            self.prune()
+
+    def prune(self) -> int:
+        """Evict least recently accessed entries beyond the limits; return the count."""
+        connection = self._connection()
+        with connection:
+            count, total = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()
+            if count <= self.max_entries and total <= self.max_bytes:
+                return 0
+            # Newest entry that no longer fits under the low-water marks
+            row = connection.execute(
+                """
+                SELECT accessed FROM (
+                    SELECT accessed,
+                           ROW_NUMBER() OVER (ORDER BY accessed DESC) AS position,
+                           SUM(size) OVER (ORDER BY accessed DESC) AS running
+                    FROM results
+                )
+                WHERE position > ? OR running > ?
+                ORDER BY accessed DESC LIMIT 1
+                """,
+                (int(self.max_entries * self.low_water),
+                 int(self.max_bytes * self.low_water)),
+            ).fetchone()
+            if row is None:
+                return 0
+            cutoff = row[0]
+            removed = connection.execute(
+                "DELETE FROM results WHERE accessed <= ?", (cutoff,)
+            ).rowcount
+        return removed
+
+    def stats(self) -> dict:
+        """Entry count and total payload size."""
+        count, total = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+        return {
+            "path": self.path,
+            "entries": count,
+            "bytes": total,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+        }
+
+    def clear(self) -> None:
+        """Delete every stored result."""
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM results")
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+def default_store():
+    """
+    Process-wide ResultStore configured from the environment, or None.
+
+    CODONS_RESULT_STORE              path of the SQLite file (enables the store)
+    CODONS_RESULT_STORE_MAX_ENTRIES  entry limit (default 100000)
+    CODONS_RESULT_STORE_MAX_MB       payload size limit in MiB (default 512)
+    """
+    global _default_store
+    path = os.environ.get("CODONS_RESULT_STORE")
+    if not path:
+        return None
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = ResultStore(
+                path,
+                max_entries=int(os.environ.get("CODONS_RESULT_STORE_MAX_ENTRIES", 100_000)),
+                max_bytes=int(os.environ.get("CODONS_RESULT_STORE_MAX_MB", 512)) * 1024 * 1024,
+            )
+    return _default_store
@@ -0,0 +1,89 @@
+"""
+Utility functions for the symmetries of codes.
+
+Renaming the nucleotides (any of the 24 permutations of A, C, G, T) and
+reversing every word map codes to codes with the same structure: circular,
+comma-free and Cⁿ codes stay so.  Only the 8 permutations that commute with
+the complement (A<->T, C<->G) also preserve self-complementarity, and
+reversal swaps α_k with α_(L-k), so each caller picks the group that leaves
+its result unchanged.
+
+Codes in one class share a canonical form, the lexicographically smallest
+sorted word list among all images, and a class id derived from it.  All
+images come out of one vectorized lookup on the 2-bit letter codes.
+"""
+import hashlib
+import json
+from itertools import permutations
+
+import numpy as np
+
+from .packed_utils import NUCLEOTIDES, decode_code
+from .vector_utils import letter_codes, pack_array, text_to_array
+
+COMPLEMENT = (3, 2, 1, 0)
+
+# Images of (A, C, G, T) as 2-bit letter codes
+PERMUTATIONS = tuple(permutations(range(4)))
+COMPLEMENTARY_PERMUTATIONS = tuple(
+    p for p in PERMUTATIONS if all(p[COMPLEMENT[x]] == COMPLEMENT[p[x]] for x in range(4))
+)
+SYMMETRY_GROUPS = {
+    "nucleotide": PERMUTATIONS,
+    "complementary": COMPLEMENTARY_PERMUTATIONS,
+}
+
+def _group(group: str):
+    if group not in SYMMETRY_GROUPS:
+        raise ValueError(f"Unknown symmetry group: {group}")
+    return SYMMETRY_GROUPS[group]
+
+def code_images(length: int, code, group: str = "nucleotide", reversal: bool = True):
+    """
+    Every image of a code of A/C/G/T words of the given length.
+
+    Returns (transforms, images): transforms[g] is (permutation, reversed)
+    and images[g] the sorted packed words of the code under it.
+    """
+    code = list(code)
+    if any(len(w) != length for w in code):
+        raise ValueError(f"All words must have length {length}")
+    perms = _group(group)
+    letters = letter_codes(text_to_array("".join(code), length))       # (n, L)
+    mapped = np.asarray(perms, dtype=np.uint8)[:, letters]             # (P, n, L)
+    transforms = [(p, False) for p in perms]
+    if reversal:
+        mapped = np.concatenate([mapped, mapped[..., ::-1]])
+        transforms += [(p, True) for p in perms]
+    return transforms, np.sort(pack_array(mapped), axis=1)
+
+def canonical_form(length: int, code, group: str = "nucleotide", reversal: bool = True) -> dict:
+    """
+    Canonical member of a code's class under the symmetry group (with or
+    without word reversal).
+
+    Returns {"canonical": words, "permutation": image of "ACGT",
+    "reversed": bool, "classSize": number of distinct codes in the class,
+    "classId": stable id of the class}, where applying the permutation (and
+    the reversal) to the code gives the canonical words.
+    """
+    transforms, images = code_images(length, code, group, reversal)
+    if images.shape[1]:
+        best = int(np.lexsort(images.T[::-1])[0])
+        class_size = len(np.unique(images, axis=0))
+    else:
+        best, class_size = 0, 1
+    canonical = decode_code(images[best].tolist(), length)
+    permutation, reversed_ = transforms[best]
+    return {
+        "canonical": canonical,
+        "permutation": "".join(NUCLEOTIDES[i] for i in permutation),
+        "reversed": reversed_,
+        "classSize": class_size,
+        "classId": class_id(length, canonical, group, reversal),
+    }
+
+def class_id(length: int, canonical, group: str = "nucleotide", reversal: bool = True) -> str:
+    """Stable id of the class with the given canonical form."""
+    payload = json.dumps([length, group, reversal, list(canonical)], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,116 @@
+"""
+Vectorized (NumPy) helpers for batches of codes.
+
+A batch of codes is a uint8 array of shape (n_codes, n_words, L) holding one
+letter per cell, either as raw ASCII bytes or as 2-bit nucleotide codes
+(A=0, C=1, G=2, T=3, see packed_utils).  Rotations only permute the last
+axis, so they work on either form.
+"""
+import numpy as np
+
+from .packed_utils import NUCLEOTIDES
+
+# ASCII byte -> 2-bit nucleotide code, 255 for anything else
+_LETTER_CODES = np.full(256, 255, dtype=np.uint8)
+_LETTER_CODES[np.frombuffer(NUCLEOTIDES.encode("ascii"), dtype=np.uint8)] = np.arange(4)
+
+#####################
+# conversion        #
+#####################
+
+def text_to_array(text: str, length: int) -> np.ndarray:
+    """View an ASCII string of whole words as an (n_words, L) byte array."""
+    if len(text) % length != 0:
+        raise ValueError(
+            f"Input length {len(text)} is not a multiple of codon_length={length}"
+        )
+    return np.frombuffer(text.encode("ascii"), dtype=np.uint8).reshape(-1, length)
+
+def array_to_text(array: np.ndarray) -> str:
+    """Join a byte array of words back into one continuous string."""
+    return np.ascontiguousarray(array, dtype=np.uint8).tobytes().decode("ascii")
+
+def words_to_array(codes, length: int) -> np.ndarray:
+    """
+    Stack codes (lists of equal-length ASCII words) into an
+    (n_codes, n_words, L) byte array.  Every code must have the same size.
+    """
+    codes = list(codes)
+    if not codes:
+        return np.empty((0, 0, length), dtype=np.uint8)
+    n_words = len(codes[0])
+    if any(len(code) != n_words for code in codes):
+        raise ValueError("All codes in a batch must have the same number of words")
+    if any(len(word) != length for code in codes for word in code):
+        raise ValueError(f"All words must have length {length}")
+    text = "".join("".join(code) for code in codes)
+    return text_to_array(text, length).reshape(len(codes), n_words, length)
+
+def array_to_words(array: np.ndarray) -> list:
+    """Inverse of ``words_to_array`` for an array of any leading shape."""
+    length = array.shape[-1]
+    if array.ndim == 1:
+        return array_to_text(array)
+    if array.ndim == 2:
+        text = array_to_text(array)
+        return [text[i:i + length] for i in range(0, len(text), length)]
+    return [array_to_words(sub) for sub in array]
+
+def letter_codes(array: np.ndarray) -> np.ndarray:
+    """Map ASCII letters to 2-bit nucleotide codes; raise on anything else."""
+    codes = _LETTER_CODES[array]
+    if (codes == 255).any():
+        bad = chr(int(array[codes == 255][0]))
+        raise ValueError(f"Invalid nucleotide: {bad}")
+    return codes
+
+def lenient_letter_codes(array: np.ndarray) -> np.ndarray:
+    """Like ``letter_codes``, but marks anything but A/C/G/T with 255 instead of raising."""
+    return _LETTER_CODES[array]
+
+def pack_array(codes: np.ndarray) -> np.ndarray:
+    """Pack 2-bit letter codes along the last axis into uint64 words."""
+    length = codes.shape[-1]
+    if length > 32:
+        raise ValueError("Packed words are limited to 32 letters")
+    weights = np.left_shift(
+        np.uint64(1), np.arange(2 * (length - 1), -1, -2, dtype=np.uint64)
+    )
+    return (codes.astype(np.uint64) * weights).sum(axis=-1, dtype=np.uint64)
+
+def unpack_array(packed: np.ndarray, length: int) -> np.ndarray:
+    """Inverse of ``pack_array``: uint64 words to (..., L) letter codes."""
+    shifts = np.arange(2 * (length - 1), -1, -2, dtype=np.uint64)
+    packed = np.asarray(packed, dtype=np.uint64)[..., np.newaxis]
+    return ((packed >> shifts) & np.uint64(3)).astype(np.uint8)
+
+#####################
+# rotations         #
+#####################
+
+def _ks(length: int, ks) -> np.ndarray:
+    ks = np.arange(length) if ks is None else np.asarray(ks, dtype=np.int64).reshape(-1)
+    return ks % length
+
+def rotate_batch(words: np.ndarray, ks=None) -> np.ndarray:
+    """
+    All requested right-rotations (``w[-k:] + w[:-k]``) of every word at once.
+
+    *words* has shape (..., L); the result has shape (n_k, ..., L) with one
+    slice per entry of *ks* (default: every k in 0..L-1).
+    """
+    length = words.shape[-1]
+    ks = _ks(length, ks)
+    index = (np.arange(length) - ks[:, np.newaxis]) % length      # (n_k, L)
+    return np.moveaxis(words[..., index], -2, 0)
+
+def rotate_packed_batch(packed, length: int, ks=None) -> np.ndarray:
+    """``rotate_batch`` for uint64 packed words of the given length."""
+    if length > 31:
+        raise ValueError("Packed rotations are limited to 31 letters")
+    packed = np.asarray(packed, dtype=np.uint64)
+    ks = _ks(length, ks)
+    shift = (2 * ks).astype(np.uint64).reshape((-1,) + (1,) * packed.ndim)
+    low = (np.uint64(1) << shift) - np.uint64(1)
+    full = np.uint64((1 << (2 * length)) - 1)
+    return ((packed >> shift) | ((packed & low) << (np.uint64(2 * length) - shift))) & full
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from "react";
+import React, { useState, useEffect, useMemo } from "react";
 import { Link } from "react-router";
 import { useStore } from "../../store";
 import { useGraphData } from "./hooks/useGraphData";
@@ -16,6 +16,7 @@ import "../../css/codons-graph.css";
 
 const CodonsGraph = () => {
   const graphData = useGraphData();
+  const codons = useStore((state) => state.codons);
   const theme = useStore((state) => state.theme);
   const toggleTheme = useStore((state) => state.toggleTheme);
   
@@ -38,6 +39,7 @@ const CodonsGraph = () => {
 
   // Services
   const [graphMergeService, setGraphMergeService] = useState(null);
+  const [serverMergedGraph, setServerMergedGraph] = useState(null);
 
   // Initialize services
   useEffect(() => {
@@ -46,6 +48,29 @@ const CodonsGraph = () => {
     }
   }, [graphData.numOfCodons]);
 
+  // Fetch the merged graph once per code; falls back to merging locally
+  useEffect(() => {
+    let cancelled = false;
+    setServerMergedGraph(null);
+    if (!codons || !graphData.numOfCodons) return;
+    GraphMergeService.fetchMergedGraph(codons, graphData.numOfCodons)
+      .then((merged) => { if (!cancelled) setServerMergedGraph(merged); })
+      .catch((error) => console.warn("Merged graph unavailable, merging locally:", error));
+    return () => { cancelled = true; };
+  }, [codons, graphData.numOfCodons, graphData.originalCodons]);
+
+  const mergedGraph = useMemo(() => {
+    if (!graphMergeService) return { nodes: [], edges: [] };
+    if (serverMergedGraph) return graphMergeService.fromMergedGraph(serverMergedGraph);
+    return graphMergeService.mergeGraphs(
+      graphData.originalCodons,
+      graphData.alphaOne,
+      graphData.alphaTwo,
+      graphData.alphaThree
+    );
+  }, [graphMergeService, serverMergedGraph, graphData.originalCodons,
+      graphData.alphaOne, graphData.alphaTwo, graphData.alphaThree]);
+
   // Apply theme to body element
   useEffect(() => {
     document.body.className = theme;
@@ -68,14 +93,6 @@ const CodonsGraph = () => {
 
   // Event Handlers
   const handleExport = () => {
-    const mergedGraph = graphMergeService ? 
-      graphMergeService.mergeGraphs(
-        graphData.originalCodons, 
-        graphData.alphaOne, 
-        graphData.alphaTwo, 
-        graphData.alphaThree
-      ) : { nodes: [], edges: [] };
-
     ExportService.exportGraphToCSV(
       activeTab,
       graphData.numOfCodons,
@@ -259,13 +276,6 @@ const CodonsGraph = () => {
   };
 
   const c3TabIndex = GraphUtils.getC3TabIndex(graphData.numOfCodons);
-  const mergedGraph = graphMergeService ? 
-    graphMergeService.mergeGraphs(
-      graphData.originalCodons, 
-      graphData.alphaOne, 
-      graphData.alphaTwo, 
-      graphData.alphaThree
-    ) : { nodes: [], edges: [] };
 
   const renderTabContent = () => {
     if (activeTab === 0) {
@@ -1,8 +1,74 @@
+import { API_ENDPOINTS } from "../../../config/api";
+
 export class GraphMergeService {
   constructor(numOfCodons) {
     this.numOfCodons = numOfCodons;
   }
 
+  // Fetch the merged graph built server-side in one pass (cached by the backend)
+  static async fetchMergedGraph(codons, numOfCodons) {
+    const response = await fetch(API_ENDPOINTS.GRAPHS.MERGED, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ codons: codons.replace(/\s/g, ""), numOfCodons }),
+    });
+    if (!response.ok) {
+      throw new Error(`Failed to fetch merged graph: ${response.statusText}`);
+    }
+    return response.json();
+  }
+
+  // Turn the server's {variants, nodes, edges, nodeMasks, edgeMasks} into the
+  // rendered merged graph; bit k of a mask marks membership in variants[k]
+  fromMergedGraph(merged) {
+    if (!merged || !merged.nodes || !merged.edges) {
+      return { nodes: [], edges: [] };
+    }
+    const variants = merged.variants.slice(0, this.numOfCodons);
+    const membership = (mask) => variants.filter((_, k) => (mask >> k) & 1).sort();
+
+    const nodes = [];
+    merged.nodes.forEach((node, i) => {
+      const graphsArray = membership(merged.nodeMasks[i]);
+      if (graphsArray.length === 0) return;
+      nodes.push({
+        id: `${node}_merged`,
+        label: `${node} (${graphsArray.join('')})`,
+        fill: this.getNodeColor(graphsArray, this.numOfCodons),
+      });
+    });
+
+    // Edges in both directions between two nodes are drawn as one edge
+    const edgeMap = new Map();
+    merged.edges.forEach(([source, target], i) => {
+      const reverseKey = `${target}-${source}`;
+      const edgeKey = edgeMap.has(reverseKey) ? reverseKey : `${source}-${target}`;
+      const existing = edgeMap.get(edgeKey);
+      if (existing) {
+        existing.mask |= merged.edgeMasks[i];
+      } else {
+        edgeMap.set(edgeKey, { source, target, mask: merged.edgeMasks[i] });
+      }
+    });
+
+    const edges = [];
+    Array.from(edgeMap.entries()).forEach(([edgeKey, edgeData], index) => {
+      const graphsArray = membership(edgeData.mask);
+      if (graphsArray.length === 0) return;
+      edges.push({
+        source: `${edgeData.source}_merged`,
+        target: `${edgeData.target}_merged`,
+        id: `${edgeKey}_merged_${index}`,
+        label: graphsArray.join(''),
+        stroke: this.getEdgeColor(graphsArray, this.numOfCodons),
+        strokeWidth: graphsArray.length === this.numOfCodons ? 3 : graphsArray.length >= 2 ? 2 : 1,
+      });
+    });
+
+    return { nodes, edges };
+  }
+
+  // Local fallback when the merged graph endpoint is unavailable
   mergeGraphs(originalCodons, alphaOne, alphaTwo, alphaThree) {
     const availableGraphs = this.getAvailableGraphs(originalCodons, alphaOne, alphaTwo, alphaThree);
     if (availableGraphs.length === 0 || !availableGraphs.every(graph => graph && graph.nodes && graph.edges)) {
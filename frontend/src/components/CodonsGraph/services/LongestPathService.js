@@ -89,23 +89,37 @@ export class LongestPathService {
       numOfCodons: numOfCodons
     };
 
-    console.log("Sending longest path request:", requestData);
-
-    const response = await fetch(API_ENDPOINTS.GRAPHS.LONGEST_PATH, {
+    const post = (body) => fetch(API_ENDPOINTS.GRAPHS.LONGEST_PATH, {
       method: "POST",
       headers: {
         "Content-Type": "application/json",
       },
-      body: JSON.stringify(requestData),
+      body: JSON.stringify(body),
     });
 
+    // Prefer the server-side graph handle; fall back to uploading the edges
+    // if the server no longer knows it (e.g. after a restart)
+    let response;
+    if (calculationGraph.graphId) {
+      const handleRequest = { ...requestData, edges: undefined, graphId: calculationGraph.graphId };
+      console.log("Sending longest path request:", handleRequest);
+      response = await post(handleRequest);
+    }
+    if (!response || response.status === 404) {
+      console.log("Sending longest path request:", requestData);
+      response = await post(requestData);
+    }
+
     if (!response.ok) {
       const errorText = await response.text();
       throw new Error(`Failed to fetch longest path: ${response.status} ${errorText}`);
     }
 
-    const longestPath = await response.json();
-    console.log("Received longest path:", longestPath);
+    const { path: longestPath, engine, optimal } = await response.json();
+    console.log("Received longest path:", longestPath, { engine, optimal });
+    if (!optimal) {
+      console.warn("Longest path search hit its budget; the path may not be the longest.");
+    }
 
     if (!Array.isArray(longestPath)) {
       throw new Error("Invalid response format, expected array");
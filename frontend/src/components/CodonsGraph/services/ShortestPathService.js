@@ -108,16 +108,27 @@ export class ShortestPathService {
       numOfCodons: numOfCodons
     };
 
-    console.log("Sending shortest path request:", requestData);
-
-    const response = await fetch(API_ENDPOINTS.GRAPHS.SHORTEST_PATH, {
+    const post = (body) => fetch(API_ENDPOINTS.GRAPHS.SHORTEST_PATH, {
       method: "POST",
       headers: {
         "Content-Type": "application/json",
       },
-      body: JSON.stringify(requestData),
+      body: JSON.stringify(body),
     });
 
+    // Prefer the server-side graph handle; fall back to uploading the edges
+    // if the server no longer knows it (e.g. after a restart)
+    let response;
+    if (calculationGraph.graphId) {
+      const handleRequest = { ...requestData, edges: undefined, graphId: calculationGraph.graphId };
+      console.log("Sending shortest path request:", handleRequest);
+      response = await post(handleRequest);
+    }
+    if (!response || response.status === 404) {
+      console.log("Sending shortest path request:", requestData);
+      response = await post(requestData);
+    }
+
     if (!response.ok) {
       const errorText = await response.text();
       throw new Error(`Failed to fetch shortest path: ${response.status} ${errorText}`);
@@ -90,103 +90,33 @@ const InteractiveControls = ({ isDropdown = false }) => {
         setCodons(localCodons);
         setNumOfCodons(localNumOfCodons);
 
-        // Fetch all required data
-        const originalResponse = await fetch(API_ENDPOINTS.GRAPHS.ORIGINAL, {
+        // Fetch all graphs and properties in one round trip
+        const analyzeResponse = await fetch(API_ENDPOINTS.ANALYZE, {
           method: "POST",
           headers: { "Content-Type": "application/json" },
           body: JSON.stringify({ codons: cleanCodons, numOfCodons: localNumOfCodons }),
         });
 
-        const alphaOneResponse = await fetch(API_ENDPOINTS.GRAPHS.ALPHA_ONE, {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify({ codons: cleanCodons, numOfCodons: localNumOfCodons }),
-        });
-
-        let alphaTwoResponse = null;
-        let alphaThreeResponse = null;
-        let eigenschaftenAlphaTwoResponse = null;
-        let eigenschaftenAlphaThreeResponse = null;
-
-        if (localNumOfCodons >= 3) {
-          alphaTwoResponse = await fetch(API_ENDPOINTS.GRAPHS.ALPHA_TWO, {
-            method: "POST",
-            headers: { "Content-Type": "application/json" },
-            body: JSON.stringify({ codons: cleanCodons, numOfCodons: localNumOfCodons }),
-          });
-
-          eigenschaftenAlphaTwoResponse = await fetch(API_ENDPOINTS.PROPERTIES.ALPHA_TWO, {
-            method: "POST",
-            headers: { "Content-Type": "application/json" },
-            body: JSON.stringify({ codons: cleanCodons, numOfCodons: localNumOfCodons }),
-          });
-        }
-
-        if (localNumOfCodons === 4) {
-          alphaThreeResponse = await fetch(API_ENDPOINTS.GRAPHS.ALPHA_THREE, {
-            method: "POST",
-            headers: { "Content-Type": "application/json" },
-            body: JSON.stringify({ codons: cleanCodons, numOfCodons: localNumOfCodons }),
-          });
-
-          eigenschaftenAlphaThreeResponse = await fetch(API_ENDPOINTS.PROPERTIES.ALPHA_THREE, {
-            method: "POST",
-            headers: { "Content-Type": "application/json" },
-            body: JSON.stringify({ codons: cleanCodons, numOfCodons: localNumOfCodons }),
-          });
-        }
-
-        const eigenschaftenResponse = await fetch(API_ENDPOINTS.PROPERTIES.ORIGINAL, {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify({ codons: cleanCodons, numOfCodons: localNumOfCodons }),
-        });
-
-        const eigenschaftenAlphaOneResponse = await fetch(API_ENDPOINTS.PROPERTIES.ALPHA_ONE, {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify({ codons: cleanCodons, numOfCodons: localNumOfCodons }),
-        });
-
-        const c3Response = await fetch(API_ENDPOINTS.PROPERTIES.C3, {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify({ codons: cleanCodons, numOfCodons: localNumOfCodons }),
-        });
-
-        // Check responses
-        if (
-          originalResponse.status !== 200 ||
-          alphaOneResponse.status !== 200 ||
-          (alphaTwoResponse && alphaTwoResponse.status !== 200) ||
-          (alphaThreeResponse && alphaThreeResponse.status !== 200) ||
-          c3Response.status !== 200
-        ) {
+        // Check response
+        if (analyzeResponse.status !== 200) {
           setError("Failed to fetch graph data");
           return;
         }
 
-        // Parse responses
-        const originalData = await originalResponse.json();
-        const alphaOneData = await alphaOneResponse.json();
-        const alphaTwoData = alphaTwoResponse ? await alphaTwoResponse.json() : { nodes: [], edges: [] };
-        const alphaThreeData = alphaThreeResponse ? await alphaThreeResponse.json() : { nodes: [], edges: [] };
-        const eigenschaftenData = await eigenschaftenResponse.json();
-        const eigenschaftenAlphaOneData = await eigenschaftenAlphaOneResponse.json();
-        const eigenschaftenAlphaTwoData = eigenschaftenAlphaTwoResponse ? await eigenschaftenAlphaTwoResponse.json() : {};
-        const eigenschaftenAlphaThreeData = eigenschaftenAlphaThreeResponse ? await eigenschaftenAlphaThreeResponse.json() : {};
-        const c3Data = await c3Response.text();
+        // alphaTwo / alphaThree are only present for tuple lengths >= 3 / 4
+        const { graphs, properties, cn } = await analyzeResponse.json();
+        const emptyGraph = { nodes: [], edges: [] };
 
         // Update store
-        setOriginalCodons(originalData);
-        setAlphaOne(alphaOneData);
-        setAlphaTwo(alphaTwoData);
-        setAlphaThree(alphaThreeData);
-        setEigenschaften(eigenschaftenData);
-        setEigenschaftenAlphaOne(eigenschaftenAlphaOneData);
-        setEigenschaftenAlphaTwo(eigenschaftenAlphaTwoData);
-        setEigenschaftenAlphaThree(eigenschaftenAlphaThreeData);
-        setC3(c3Data === "True");
+        setOriginalCodons(graphs.original);
+        setAlphaOne(graphs.alphaOne);
+        setAlphaTwo(graphs.alphaTwo ?? emptyGraph);
+        setAlphaThree(graphs.alphaThree ?? emptyGraph);
+        setEigenschaften(properties.original);
+        setEigenschaftenAlphaOne(properties.alphaOne);
+        setEigenschaftenAlphaTwo(properties.alphaTwo ?? {});
+        setEigenschaftenAlphaThree(properties.alphaThree ?? {});
+        setC3(cn);
 
         setError(""); // Clear any previous errors
       } catch (error) {
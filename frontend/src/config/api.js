@@ -21,12 +21,16 @@ const getApiBaseUrl = () => {
 const API_BASE_URL = getApiBaseUrl();
 
 export const API_ENDPOINTS = {
+  // Combined graphs + properties endpoint
+  ANALYZE: `${API_BASE_URL}/api/analyze`,
+
   // Graph endpoints
   GRAPHS: {
     ORIGINAL: `${API_BASE_URL}/api/graphs/original`,
     ALPHA_ONE: `${API_BASE_URL}/api/graphs/alpha-one`,
     ALPHA_TWO: `${API_BASE_URL}/api/graphs/alpha-two`,
     ALPHA_THREE: `${API_BASE_URL}/api/graphs/alpha-three`,
+    MERGED: `${API_BASE_URL}/api/graphs/merged`,
     LONGEST_PATH: `${API_BASE_URL}/api/graphs/longest-path`,
     SHORTEST_PATH: `${API_BASE_URL}/api/graphs/shortest-path`,
   },
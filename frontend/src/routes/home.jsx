@@ -79,7 +79,7 @@ export default function Home() {
     }
 
     startTransition(async () => {
-      const originalResponse = await fetch(API_ENDPOINTS.GRAPHS.ORIGINAL, {
+      const analyzeResponse = await fetch(API_ENDPOINTS.ANALYZE, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -87,132 +87,24 @@ export default function Home() {
         body: JSON.stringify({ codons: cleanCodons, numOfCodons }),
       });
 
-      const alphaOneResponse = await fetch(API_ENDPOINTS.GRAPHS.ALPHA_ONE, {
-        method: "POST",
-        headers: {
-          "Content-Type": "application/json",
-        },
-        body: JSON.stringify({ codons: cleanCodons, numOfCodons }),
-      });
-
-      // Only fetch alphaTwo and alphaThree if numOfCodons >= 3 and 4 respectively
-      let alphaTwoResponse = null;
-      let alphaThreeResponse = null;
-      let eigenschaftenAlphaTwoResponse = null;
-      let eigenschaftenAlphaThreeResponse = null;
-
-      if (numOfCodons >= 3) {
-        alphaTwoResponse = await fetch(API_ENDPOINTS.GRAPHS.ALPHA_TWO, {
-          method: "POST",
-          headers: {
-            "Content-Type": "application/json",
-          },
-          body: JSON.stringify({ codons: cleanCodons, numOfCodons }),
-        });
-
-        eigenschaftenAlphaTwoResponse = await fetch(
-          API_ENDPOINTS.PROPERTIES.ALPHA_TWO,
-          {
-            method: "POST",
-            headers: {
-              "Content-Type": "application/json",
-            },
-            body: JSON.stringify({ codons: cleanCodons, numOfCodons }),
-          },
-        );
-      }
-
-      if (numOfCodons === 4) {
-        alphaThreeResponse = await fetch(API_ENDPOINTS.GRAPHS.ALPHA_THREE, {
-          method: "POST",
-          headers: {
-            "Content-Type": "application/json",
-          },
-          body: JSON.stringify({ codons: cleanCodons, numOfCodons }),
-        });
-
-        eigenschaftenAlphaThreeResponse = await fetch(
-          API_ENDPOINTS.PROPERTIES.ALPHA_THREE,
-          {
-            method: "POST",
-            headers: {
-              "Content-Type": "application/json",
-            },
-            body: JSON.stringify({ codons: cleanCodons, numOfCodons }),
-          },
-        );
-      }
-
-      const eigenschaftenResponse = await fetch(
-        API_ENDPOINTS.PROPERTIES.ORIGINAL,
-        {
-          method: "POST",
-          headers: {
-            "Content-Type": "application/json",
-          },
-          body: JSON.stringify({ codons: cleanCodons, numOfCodons }),
-        },
-      );
-
-      const eigenschaftenAlphaOneResponse = await fetch(
-        API_ENDPOINTS.PROPERTIES.ALPHA_ONE,
-        {
-          method: "POST",
-          headers: {
-            "Content-Type": "application/json",
-          },
-          body: JSON.stringify({ codons: cleanCodons, numOfCodons }),
-        },
-      );
-
-      const c3Response = await fetch(API_ENDPOINTS.PROPERTIES.C3, {
-        method: "POST",
-        headers: {
-          "Content-Type": "application/json",
-        },
-        body: JSON.stringify({ codons: cleanCodons, numOfCodons }),
-      });
-
-      // Check responses based on what was fetched
-      if (
-        originalResponse.status !== 200 ||
-        alphaOneResponse.status !== 200 ||
-        (alphaTwoResponse && alphaTwoResponse.status !== 200) ||
-        (alphaThreeResponse && alphaThreeResponse.status !== 200) ||
-        c3Response.status !== 200
-      ) {
-        setError(originalResponse.statusText);
+      if (analyzeResponse.status !== 200) {
+        setError(analyzeResponse.statusText);
         return;
       }
 
-      const originalData = await originalResponse.json();
-      const alphaOneData = await alphaOneResponse.json();
-      const alphaTwoData = alphaTwoResponse
-        ? await alphaTwoResponse.json()
-        : { nodes: [], edges: [] };
-      const alphaThreeData = alphaThreeResponse
-        ? await alphaThreeResponse.json()
-        : { nodes: [], edges: [] };
-      const eigenschaftenData = await eigenschaftenResponse.json();
-      const eigenschaftenAlphaOneData =
-        await eigenschaftenAlphaOneResponse.json();
-      const eigenschaftenAlphaTwoData = eigenschaftenAlphaTwoResponse
-        ? await eigenschaftenAlphaTwoResponse.json()
-        : {};
-      const eigenschaftenAlphaThreeData = eigenschaftenAlphaThreeResponse
-        ? await eigenschaftenAlphaThreeResponse.json()
-        : {};
-      const c3Data = await c3Response.text(); // C3 response is a string (True/False)
-
-      setOriginalCodons(originalData);
-      setAlphaOne(alphaOneData);
-      setAlphaTwo(alphaTwoData);
-      setAlphaThree(alphaThreeData);
-      setEigenschaften(eigenschaftenData);
-      setEigenschaftenAlphaOne(eigenschaftenAlphaOneData);
-      setEigenschaftenAlphaTwo(eigenschaftenAlphaTwoData);
-      setEigenschaftenAlphaThree(eigenschaftenAlphaThreeData);
-      setC3(c3Data === "True"); // Update C3 in the store
+      // alphaTwo / alphaThree are only present for tuple lengths >= 3 / 4
+      const { graphs, properties, cn } = await analyzeResponse.json();
+      const emptyGraph = { nodes: [], edges: [] };
+
+      setOriginalCodons(graphs.original);
+      setAlphaOne(graphs.alphaOne);
+      setAlphaTwo(graphs.alphaTwo ?? emptyGraph);
+      setAlphaThree(graphs.alphaThree ?? emptyGraph);
+      setEigenschaften(properties.original);
+      setEigenschaftenAlphaOne(properties.alphaOne);
+      setEigenschaftenAlphaTwo(properties.alphaTwo ?? {});
+      setEigenschaftenAlphaThree(properties.alphaThree ?? {});
+      setC3(cn); // Update C3 in the store
 
       navigate({
         pathname: "/codons",